@@ -0,0 +1,6 @@
+"""
+Benchmarks for the Agentic backend.
+
+Run individual modules with ``python -m benchmarks.<name>`` from the backend
+directory.
+"""
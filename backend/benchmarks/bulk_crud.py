@@ -0,0 +1,113 @@
+"""
+Per-row versus bulk CRUD for agents with configs.
+
+Creates, updates and deletes the same number of agents once through
+``create_with_owner``/``update``/``remove`` in a loop (one commit per
+agent) and once through ``create_many_with_owner``/``update_many``/
+``remove_many`` (one commit per call). Each mode runs against a fresh
+SQLite file with the pragmas from settings.
+
+Usage:
+    python -m benchmarks.bulk_crud [--agents 2000]
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.crud.agent import agent as agent_crud
+from backend.db.database import Base, configure_sqlite_engine
+from backend.db.models import User
+from backend.schemas.agent import AgentConfigBase, AgentCreate, AgentUpdate
+
+
+def _session() -> Session:
+    directory = tempfile.mkdtemp(prefix="agentic-bench-")
+    engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+    configure_sqlite_engine(engine)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    db.add(User(email="bench@example.com", username="bench", hashed_password="x"))
+    db.commit()
+    return db
+
+
+def _agents(count: int) -> List[AgentCreate]:
+    return [
+        AgentCreate(
+            name=f"Agent {i}",
+            role="researcher",
+            goal="benchmark",
+            config=AgentConfigBase(model="test", tools={"tools": [{"name": "search"}]}),
+        )
+        for i in range(count)
+    ]
+
+
+def run_per_row(count: int) -> Dict[str, float]:
+    db = _session()
+    timings = {}
+
+    start = time.perf_counter()
+    ids = [agent_crud.create_with_owner(db, obj_in=obj_in, user_id=1).id for obj_in in _agents(count)]
+    timings["create"] = time.perf_counter() - start
+
+    update = AgentUpdate(goal="updated", config=AgentConfigBase(temperature=0.2))
+    start = time.perf_counter()
+    for agent_id in ids:
+        agent_crud.update(db, db_obj=agent_crud.get(db, id=agent_id), obj_in=update)
+    timings["update"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for agent_id in ids:
+        agent_crud.remove(db, id=agent_id)
+    timings["delete"] = time.perf_counter() - start
+
+    db.close()
+    return timings
+
+
+def run_bulk(count: int) -> Dict[str, float]:
+    db = _session()
+    timings = {}
+
+    start = time.perf_counter()
+    ids = [agent.id for agent in agent_crud.create_many_with_owner(db, objs_in=_agents(count), user_id=1)]
+    timings["create"] = time.perf_counter() - start
+
+    update = AgentUpdate(goal="updated", config=AgentConfigBase(temperature=0.2))
+    start = time.perf_counter()
+    agent_crud.update_many(db, objs_in={agent_id: update for agent_id in ids})
+    timings["update"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    agent_crud.remove_many(db, ids=ids)
+    timings["delete"] = time.perf_counter() - start
+
+    db.close()
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", type=int, default=2000)
+    args = parser.parse_args()
+
+    per_row = run_per_row(args.agents)
+    bulk = run_bulk(args.agents)
+
+    print(f"\n{args.agents} agents with configs")
+    print(f"{'operation':<10} {'per-row s':>10} {'bulk s':>9} {'speedup':>8}")
+    for operation in ("create", "update", "delete"):
+        print(
+            f"{operation:<10} {per_row[operation]:>10.3f} {bulk[operation]:>9.3f} "
+            f"{per_row[operation] / bulk[operation]:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
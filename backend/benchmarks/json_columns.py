@@ -0,0 +1,119 @@
+"""
+Storage size and encode/decode time of JSON columns.
+
+Compares the previous stdlib ``json``-into-Text encoding with CompressedJSON
+using no compression, zlib and zstd. Payloads imitate task results: a
+generated report of the given size plus some metadata. Storage is measured
+as the bytes stored in the column and the size of the resulting database
+file.
+
+Usage:
+    python -m benchmarks.json_columns [--rows 2000] [--sizes 512,8192,65536]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import Column, Integer, MetaData, Table, Text, create_engine, func, select
+from sqlalchemy.types import TypeDecorator
+
+from backend.db.types import CompressedJSON, zstandard
+
+
+WORDS = (
+    "agent task result analysis report summary data model output step tool "
+    "search calculate file context research finding conclusion evidence "
+    "source recommendation the a of and to in is that for with on"
+).split()
+
+
+class LegacyJSON(TypeDecorator):
+    """The previous JSONEncodedDict encoding."""
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return json.dumps(value) if value is not None else None
+
+    def process_result_value(self, value, dialect):
+        return json.loads(value) if value is not None else None
+
+
+def make_payload(size: int, rng: random.Random) -> Dict[str, Any]:
+    words: List[str] = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return {
+        "output": " ".join(words),
+        "tokens": length // 4,
+        "steps": [{"agent": rng.randint(1, 5), "status": "completed"} for _ in range(3)],
+    }
+
+
+def run(column_type: TypeDecorator, payloads: List[Dict[str, Any]]) -> Tuple[float, float, int, int]:
+    """
+    Return encode and decode microseconds per value, stored column bytes and
+    database file size.
+    """
+    directory = tempfile.mkdtemp(prefix="agentic-bench-")
+    path = os.path.join(directory, "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    metadata = MetaData()
+    table = Table("results", metadata, Column("id", Integer, primary_key=True), Column("data", column_type))
+    metadata.create_all(engine)
+    dialect = engine.dialect
+
+    start = time.perf_counter()
+    encoded = [column_type.process_bind_param(payload, dialect) for payload in payloads]
+    encode_us = (time.perf_counter() - start) / len(payloads) * 1e6
+
+    start = time.perf_counter()
+    for value in encoded:
+        column_type.process_result_value(value, dialect)
+    decode_us = (time.perf_counter() - start) / len(payloads) * 1e6
+
+    with engine.begin() as conn:
+        conn.execute(table.insert(), [{"data": payload} for payload in payloads])
+    with engine.connect() as conn:
+        # length() of a BLOB is its size in bytes; of TEXT, characters (ASCII here)
+        stored = conn.execute(select(func.sum(func.length(table.c.data)))).scalar()
+    engine.dispose()
+    return encode_us, decode_us, stored, os.path.getsize(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--sizes", type=str, default="512,8192,65536")
+    args = parser.parse_args()
+
+    configs: Dict[str, Callable[[], TypeDecorator]] = {
+        "stdlib json (previous)": LegacyJSON,
+        "orjson, uncompressed": lambda: CompressedJSON(codec="none"),
+        "orjson + zlib": lambda: CompressedJSON(codec="zlib"),
+    }
+    if zstandard is not None:
+        configs["orjson + zstd"] = lambda: CompressedJSON(codec="zstd")
+
+    rng = random.Random(0)
+    for size in (int(s) for s in args.sizes.split(",")):
+        payloads = [make_payload(size, rng) for _ in range(args.rows)]
+        print(f"\n{args.rows} rows of ~{size} bytes")
+        print(f"{'encoding':<24} {'encode us':>10} {'decode us':>10} {'stored MB':>10} {'file MB':>9}")
+        for name, factory in configs.items():
+            encode_us, decode_us, stored, file_size = run(factory(), payloads)
+            print(
+                f"{name:<24} {encode_us:>10.1f} {decode_us:>10.1f} "
+                f"{stored / 1e6:>10.2f} {file_size / 1e6:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
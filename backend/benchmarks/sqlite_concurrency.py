@@ -0,0 +1,128 @@
+"""
+Concurrent read/write throughput on SQLite, with and without the pragmas
+from settings.
+
+Readers list tasks the way ``GET /tasks`` does while writers update task
+status and add steps the way ``CrewManager`` does. Each configuration runs
+against a fresh database file.
+
+Usage:
+    python -m benchmarks.sqlite_concurrency [--seconds 5] [--readers 4] [--writers 2]
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from backend.db.database import Base, configure_sqlite_engine, sqlite_pragmas
+from backend.db.models import Task, TaskStep, User
+
+
+def _seed(Session, tasks: int) -> None:
+    db = Session()
+    user = User(email="bench@example.com", username="bench", hashed_password="x")
+    db.add(user)
+    db.flush()
+    db.add_all(
+        Task(title=f"Task {i}", description="benchmark", expected_output="none", user_id=user.id)
+        for i in range(tasks)
+    )
+    db.commit()
+    db.close()
+
+
+def run(pragmas: Optional[Dict[str, Any]], seconds: float, readers: int, writers: int, tasks: int) -> Dict[str, float]:
+    """
+    Run one configuration and return reads/s, writes/s and lock errors.
+    """
+    directory = tempfile.mkdtemp(prefix="agentic-bench-")
+    url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    if pragmas is not None:
+        configure_sqlite_engine(engine, pragmas)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    _seed(Session, tasks)
+
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def reader() -> None:
+        db = Session()
+        while not stop.is_set():
+            try:
+                db.query(Task).filter(Task.user_id == 1).limit(100).all()
+                db.rollback()
+                with lock:
+                    counts["reads"] += 1
+            except OperationalError:
+                db.rollback()
+                with lock:
+                    counts["errors"] += 1
+        db.close()
+
+    def writer(offset: int) -> None:
+        db = Session()
+        i = offset
+        while not stop.is_set():
+            try:
+                task = db.get(Task, i % tasks + 1)
+                task.status = "in_progress" if task.status != "in_progress" else "pending"
+                db.add(TaskStep(task_id=task.id, agent_id=1, step_number=i, status="completed"))
+                db.commit()
+                with lock:
+                    counts["writes"] += 1
+            except OperationalError:
+                db.rollback()
+                with lock:
+                    counts["errors"] += 1
+            i += writers
+        db.close()
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    return {
+        "reads_per_s": counts["reads"] / seconds,
+        "writes_per_s": counts["writes"] / seconds,
+        "lock_errors": counts["errors"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--tasks", type=int, default=1000)
+    args = parser.parse_args()
+
+    configs = {
+        "default (rollback journal)": None,
+        "pragmas from settings": sqlite_pragmas(),
+    }
+    print(f"{'configuration':<28} {'reads/s':>10} {'writes/s':>10} {'lock errors':>12}")
+    for name, pragmas in configs.items():
+        result = run(pragmas, args.seconds, args.readers, args.writers, args.tasks)
+        print(
+            f"{name:<28} {result['reads_per_s']:>10.1f} {result['writes_per_s']:>10.1f} "
+            f"{result['lock_errors']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
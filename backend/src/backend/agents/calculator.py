@@ -0,0 +1,299 @@
+"""
+AST-validated expression evaluator for the calculator tool.
+
+Expressions are parsed once, checked against a whitelist of node types and
+names, compiled, and cached in an LRU. Scalar inputs are evaluated with the
+``math`` module; variable tables with column values are evaluated with NumPy
+so a whole batch of rows is computed in a single pass per expression.
+"""
+import ast
+import functools
+import math
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+# Maximum integer exponent accepted by ``**`` before evaluation
+MAX_EXPONENT = 10_000
+
+# Size of the compiled-expression LRU cache
+EXPRESSION_CACHE_SIZE = 1024
+
+Number = Union[int, float]
+
+_ALLOWED_BINOPS = (
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+)
+_ALLOWED_UNARYOPS = (ast.UAdd, ast.USub)
+_ALLOWED_CMPOPS = (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+
+
+def _safe_pow(base: Any, exponent: Any) -> Any:
+    """
+    Raise ``base`` to ``exponent``, refusing exponents that would take
+    unbounded time or memory to compute.
+    """
+    if isinstance(exponent, np.ndarray):
+        if np.issubdtype(exponent.dtype, np.integer) and np.any(np.abs(exponent) > MAX_EXPONENT):
+            raise ValueError(f"Exponent too large (limit {MAX_EXPONENT})")
+        return np.power(base, exponent)
+    if isinstance(exponent, int) and abs(exponent) > MAX_EXPONENT:
+        if not (isinstance(base, (int, float)) and base in (-1, 0, 1)):
+            raise ValueError(f"Exponent too large (limit {MAX_EXPONENT})")
+    return base ** exponent
+
+
+def _np_reduce(func, reducer):
+    def wrapper(*args):
+        if len(args) == 1:
+            return reducer(args[0])
+        return functools.reduce(func, args)
+    return wrapper
+
+
+_CONSTANTS: Dict[str, Number] = {
+    "pi": math.pi,
+    "e": math.e,
+    "tau": math.tau,
+    "inf": math.inf,
+}
+
+_SCALAR_FUNCTIONS: Dict[str, Any] = {
+    "abs": abs,
+    "min": min,
+    "max": max,
+    "round": round,
+    "sum": sum,
+    "sqrt": math.sqrt,
+    "exp": math.exp,
+    "log": math.log,
+    "log10": math.log10,
+    "log2": math.log2,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "asin": math.asin,
+    "acos": math.acos,
+    "atan": math.atan,
+    "atan2": math.atan2,
+    "sinh": math.sinh,
+    "cosh": math.cosh,
+    "tanh": math.tanh,
+    "hypot": math.hypot,
+    "floor": math.floor,
+    "ceil": math.ceil,
+    "degrees": math.degrees,
+    "radians": math.radians,
+}
+
+_VECTOR_FUNCTIONS: Dict[str, Any] = {
+    "abs": np.abs,
+    "min": _np_reduce(np.minimum, np.min),
+    "max": _np_reduce(np.maximum, np.max),
+    "round": np.round,
+    "sum": np.sum,
+    "sqrt": np.sqrt,
+    "exp": np.exp,
+    "log": lambda x, base=None: np.log(x) if base is None else np.log(x) / np.log(base),
+    "log10": np.log10,
+    "log2": np.log2,
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "asin": np.arcsin,
+    "acos": np.arccos,
+    "atan": np.arctan,
+    "atan2": np.arctan2,
+    "sinh": np.sinh,
+    "cosh": np.cosh,
+    "tanh": np.tanh,
+    "hypot": np.hypot,
+    "floor": np.floor,
+    "ceil": np.ceil,
+    "degrees": np.degrees,
+    "radians": np.radians,
+}
+
+
+class ExpressionError(ValueError):
+    """
+    Raised when an expression is malformed or uses disallowed syntax.
+    """
+
+
+class _PowRewriter(ast.NodeTransformer):
+    """
+    Rewrite ``a ** b`` into ``__pow__(a, b)`` so exponents can be bounded.
+    """
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Pow):
+            return ast.copy_location(
+                ast.Call(
+                    func=ast.Name(id="__pow__", ctx=ast.Load()),
+                    args=[node.left, node.right],
+                    keywords=[],
+                ),
+                node,
+            )
+        return node
+
+
+def _validate(node: ast.AST, names: set) -> None:
+    """
+    Check that ``node`` only uses whitelisted syntax, collecting free names.
+    """
+    if isinstance(node, ast.Expression):
+        _validate(node.body, names)
+    elif isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ExpressionError(f"Unsupported constant: {node.value!r}")
+    elif isinstance(node, ast.BinOp):
+        if not isinstance(node.op, _ALLOWED_BINOPS):
+            raise ExpressionError(f"Unsupported operator: {type(node.op).__name__}")
+        _validate(node.left, names)
+        _validate(node.right, names)
+    elif isinstance(node, ast.UnaryOp):
+        if not isinstance(node.op, _ALLOWED_UNARYOPS):
+            raise ExpressionError(f"Unsupported operator: {type(node.op).__name__}")
+        _validate(node.operand, names)
+    elif isinstance(node, ast.Compare):
+        for op in node.ops:
+            if not isinstance(op, _ALLOWED_CMPOPS):
+                raise ExpressionError(f"Unsupported comparison: {type(op).__name__}")
+        _validate(node.left, names)
+        for comparator in node.comparators:
+            _validate(comparator, names)
+    elif isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in _SCALAR_FUNCTIONS:
+            raise ExpressionError("Only whitelisted math functions can be called")
+        if node.keywords:
+            raise ExpressionError("Keyword arguments are not supported")
+        for arg in node.args:
+            _validate(arg, names)
+    elif isinstance(node, (ast.List, ast.Tuple)):
+        for elt in node.elts:
+            _validate(elt, names)
+    elif isinstance(node, ast.Name):
+        if node.id.startswith("_"):
+            raise ExpressionError(f"Invalid name: {node.id}")
+        if node.id in _SCALAR_FUNCTIONS:
+            raise ExpressionError(f"Function {node.id} must be called")
+        names.add(node.id)
+    else:
+        raise ExpressionError(f"Unsupported syntax: {type(node).__name__}")
+
+
+@functools.lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(expression: str) -> Tuple[Any, FrozenSet[str]]:
+    """
+    Parse, validate and compile an expression.
+
+    Results are cached, so repeated expressions skip parsing entirely.
+
+    Args:
+        expression: Arithmetic expression.
+
+    Returns:
+        Tuple[Any, FrozenSet[str]]: Compiled code object and the free variable
+        names it references (constants excluded).
+
+    Raises:
+        ExpressionError: If the expression is invalid.
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ExpressionError(f"Invalid expression: {e.msg}") from None
+
+    names: set = set()
+    _validate(tree, names)
+    tree = ast.fix_missing_locations(_PowRewriter().visit(tree))
+    code = compile(tree, "<calculator>", "eval")
+    return code, frozenset(names - set(_CONSTANTS))
+
+
+def _namespace(functions: Dict[str, Any], variables: Mapping[str, Any]) -> Dict[str, Any]:
+    namespace: Dict[str, Any] = {"__builtins__": {}, "__pow__": _safe_pow}
+    namespace.update(_CONSTANTS)
+    namespace.update(functions)
+    namespace.update(variables)
+    return namespace
+
+
+def _check_names(names: FrozenSet[str], variables: Mapping[str, Any]) -> None:
+    missing = sorted(name for name in names if name not in variables)
+    if missing:
+        raise ExpressionError(f"Undefined variable(s): {', '.join(missing)}")
+
+
+def _to_python(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def evaluate(expression: str, variables: Optional[Mapping[str, Number]] = None) -> Any:
+    """
+    Evaluate a single expression against scalar variables.
+
+    Args:
+        expression: Arithmetic expression.
+        variables: Optional mapping of variable names to numbers.
+
+    Returns:
+        Any: Result of the expression.
+    """
+    variables = variables or {}
+    code, names = compile_expression(expression)
+    _check_names(names, variables)
+    return eval(code, _namespace(_SCALAR_FUNCTIONS, variables))
+
+
+def evaluate_batch(
+    expressions: Sequence[str],
+    variables: Optional[Mapping[str, Union[Number, Sequence[Number]]]] = None,
+) -> List[Any]:
+    """
+    Evaluate several expressions against a shared variable table.
+
+    Variables may be scalars or equal-length columns of numbers. Columns are
+    converted to NumPy arrays once and each expression is evaluated over all
+    rows in a single vectorized pass.
+
+    Args:
+        expressions: Expressions to evaluate.
+        variables: Optional mapping of variable names to numbers or columns.
+
+    Returns:
+        List[Any]: One result per expression; lists for column inputs.
+
+    Raises:
+        ExpressionError: If an expression is invalid or references an
+            undefined variable.
+    """
+    variables = variables or {}
+    columns = {
+        name: np.asarray(value, dtype=float) if isinstance(value, (list, tuple)) else value
+        for name, value in variables.items()
+    }
+    lengths = {len(value) for value in columns.values() if isinstance(value, np.ndarray)}
+    if len(lengths) > 1:
+        raise ExpressionError("Variable columns must all have the same length")
+
+    vectorized = bool(lengths)
+    namespace = _namespace(_VECTOR_FUNCTIONS if vectorized else _SCALAR_FUNCTIONS, columns)
+    results = []
+    for expression in expressions:
+        code, names = compile_expression(expression)
+        _check_names(names, columns)
+        if vectorized:
+            with np.errstate(all="ignore"):
+                results.append(_to_python(eval(code, namespace)))
+        else:
+            results.append(_to_python(eval(code, namespace)))
+    return results
@@ -1,7 +1,7 @@
 """
 Task manager for orchestrating crews of AI agents.
 """
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 import asyncio
 import json
 import threading
@@ -10,10 +10,15 @@ from datetime import datetime
 from crewai import Crew, Process, Task as CrewTask
 from sqlalchemy.orm import Session
 
+from backend.agents.executor import release_task_batcher
+from backend.agents.file_buffer import close_task_buffer
+from backend.agents.task_events import get_task_event_broker
 from backend.agents.factory import AgentFactory
-from backend.db.models import Task, Agent, TaskStep
-from backend.crud.task import task as task_crud
-from backend.schemas.task import TaskStepCreate, TaskUpdate
+from backend.core.config import settings
+from backend.db.models import ArchivedTask, Task, Agent, TaskStep
+from backend.db.write_funnel import get_write_funnel
+from backend.crud.task import archived_task as archived_task_crud, task as task_crud
+from backend.schemas.task import TaskStepCreate
 
 
 class CrewManager:
@@ -53,6 +58,38 @@ class CrewManager:
         self.running_tasks[task_id] = thread
         thread.start()
     
+    def _write(self, operation: Callable[[Session], Any]) -> Any:
+        """
+        Apply a write operation and commit it.
+        
+        With DB_WRITE_FUNNEL_ENABLED the operation goes through the shared
+        group-commit funnel, so status and step writes from many crews share
+        commits; otherwise it runs on this manager's session.
+        
+        Args:
+            operation: Callable taking a session; it must not commit.
+            
+        Returns:
+            Any: The operation's return value.
+        """
+        if settings.DB_WRITE_FUNNEL_ENABLED:
+            return get_write_funnel().run(operation)
+        try:
+            result = operation(self.db)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return result
+    
+    def _set_status(
+        self, task_id: int, status: str, result: Optional[Dict[str, Any]] = None
+    ) -> None:
+        self._write(
+            lambda db: task_crud.set_status(db, task_id=task_id, status=status, result=result)
+        )
+        get_task_event_broker().publish(task_id, status=status)
+    
     def _execute_task_thread(self, task_id: int) -> None:
         """
         Thread method to execute a task using CrewAI.
@@ -66,37 +103,34 @@ class CrewManager:
             if not task:
                 return
             
-            task_update = TaskUpdate(status="in_progress")
-            task_crud.update(self.db, db_obj=task, obj_in=task_update)
+            self._set_status(task_id, "in_progress")
             
             # Create crew agents from the task's assigned agents
             crew_agents = []
             for agent in task.agents:
-                crew_agent = AgentFactory.create_agent(agent)
+                crew_agent = AgentFactory.create_agent(agent, task_id=task_id)
                 crew_agents.append(crew_agent)
             
             if not crew_agents:
                 # No agents available
-                task_update = TaskUpdate(
-                    status="failed",
-                    result={"error": "No agents assigned to task"}
+                self._set_status(
+                    task_id, "failed", result={"error": "No agents assigned to task"}
                 )
-                task_crud.update(self.db, db_obj=task, obj_in=task_update)
                 return
             
             # Create crew tasks for each agent
             crew_tasks = []
+            step_creates = []
             for i, agent in enumerate(crew_agents):
                 # Create task step entry
                 step_number = i + 1
-                step_create = TaskStepCreate(
+                step_creates.append(TaskStepCreate(
                     task_id=task_id,
                     agent_id=task.agents[i].id,
                     step_number=step_number,
                     status="in_progress",
                     input_data={"context": task.description}
-                )
-                task_step = task_crud.add_task_step(self.db, obj_in=step_create)
+                ))
                 
                 # Create crew task
                 crew_task = CrewTask(
@@ -106,6 +140,19 @@ class CrewManager:
                 )
                 crew_tasks.append(crew_task)
             
+            # Record all steps in a single write
+            step_ids = self._write(lambda db: task_crud.add_task_steps(db, steps=step_creates))
+            steps = [
+                {
+                    "id": step_id,
+                    "agent_id": step.agent_id,
+                    "step_number": step.step_number,
+                    "status": step.status,
+                }
+                for step_id, step in zip(step_ids, step_creates)
+            ]
+            get_task_event_broker().publish(task_id, steps=steps)
+            
             # Create and run the crew
             crew = Crew(
                 agents=crew_agents,
@@ -116,35 +163,41 @@ class CrewManager:
             # Execute the crew
             result = crew.kickoff()
             
-            # Update task with result
-            task_update = TaskUpdate(
-                status="completed",
-                result={"output": result}
-            )
-            task_crud.update(self.db, db_obj=task, obj_in=task_update)
+            # Make sure files written by the agents are complete before the
+            # task is reported as finished
+            close_task_buffer(task_id)
             
-            # Update all task steps to completed
-            steps = task_crud.get_task_steps(self.db, task_id=task_id)
-            for step in steps:
-                if step.status != "completed":
-                    step.status = "completed"
-                    step.output_data = {"part_of_result": True}
-                    step.updated_at = datetime.utcnow()
-                    self.db.add(step)
+            # Record how much concurrent tool execution saved, if used
+            output_data = {"part_of_result": True}
+            tool_stats = release_task_batcher(task_id)
+            if tool_stats:
+                output_data["tool_concurrency"] = tool_stats
             
-            self.db.commit()
+            # Store the final text rather than the CrewOutput object, which
+            # is not JSON-serializable; large outputs go to the blob store
+            output = getattr(result, "raw", None) or str(result)
+            
+            # Update task with result and complete all steps in one commit
+            def complete(db: Session) -> None:
+                task_crud.set_status(
+                    db, task_id=task_id, status="completed", result={"output": output}
+                )
+                task_crud.complete_steps(db, task_id=task_id, output_data=output_data)
+            
+            self._write(complete)
+            get_task_event_broker().publish(
+                task_id,
+                status="completed",
+                steps=[{**step, "status": "completed"} for step in steps],
+            )
             
         except Exception as e:
             # Handle any errors
-            task_update = TaskUpdate(
-                status="failed",
-                result={"error": str(e)}
-            )
-            task = self.db.query(Task).filter(Task.id == task_id).first()
-            if task:
-                task_crud.update(self.db, db_obj=task, obj_in=task_update)
+            self._set_status(task_id, "failed", result={"error": str(e)})
         
         finally:
+            close_task_buffer(task_id)
+            release_task_batcher(task_id)
             # Remove task from running tasks
             if task_id in self.running_tasks:
                 del self.running_tasks[task_id]
@@ -160,16 +213,22 @@ class CrewManager:
             Dict[str, Any]: Status information for the task.
         """
         task = self.db.query(Task).filter(Task.id == task_id).first()
+        crud = task_crud
+        if not task:
+            # Finished tasks may have been moved to the archive
+            task = self.db.query(ArchivedTask).filter(ArchivedTask.id == task_id).first()
+            crud = archived_task_crud
         if not task:
             return {"status": "not_found"}
         
-        steps = task_crud.get_task_steps(self.db, task_id=task_id)
+        steps = crud.get_task_steps(self.db, task_id=task_id)
         
         return {
             "id": task.id,
             "status": task.status,
             "title": task.title,
             "is_running": task_id in self.running_tasks,
+            "archived": isinstance(task, ArchivedTask),
             "steps": [
                 {
                     "id": step.id,
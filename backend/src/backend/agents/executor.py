@@ -0,0 +1,161 @@
+"""
+Concurrent execution of independent tool calls.
+
+Agents normally call tools one after another in the crew thread, so I/O
+latencies add up. Independent calls can instead be submitted together to a
+thread pool shared by every crew in the process. Each task gets its own
+concurrency cap so one task cannot monopolize the pool, and each batch
+records how long it took compared to running the same calls back to back.
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from backend.core.config import settings
+
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_tool_pool() -> ThreadPoolExecutor:
+    """
+    Get the process-wide thread pool used for concurrent tool calls.
+
+    Returns:
+        ThreadPoolExecutor: Shared pool sized by TOOL_EXECUTOR_WORKERS.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=settings.TOOL_EXECUTOR_WORKERS,
+                thread_name_prefix="agent-tool",
+            )
+        return _pool
+
+
+class ToolCallBatcher:
+    """
+    Runs batches of tool calls for one task on the shared pool.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        """
+        Initialize the batcher.
+
+        Args:
+            max_concurrency: Maximum calls from this task in flight at once.
+                Defaults to TOOL_MAX_CONCURRENCY_PER_TASK.
+        """
+        self.max_concurrency = max(1, max_concurrency or settings.TOOL_MAX_CONCURRENCY_PER_TASK)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._lock = threading.Lock()
+        self.batches: List[Dict[str, Any]] = []
+
+    def _timed(self, func: Callable[[], Any]) -> Tuple[Any, float]:
+        start = time.perf_counter()
+        try:
+            return func(), time.perf_counter() - start
+        except Exception as e:
+            return e, time.perf_counter() - start
+
+    def run(self, calls: Sequence[Callable[[], Any]]) -> List[Any]:
+        """
+        Run independent zero-argument callables concurrently.
+
+        Slots are acquired by the submitting thread before each call is
+        handed to the pool, so waiting for the task's cap never ties up a
+        pool thread.
+
+        Args:
+            calls: Callables to run.
+
+        Returns:
+            List[Any]: Results in the order of ``calls``. A call that raised
+            yields its exception instead of a result.
+        """
+        pool = get_tool_pool()
+        start = time.perf_counter()
+        futures: List[Future] = []
+        for call in calls:
+            self._slots.acquire()
+            try:
+                future = pool.submit(self._timed, call)
+            except Exception:
+                self._slots.release()
+                raise
+            future.add_done_callback(lambda _: self._slots.release())
+            futures.append(future)
+
+        outcomes = [future.result() for future in futures]
+        wall_time = time.perf_counter() - start
+        sequential_time = sum(duration for _, duration in outcomes)
+
+        with self._lock:
+            self.batches.append({
+                "calls": len(calls),
+                "wall_time": round(wall_time, 4),
+                "sequential_time": round(sequential_time, 4),
+                "speedup": round(sequential_time / wall_time, 2) if wall_time > 0 else 1.0,
+            })
+        return [result for result, _ in outcomes]
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Aggregate timing across all batches run so far.
+
+        Returns:
+            Dict[str, Any]: Batch count, call count, total wall and
+            sequential time, overall speedup and the per-batch records.
+        """
+        with self._lock:
+            batches = list(self.batches)
+        wall_time = sum(batch["wall_time"] for batch in batches)
+        sequential_time = sum(batch["sequential_time"] for batch in batches)
+        return {
+            "batches": len(batches),
+            "calls": sum(batch["calls"] for batch in batches),
+            "wall_time": round(wall_time, 4),
+            "sequential_time": round(sequential_time, 4),
+            "speedup": round(sequential_time / wall_time, 2) if wall_time > 0 else 1.0,
+            "details": batches,
+        }
+
+
+_batchers: Dict[int, ToolCallBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_task_batcher(task_id: int) -> ToolCallBatcher:
+    """
+    Get the batcher for a task, creating it on first use.
+
+    Args:
+        task_id: ID of the task.
+
+    Returns:
+        ToolCallBatcher: Batcher shared by all agents working on the task.
+    """
+    with _batchers_lock:
+        if task_id not in _batchers:
+            _batchers[task_id] = ToolCallBatcher()
+        return _batchers[task_id]
+
+
+def release_task_batcher(task_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Drop a task's batcher and return its timing summary.
+
+    Args:
+        task_id: ID of the task.
+
+    Returns:
+        Optional[Dict[str, Any]]: Summary if any batch ran, None otherwise.
+    """
+    with _batchers_lock:
+        batcher = _batchers.pop(task_id, None)
+    if batcher is None or not batcher.batches:
+        return None
+    return batcher.summary()
@@ -9,6 +9,12 @@ from crewai import Agent as CrewAgent
 from langchain.tools import tool
 from langchain_community.llms import Ollama
 
+from backend.agents.calculator import evaluate_batch
+from backend.agents.executor import ToolCallBatcher, get_task_batcher
+from backend.agents.file_buffer import WriteBehindBuffer, get_task_buffer
+from backend.agents.sandbox import get_tool_sandbox
+from backend.agents.search_index import SearchIndex
+from backend.agents.vector_index import VectorIndex
 from backend.core.config import settings
 from backend.db.models import Agent, AgentConfig
 
@@ -19,12 +25,14 @@ class AgentFactory:
     """
     
     @staticmethod
-    def create_agent(agent_model: Agent) -> CrewAgent:
+    def create_agent(agent_model: Agent, task_id: Optional[int] = None) -> CrewAgent:
         """
         Create a CrewAI agent from a database model.
         
         Args:
             agent_model: Database agent model.
+            task_id: ID of the task the agent will work on, used to share
+                concurrent tool execution limits across the task's agents.
             
         Returns:
             CrewAgent: CrewAI agent instance.
@@ -60,7 +68,9 @@ class AgentFactory:
         # Create tools list if available
         tools = []
         if config and config.tools:
-            tools = config.tools.get("tools", [])
+            tools = AgentToolFactory.build_tools(
+                config.tools.get("tools", []), task_id=task_id
+            )
         
         # Create and return crew agent
         crew_agent = CrewAgent(
@@ -82,13 +92,87 @@ class AgentToolFactory:
     """
     
     @staticmethod
-    def get_tool(tool_name: str, tool_config: Dict[str, Any]) -> Optional[Callable]:
+    def build_tools(
+        tool_specs: List[Union[str, Dict[str, Any]]], task_id: Optional[int] = None
+    ) -> List[Callable]:
+        """
+        Build the tools listed in an agent configuration.
+        
+        Each spec is a tool name or a dict with a ``name`` and an optional
+        ``config``. When a task ID is given and the agent has more than one
+        tool, a ``parallel_tools`` tool is added so independent calls can run
+        concurrently under the task's concurrency cap.
+        
+        Args:
+            tool_specs: Tool specifications from the agent configuration.
+            task_id: ID of the task the tools are built for.
+            
+        Returns:
+            List[Callable]: Configured tools; unknown names are skipped.
+        """
+        tools = []
+        for spec in tool_specs:
+            if isinstance(spec, str):
+                name, tool_config = spec, {}
+            else:
+                name, tool_config = spec.get("name"), spec.get("config") or {}
+            built = AgentToolFactory.get_tool(name, tool_config, task_id=task_id)
+            if built is not None:
+                tools.append(built)
+        
+        if task_id is not None and len(tools) > 1:
+            tools.append(
+                AgentToolFactory.create_parallel_tool(tools, get_task_batcher(task_id))
+            )
+        return tools
+    
+    @staticmethod
+    def create_parallel_tool(tools: List[Any], batcher: ToolCallBatcher) -> Callable:
+        """
+        Create a tool that runs several independent tool calls at once.
+        
+        Args:
+            tools: Tools the agent may call through this tool.
+            batcher: Batcher enforcing the task's concurrency cap.
+            
+        Returns:
+            Callable: Parallel tool function.
+        """
+        tools_by_name = {t.name: t for t in tools}
+        
+        @tool
+        def parallel_tools(calls: List[Dict[str, Any]]) -> str:
+            """Run several independent tool calls at the same time and return all results in order.
+            Use this instead of calling tools one by one when no call depends on another's result.
+            Args:
+                calls (list): Calls to make, each as {"tool": "<tool name>", "args": {<tool arguments>}}.
+            """
+            def make_call(call: Dict[str, Any]) -> Callable[[], Any]:
+                target = tools_by_name.get(call.get("tool"))
+                if target is None:
+                    return lambda: f"Error: unknown tool {call.get('tool')}"
+                return lambda: target.invoke(call.get("args") or {})
+            
+            results = batcher.run([make_call(call) for call in calls])
+            return "\n\n".join(
+                f"[{i}] {call.get('tool')}: "
+                + (f"Error: {result}" if isinstance(result, Exception) else str(result))
+                for i, (call, result) in enumerate(zip(calls, results), start=1)
+            )
+        
+        return parallel_tools
+    
+    @staticmethod
+    def get_tool(
+        tool_name: str, tool_config: Dict[str, Any], task_id: Optional[int] = None
+    ) -> Optional[Callable]:
         """
         Get a Langchain tool function by name and configuration.
         
         Args:
             tool_name: Name of the tool.
             tool_config: Configuration for the tool.
+            task_id: ID of the task the tool is built for, if any.
             
         Returns:
             Optional[Callable]: Configured tool function if found.
@@ -99,15 +183,17 @@ class AgentToolFactory:
         elif tool_name == "calculator":
             return AgentToolFactory.create_calculator_tool(tool_config)
         elif tool_name == "file_writer":
-            return AgentToolFactory.create_file_writer_tool(tool_config)
+            return AgentToolFactory.create_file_writer_tool(tool_config, task_id=task_id)
         elif tool_name == "file_reader":
-            return AgentToolFactory.create_file_reader_tool(tool_config)
+            return AgentToolFactory.create_file_reader_tool(tool_config, task_id=task_id)
         elif tool_name == "directory_reader":
             return AgentToolFactory.create_directory_reader_tool(tool_config)
         elif tool_name == "serper_dev_tool":
             return AgentToolFactory.create_serper_dev_tool(tool_config)
         elif tool_name == "website_search_tool":
             return AgentToolFactory.create_website_search_tool(tool_config)
+        elif tool_name == "vector_search":
+            return AgentToolFactory.create_vector_search_tool(tool_config)
         # Add more tools as needed
         return None
 
@@ -138,12 +224,17 @@ class AgentToolFactory:
     @staticmethod
     def create_website_search_tool(config: Dict[str, Any]) -> Callable:
         """
-        Create a WebsiteSearchTool for agents (placeholder).
+        Create a WebsiteSearchTool for agents.
+        Searches the offline vector index, restricted to chunks whose source
+        starts with the given website URL or path.
         Args:
-            config: Configuration for the WebsiteSearchTool.
+            config: Configuration for the WebsiteSearchTool. ``index_path`` and
+                ``top_k`` override VECTOR_INDEX_PATH and SEARCH_TOP_K.
         Returns:
             Callable: WebsiteSearchTool function.
         """
+        search = AgentToolFactory._vector_searcher(config)
+
         @tool
         def website_search_tool(website_url: str, query: str) -> str:
             """Search a specific website for information.
@@ -151,10 +242,58 @@ class AgentToolFactory:
                 website_url (str): The URL of the website to search.
                 query (str): The search query.
             """
-            # WIP this would use the WebsiteSearchTool from crewai_tools.
-            return f"WebsiteSearchTool results for '{query}' on {website_url}"
+            return search(query, website_url)
         return website_search_tool
 
+    @staticmethod
+    def create_vector_search_tool(config: Dict[str, Any]) -> Callable:
+        """
+        Create a semantic search tool over the offline vector index.
+        Args:
+            config: Configuration for the vector search tool. ``index_path``
+                and ``top_k`` override VECTOR_INDEX_PATH and SEARCH_TOP_K.
+        Returns:
+            Callable: Vector search tool function.
+        """
+        search = AgentToolFactory._vector_searcher(config)
+
+        @tool
+        def vector_search(query: str) -> str:
+            """Find passages in the internal document collection that are semantically related to the query.
+            Args:
+                query (str): What to look for.
+            """
+            return search(query, None)
+        return vector_search
+
+    @staticmethod
+    def _vector_searcher(config: Dict[str, Any]) -> Callable[[str, Optional[str]], str]:
+        """
+        Build the shared lookup used by the vector-backed search tools.
+        The index is opened lazily and kept for the tool's lifetime; its
+        embeddings are memory-mapped, so nothing is loaded eagerly.
+        """
+        index_path = config.get("index_path", settings.VECTOR_INDEX_PATH)
+        top_k = config.get("top_k", settings.SEARCH_TOP_K)
+        holder: Dict[str, VectorIndex] = {}
+
+        def search(query: str, source_prefix: Optional[str]) -> str:
+            try:
+                if not os.path.exists(os.path.join(index_path, "manifest.json")):
+                    return "Error: Vector index not found. Run the 'index-vectors' command first."
+                if "index" not in holder:
+                    holder["index"] = VectorIndex(index_path)
+                results = holder["index"].search(query, top_k=top_k, source_prefix=source_prefix)
+            except Exception as e:
+                return f"Error searching for {query}: {str(e)}"
+            if not results:
+                return f"No results found for: {query}"
+            return "\n\n".join(
+                f"{i}. Source: {result.source} (score {result.score:.3f})\n{result.text}"
+                for i, result in enumerate(results, start=1)
+            )
+        return search
+
     @staticmethod
     def create_directory_reader_tool(config: Dict[str, Any]) -> Callable:
         """
@@ -185,43 +324,62 @@ class AgentToolFactory:
         return directory_reader
 
     @staticmethod
-    def create_file_writer_tool(config: Dict[str, Any]) -> Callable:
+    def create_file_writer_tool(config: Dict[str, Any], task_id: Optional[int] = None) -> Callable:
         """
         Create a file writer tool for agents.
 
+        Full writes replace the target atomically. Appends made while working
+        on a task go through the task's write-behind buffer and are flushed
+        by size, by age or when the task finishes; without a task they are
+        written through immediately.
+
         Args:
-            config: Configuration for the file writer tool.
+            config: Configuration for the file writer tool. ``buffer_bytes``,
+                ``flush_interval`` and ``fsync`` override the FILE_WRITER_*
+                settings when no task buffer is shared.
+            task_id: ID of the task the tool is built for.
 
         Returns:
             Callable: File writer tool function.
         """
+        if task_id is not None:
+            buffer = get_task_buffer(task_id)
+        else:
+            buffer = WriteBehindBuffer(
+                max_bytes=config.get("buffer_bytes", 0),
+                max_delay=config.get("flush_interval", 0),
+                fsync_policy=config.get("fsync"),
+            )
+
         @tool
-        def file_writer(file_path: str, content: str) -> str:
+        def file_writer(file_path: str, content: str, mode: str = "write") -> str:
             """Write content to a specified file.
             Args:
                 file_path (str): The path to the file where content will be written.
                 content (str): The content to write to the file.
+                mode (str): "write" to replace the file, or "append" to add to the end of it.
             """
             try:
-                # Ensure directory exists
-                directory = os.path.dirname(file_path)
-                if directory and not os.path.exists(directory):
-                    os.makedirs(directory, exist_ok=True)
-                
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                if mode == "append":
+                    buffer.append(file_path, content)
+                    return f"Successfully appended to {file_path}"
+                if mode != "write":
+                    return f"Error writing to file {file_path}: unknown mode {mode}"
+                buffer.write(file_path, content)
                 return f"Successfully wrote to {file_path}"
             except Exception as e:
                 return f"Error writing to file {file_path}: {str(e)}"
         return file_writer
 
     @staticmethod
-    def create_file_reader_tool(config: Dict[str, Any]) -> Callable:
+    def create_file_reader_tool(config: Dict[str, Any], task_id: Optional[int] = None) -> Callable:
         """
         Create a file reader tool for agents.
 
         Args:
             config: Configuration for the file reader tool.
+            task_id: ID of the task the tool is built for. Pending buffered
+                appends for the file are flushed before it is read.
 
         Returns:
             Callable: File reader tool function.
@@ -233,6 +391,8 @@ class AgentToolFactory:
                 file_path (str): The path to the file to be read.
             """
             try:
+                if task_id is not None:
+                    get_task_buffer(task_id).flush(file_path)
                 if not os.path.exists(file_path):
                     return f"Error: File not found at {file_path}"
                 with open(file_path, 'r', encoding='utf-8') as f:
@@ -247,17 +407,34 @@ class AgentToolFactory:
         """
         Create a search tool for agents.
         
+        The tool queries the local full-text index built by the
+        ``index-documents`` CLI command.
+        
         Args:
-            config: Configuration for the search tool.
+            config: Configuration for the search tool. ``index_path`` and
+                ``top_k`` override SEARCH_INDEX_PATH and SEARCH_TOP_K.
             
         Returns:
             Callable: Search tool function.
         """
+        index_path = config.get("index_path", settings.SEARCH_INDEX_PATH)
+        top_k = config.get("top_k", settings.SEARCH_TOP_K)
+        
         @tool
         def search(query: str) -> str:
-            """Search the web for information about a topic."""
-            # Implement actual search functionality or use a placeholder
-            return f"Search results for: {query}"
+            """Search the local document collection for information about a topic."""
+            try:
+                if not os.path.exists(index_path):
+                    return "Error: Search index not found. Run the 'index-documents' command first."
+                results = SearchIndex(index_path).search(query, top_k=top_k)
+            except Exception as e:
+                return f"Error searching for {query}: {str(e)}"
+            if not results:
+                return f"No results found for: {query}"
+            return "\n\n".join(
+                f"{i}. {result.title}\n   Source: {result.path}\n   {result.snippet}"
+                for i, result in enumerate(results, start=1)
+            )
         
         return search
     
@@ -267,19 +444,46 @@ class AgentToolFactory:
         Create a calculator tool for agents.
         
         Args:
-            config: Configuration for the calculator tool.
+            config: Configuration for the calculator tool. Set ``sandbox`` to
+                override ``TOOL_SANDBOX_ENABLED`` for this tool.
             
         Returns:
             Callable: Calculator tool function.
         """
+        # Optionally run evaluations in the process-pool sandbox so runaway
+        # expressions are killed instead of pinning the crew thread
+        sandbox = None
+        if config.get("sandbox", settings.TOOL_SANDBOX_ENABLED):
+            sandbox = get_tool_sandbox()
+
         @tool
-        def calculator(expression: str) -> str:
-            """Evaluate a mathematical expression."""
+        def calculator(
+            expression: str = "",
+            expressions: Optional[List[str]] = None,
+            variables: Optional[Dict[str, Any]] = None,
+        ) -> str:
+            """Evaluate one or more mathematical expressions.
+            Args:
+                expression (str): A single expression, e.g. "sqrt(x) * 2".
+                expressions (list): Several expressions to evaluate in one call.
+                variables (dict): Variable values; a value may be a number or a list of numbers, in which case every expression is evaluated for each row.
+            """
+            batch = list(expressions or [])
+            if expression:
+                batch.insert(0, expression)
+            if not batch:
+                return "Error calculating: no expression given"
             try:
-                # Simple and safe eval for basic calculations
-                result = eval(expression, {"__builtins__": {}}, {"abs": abs, "max": max, "min": min, "round": round, "sum": sum})
-                return f"Result: {result}"
+                if sandbox is not None:
+                    results = sandbox.run(evaluate_batch, batch, variables)
+                else:
+                    results = evaluate_batch(batch, variables)
             except Exception as e:
                 return f"Error calculating: {str(e)}"
+            if len(batch) == 1:
+                return f"Result: {results[0]}"
+            return "Results:\n" + "\n".join(
+                f"{expr} = {result}" for expr, result in zip(batch, results)
+            )
         
         return calculator
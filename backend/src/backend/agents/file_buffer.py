@@ -0,0 +1,244 @@
+"""
+Buffered and atomic file writes for the ``file_writer`` tool.
+
+Agents that build a report in many small pieces would otherwise pay one
+open/write/close per call. Appends are instead collected in a per-task
+write-behind buffer and flushed when a file's pending bytes pass a size
+threshold, when they get older than a time threshold, or when the task ends.
+Full writes go to a temporary file in the target directory that is renamed
+over the target, so a crash never leaves a partially written file.
+"""
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+from backend.core.config import settings
+
+
+FSYNC_ALWAYS = "always"
+FSYNC_FLUSH = "flush"
+FSYNC_NEVER = "never"
+
+
+def _fsync_directory(directory: str) -> None:
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: str, content: str, fsync: bool = True) -> None:
+    """
+    Replace ``path`` with ``content`` via a temporary file and rename.
+
+    Args:
+        path: Target file path.
+        content: Text to write.
+        fsync: Whether to fsync the file and its directory before returning.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        # mkstemp creates 0600 files; keep the target's permissions instead
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(tmp_path, mode)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    if fsync:
+        _fsync_directory(directory)
+
+
+class _Pending:
+    __slots__ = ("chunks", "size", "since")
+
+    def __init__(self) -> None:
+        self.chunks: List[str] = []
+        self.size = 0
+        self.since = time.monotonic()
+
+
+class WriteBehindBuffer:
+    """
+    Per-task buffer of pending appends, flushed by size, age or on close.
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        max_delay: Optional[float] = None,
+        fsync_policy: Optional[str] = None,
+    ):
+        """
+        Initialize the buffer.
+
+        Args:
+            max_bytes: Pending bytes per file that trigger a flush. Defaults
+                to FILE_WRITER_BUFFER_BYTES.
+            max_delay: Seconds pending data may wait before it is flushed.
+                Defaults to FILE_WRITER_FLUSH_INTERVAL.
+            fsync_policy: ``always`` (fsync every write, appends unbuffered),
+                ``flush`` (fsync each flush and full write) or ``never``.
+                Defaults to FILE_WRITER_FSYNC.
+        """
+        self.max_bytes = settings.FILE_WRITER_BUFFER_BYTES if max_bytes is None else max_bytes
+        self.max_delay = settings.FILE_WRITER_FLUSH_INTERVAL if max_delay is None else max_delay
+        self.fsync_policy = fsync_policy or settings.FILE_WRITER_FSYNC
+        if self.fsync_policy not in (FSYNC_ALWAYS, FSYNC_FLUSH, FSYNC_NEVER):
+            raise ValueError(f"Unknown fsync policy: {self.fsync_policy}")
+        self._pending: Dict[str, _Pending] = {}
+        self._lock = threading.RLock()
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.abspath(path)
+
+    def append(self, path: str, content: str) -> None:
+        """
+        Queue ``content`` to be appended to ``path``.
+
+        Args:
+            path: Target file path.
+            content: Text to append.
+        """
+        key = self._key(path)
+        if self.fsync_policy == FSYNC_ALWAYS:
+            with self._lock:
+                self._write_append(key, content)
+            return
+
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = _Pending()
+            pending.chunks.append(content)
+            pending.size += len(content.encode("utf-8"))
+            if pending.size >= self.max_bytes:
+                self._flush_path(key)
+        self._ensure_flusher()
+
+    def write(self, path: str, content: str) -> None:
+        """
+        Atomically replace ``path`` with ``content``.
+
+        Pending appends for the path are discarded, since the full write
+        supersedes them.
+
+        Args:
+            path: Target file path.
+            content: Text to write.
+        """
+        key = self._key(path)
+        with self._lock:
+            self._pending.pop(key, None)
+            atomic_write(key, content, fsync=self.fsync_policy != FSYNC_NEVER)
+
+    def flush(self, path: Optional[str] = None) -> None:
+        """
+        Write out pending appends for one path, or for every path.
+
+        Args:
+            path: Path to flush, or None for all.
+        """
+        with self._lock:
+            keys = [self._key(path)] if path else list(self._pending)
+            for key in keys:
+                self._flush_path(key)
+
+    def _flush_path(self, key: str) -> None:
+        pending = self._pending.pop(key, None)
+        if pending is not None and pending.chunks:
+            self._write_append(key, "".join(pending.chunks))
+
+    def _write_append(self, key: str, content: str) -> None:
+        directory = os.path.dirname(key)
+        os.makedirs(directory, exist_ok=True)
+        with open(key, "a", encoding="utf-8") as f:
+            f.write(content)
+            if self.fsync_policy != FSYNC_NEVER:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None or self.max_delay <= 0:
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="file-writer-flush", daemon=True
+                )
+                self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._closed.wait(self.max_delay / 2):
+            deadline = time.monotonic() - self.max_delay
+            with self._lock:
+                stale = [key for key, p in self._pending.items() if p.since <= deadline]
+                for key in stale:
+                    try:
+                        self._flush_path(key)
+                    except OSError:
+                        pass
+
+    def close(self) -> None:
+        """
+        Flush everything and stop the background flusher.
+        """
+        self._closed.set()
+        self.flush()
+
+
+_buffers: Dict[int, WriteBehindBuffer] = {}
+_buffers_lock = threading.Lock()
+
+
+def get_task_buffer(task_id: int) -> WriteBehindBuffer:
+    """
+    Get the write-behind buffer for a task, creating it on first use.
+
+    Args:
+        task_id: ID of the task.
+
+    Returns:
+        WriteBehindBuffer: Buffer shared by all of the task's file tools.
+    """
+    with _buffers_lock:
+        if task_id not in _buffers:
+            _buffers[task_id] = WriteBehindBuffer()
+        return _buffers[task_id]
+
+
+def close_task_buffer(task_id: int) -> None:
+    """
+    Flush and drop a task's write-behind buffer, if it has one.
+
+    Args:
+        task_id: ID of the task.
+    """
+    with _buffers_lock:
+        buffer = _buffers.pop(task_id, None)
+    if buffer is not None:
+        buffer.close()
@@ -0,0 +1,263 @@
+"""
+Process-pool sandbox for running agent tools under resource limits.
+
+Tools normally run inline in the crew thread, so a pathological call (for
+example ``9**9**9**9`` in the calculator) can pin a core forever. The sandbox
+keeps a fixed pool of pre-forked worker processes and runs each call in one of
+them with a wall-clock timeout, a CPU-time limit (``RLIMIT_CPU``) and an
+address-space cap (``RLIMIT_AS``). Workers are reused across calls and only
+replaced when one has to be killed.
+"""
+import atexit
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+from typing import Any, Callable, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - resource limits are POSIX only
+    resource = None
+
+from backend.core.config import settings
+
+
+class ToolSandboxError(Exception):
+    """
+    Raised when a sandboxed tool call does not produce a result.
+    """
+
+
+class ToolTimeoutError(ToolSandboxError):
+    """
+    Raised when a sandboxed tool call exceeds its wall-clock or CPU budget.
+    """
+
+
+def _address_space_in_use() -> int:
+    """
+    Return the current virtual memory size of this process in bytes.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[0])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def _set_cpu_limit(cpu_time: Optional[float]) -> None:
+    """
+    Set the soft ``RLIMIT_CPU`` to ``cpu_time`` seconds from now, or clear it.
+    """
+    if resource is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if cpu_time is None:
+        resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(math.ceil(usage.ru_utime + usage.ru_stime + cpu_time))
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker_main(conn, memory_limit_bytes: int) -> None:
+    """
+    Worker loop: receive ``(func, args, kwargs, cpu_time)`` jobs and reply
+    with ``("ok", result)`` or ``("error", message)``.
+
+    Exceeding the CPU limit delivers ``SIGXCPU``, whose default action kills
+    the worker; the parent notices the closed pipe and replaces it.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if resource is not None and memory_limit_bytes:
+        limit = _address_space_in_use() + memory_limit_bytes
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+
+        func, args, kwargs, cpu_time = job
+        _set_cpu_limit(cpu_time)
+        try:
+            reply = ("ok", func(*args, **kwargs))
+        except MemoryError:
+            reply = ("error", "Memory limit exceeded")
+        except Exception as e:
+            reply = ("error", f"{type(e).__name__}: {e}")
+        finally:
+            _set_cpu_limit(None)
+
+        try:
+            conn.send(reply)
+        except Exception as e:
+            conn.send(("error", f"Unable to return tool result: {e}"))
+
+
+class _Worker:
+    """
+    Handle for a single sandbox worker process and its pipe.
+    """
+
+    def __init__(self, ctx, memory_limit_bytes: int):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, memory_limit_bytes),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def kill(self) -> None:
+        """
+        Terminate the worker process and release its pipe.
+        """
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self) -> None:
+        """
+        Ask the worker to exit after its current job.
+        """
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        self.kill()
+
+
+class ToolSandbox:
+    """
+    Fixed-size pool of pre-forked processes that run tool calls under
+    wall-clock, CPU-time and memory limits.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        timeout: float = 10.0,
+        cpu_time: Optional[float] = 5,
+        memory_limit_mb: Optional[int] = 512,
+    ):
+        """
+        Initialize the sandbox and fork its workers.
+
+        Args:
+            workers: Number of worker processes in the pool.
+            timeout: Wall-clock seconds allowed per call.
+            cpu_time: CPU seconds allowed per call, or None for no limit.
+            memory_limit_mb: Extra address space allowed per worker in MiB,
+                or None for no limit.
+        """
+        methods = multiprocessing.get_all_start_methods()
+        self._ctx = multiprocessing.get_context("fork" if "fork" in methods else None)
+        self.timeout = timeout
+        self.cpu_time = cpu_time
+        self.memory_limit_bytes = (memory_limit_mb or 0) * 1024 * 1024
+        self.size = max(1, workers)
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._closed = False
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._ctx, self.memory_limit_bytes)
+
+    def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run ``func(*args, **kwargs)`` in a pooled worker process.
+
+        ``func``, its arguments and its return value must be picklable, so
+        tools pass module-level functions rather than closures.
+
+        Args:
+            func: Function to call.
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            Any: The function's return value.
+
+        Raises:
+            ToolTimeoutError: If the call exceeds its wall-clock or CPU budget.
+            ToolSandboxError: If the call raises or the worker dies.
+        """
+        if self._closed:
+            raise ToolSandboxError("Tool sandbox has been shut down")
+
+        worker = self._idle.get()
+        try:
+            worker.conn.send((func, args, kwargs, self.cpu_time))
+            if not worker.conn.poll(self.timeout):
+                worker.kill()
+                worker = self._spawn()
+                raise ToolTimeoutError(
+                    f"Tool call exceeded {self.timeout}s wall-clock limit"
+                )
+            try:
+                status, payload = worker.conn.recv()
+            except (EOFError, OSError):
+                worker.kill()
+                exitcode = worker.process.exitcode
+                worker = self._spawn()
+                if exitcode == -getattr(signal, "SIGXCPU", 0):
+                    raise ToolTimeoutError(
+                        f"Tool call exceeded {self.cpu_time}s CPU time limit"
+                    )
+                raise ToolSandboxError(f"Tool worker died with exit code {exitcode}")
+        finally:
+            self._idle.put(worker)
+
+        if status == "error":
+            raise ToolSandboxError(payload)
+        return payload
+
+    def shutdown(self) -> None:
+        """
+        Stop all idle workers. Calls already in flight are left to finish.
+        """
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.stop()
+
+
+_sandbox: Optional[ToolSandbox] = None
+_sandbox_lock = threading.Lock()
+
+
+def get_tool_sandbox() -> ToolSandbox:
+    """
+    Get the process-wide tool sandbox, creating it from settings on first use.
+
+    Returns:
+        ToolSandbox: Shared sandbox instance.
+    """
+    global _sandbox
+    with _sandbox_lock:
+        if _sandbox is None:
+            _sandbox = ToolSandbox(
+                workers=settings.TOOL_SANDBOX_WORKERS,
+                timeout=settings.TOOL_SANDBOX_TIMEOUT,
+                cpu_time=settings.TOOL_SANDBOX_CPU_TIME,
+                memory_limit_mb=settings.TOOL_SANDBOX_MEMORY_MB,
+            )
+            atexit.register(_sandbox.shutdown)
+        return _sandbox
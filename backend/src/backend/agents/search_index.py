@@ -0,0 +1,303 @@
+"""
+Local full-text search index backed by SQLite FTS5.
+
+Documents from the configured directories are stored in an FTS5 table and
+ranked with BM25. Indexing is incremental: a side table records each file's
+mtime and size, and only new or changed files are re-read. Reading, decoding
+and normalizing files is spread across a process pool; SQLite then tokenizes
+the prepared text as it is inserted in a single transaction.
+"""
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from backend.core.config import settings
+
+
+# Files larger than this are skipped rather than indexed
+MAX_FILE_SIZE = 10 * 1024 * 1024
+
+# Files prepared per worker round trip
+INDEX_CHUNK_SIZE = 32
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents USING fts5(
+    title,
+    content,
+    tokenize = 'porter unicode61'
+);
+"""
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_WHITESPACE_RE = re.compile(r"[ \t\r\f\v]+")
+
+
+@dataclass
+class SearchResult:
+    """
+    A single ranked search hit.
+    """
+    path: str
+    title: str
+    snippet: str
+    score: float
+
+
+@dataclass
+class IndexStats:
+    """
+    Summary of an indexing run.
+    """
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+
+
+def _prepare_document(path: str) -> Optional[Tuple[str, str]]:
+    """
+    Read and normalize a file for indexing.
+
+    Runs in worker processes, so it only takes and returns plain data.
+
+    Returns:
+        Optional[Tuple[str, str]]: ``(title, content)``, or None if the file
+        cannot be read as text.
+    """
+    try:
+        with open(path, "rb") as f:
+            raw = f.read(MAX_FILE_SIZE + 1)
+    except OSError:
+        return None
+    if len(raw) > MAX_FILE_SIZE or b"\x00" in raw[:8192]:
+        return None
+
+    text = raw.decode("utf-8", errors="replace")
+    text = _WHITESPACE_RE.sub(" ", text)
+    title = os.path.basename(path)
+    for line in text.splitlines():
+        line = line.strip().lstrip("#").strip()
+        if line:
+            title = f"{title}: {line[:200]}"
+            break
+    return title, text
+
+
+def _prepare_chunk(paths: Sequence[str]) -> List[Optional[Tuple[str, str]]]:
+    return [_prepare_document(path) for path in paths]
+
+
+def _chunks(items: Sequence[str], size: int) -> Iterator[Sequence[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def build_match_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 query that ORs the quoted terms together.
+
+    Quoting every term keeps FTS5 operators in user input from being
+    interpreted; BM25 still ranks documents matching more terms higher.
+
+    Args:
+        query: Free-text query.
+
+    Returns:
+        str: FTS5 MATCH expression, empty if the query has no terms.
+    """
+    terms = _WORD_RE.findall(query)
+    return " OR ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+class SearchIndex:
+    """
+    SQLite FTS5 index over local document directories.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the index, creating its tables if needed.
+
+        Args:
+            path: SQLite file for the index. Defaults to SEARCH_INDEX_PATH.
+        """
+        self.path = path or settings.SEARCH_INDEX_PATH
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _scan(
+        self, directories: Iterable[str], extensions: Optional[Sequence[str]]
+    ) -> Dict[str, Tuple[float, int]]:
+        found: Dict[str, Tuple[float, int]] = {}
+        suffixes = tuple(ext.lower() for ext in extensions) if extensions else None
+        for directory in directories:
+            for root, dirs, files in os.walk(os.path.abspath(directory)):
+                dirs[:] = [d for d in dirs if not d.startswith(".")]
+                for name in files:
+                    if suffixes and not name.lower().endswith(suffixes):
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    found[path] = (stat.st_mtime, stat.st_size)
+        return found
+
+    def update(
+        self,
+        directories: Optional[Iterable[str]] = None,
+        *,
+        extensions: Optional[Sequence[str]] = None,
+        workers: Optional[int] = None,
+    ) -> IndexStats:
+        """
+        Bring the index up to date with the given directories.
+
+        Only files whose mtime or size changed since the last run are read
+        again; files that disappeared are removed from the index.
+
+        Args:
+            directories: Directories to index. Defaults to SEARCH_DOCUMENT_DIRS.
+            extensions: File suffixes to include. Defaults to
+                SEARCH_FILE_EXTENSIONS.
+            workers: Processes used to prepare documents. Defaults to the CPU
+                count; 1 prepares documents in-process.
+
+        Returns:
+            IndexStats: Counts of added, updated, removed and unchanged files.
+        """
+        directories = list(directories or settings.SEARCH_DOCUMENT_DIRS)
+        if extensions is None:
+            extensions = settings.SEARCH_FILE_EXTENSIONS
+        found = self._scan(directories, extensions)
+        stats = IndexStats()
+
+        with self._connect() as conn:
+            known = {
+                path: (file_id, mtime, size)
+                for file_id, path, mtime, size in conn.execute(
+                    "SELECT id, path, mtime, size FROM files"
+                )
+            }
+
+            roots = tuple(os.path.join(os.path.abspath(d), "") for d in directories)
+            stale = [
+                file_id for path, (file_id, _, _) in known.items()
+                if path not in found and path.startswith(roots)
+            ]
+            changed = []
+            for path, (mtime, size) in found.items():
+                entry = known.get(path)
+                if entry is None:
+                    changed.append(path)
+                    stats.added += 1
+                elif (entry[1], entry[2]) != (mtime, size):
+                    changed.append(path)
+                    stats.updated += 1
+                else:
+                    stats.unchanged += 1
+
+            for file_id in stale:
+                self._delete(conn, file_id)
+            stats.removed = len(stale)
+
+            for path, prepared in zip(changed, self._prepare(changed, workers)):
+                entry = known.get(path)
+                if entry is not None:
+                    self._delete(conn, entry[0])
+                # Unreadable files are still recorded so they are not
+                # re-read until they change
+                mtime, size = found[path]
+                cursor = conn.execute(
+                    "INSERT INTO files (path, mtime, size) VALUES (?, ?, ?)",
+                    (path, mtime, size),
+                )
+                if prepared is None:
+                    stats.skipped += 1
+                    continue
+                title, content = prepared
+                conn.execute(
+                    "INSERT INTO documents (rowid, title, content) VALUES (?, ?, ?)",
+                    (cursor.lastrowid, title, content),
+                )
+
+        return stats
+
+    def _prepare(
+        self, paths: Sequence[str], workers: Optional[int]
+    ) -> Iterator[Optional[Tuple[str, str]]]:
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(paths) <= INDEX_CHUNK_SIZE:
+            yield from _prepare_chunk(paths)
+            return
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk in pool.map(_prepare_chunk, _chunks(paths, INDEX_CHUNK_SIZE)):
+                yield from chunk
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, file_id: int) -> None:
+        conn.execute("DELETE FROM documents WHERE rowid = ?", (file_id,))
+        conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    def search(self, query: str, top_k: Optional[int] = None) -> List[SearchResult]:
+        """
+        Search the index.
+
+        Args:
+            query: Free-text query.
+            top_k: Maximum number of results. Defaults to SEARCH_TOP_K.
+
+        Returns:
+            List[SearchResult]: Hits ordered by BM25 relevance, best first.
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT files.path,
+                       documents.title,
+                       snippet(documents, 1, '[', ']', '...', 24),
+                       bm25(documents, 2.0, 1.0) AS score
+                FROM documents
+                JOIN files ON files.id = documents.rowid
+                WHERE documents MATCH ?
+                ORDER BY score
+                LIMIT ?
+                """,
+                (match, top_k or settings.SEARCH_TOP_K),
+            ).fetchall()
+        # bm25() is lower-is-better; flip the sign so higher scores rank first
+        return [SearchResult(path, title, snippet, -score) for path, title, snippet, score in rows]
+
+    def count(self) -> int:
+        """
+        Return the number of indexed documents.
+        """
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
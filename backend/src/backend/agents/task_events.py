@@ -0,0 +1,263 @@
+"""
+In-process pub/sub for task progress.
+
+CrewManager publishes each status and step transition after committing it.
+Viewers of a task (the SSE and WebSocket endpoints) share one topic per
+task, which keeps the task's latest state and a version number; publishing
+merges the change into that state and wakes every viewer on its own event
+loop. The database is read once, when the first viewer subscribes to a task
+nobody was watching, instead of once per poll.
+
+Viewers only ever receive whole states, and a slow viewer that misses
+several changes wakes up to the latest one rather than to a backlog.
+Transitions of tasks nobody is watching are dropped.
+"""
+import asyncio
+import copy
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+
+# Statuses after which a task's state no longer changes
+TERMINAL_STATUSES = ("completed", "failed")
+
+TaskState = Dict[str, Any]
+
+
+def _merge(state: TaskState, update: TaskState) -> None:
+    """
+    Apply a published change to a task state in place.
+
+    Status is replaced; steps are replaced by ID and kept ordered by step
+    number. Both are absolute values, so applying a change twice is
+    harmless.
+    """
+    if update.get("status") is not None:
+        state["status"] = update["status"]
+    if update.get("steps"):
+        steps = {step["id"]: step for step in state.get("steps", [])}
+        for step in update["steps"]:
+            steps[step["id"]] = {**steps.get(step["id"], {}), **step}
+        state["steps"] = sorted(
+            steps.values(), key=lambda step: (step.get("step_number") or 0, step["id"])
+        )
+
+
+class _Topic:
+    """
+    Latest known state of one task and the subscriptions watching it.
+    """
+
+    def __init__(self) -> None:
+        self.state: Optional[TaskState] = None
+        self.version = 0
+        self.pending: List[TaskState] = []
+        self.subscriptions: Set["TaskSubscription"] = set()
+
+
+class TaskSubscription:
+    """
+    One viewer's handle on a task topic.
+
+    Created with ``TaskEventBroker.subscribe`` on the viewer's event loop;
+    close it (or use it as an async context manager) when the viewer goes
+    away.
+    """
+
+    def __init__(self, broker: "TaskEventBroker", task_id: int, topic: _Topic):
+        self.broker = broker
+        self.task_id = task_id
+        self._topic = topic
+        self._loop = asyncio.get_running_loop()
+        self._changed = asyncio.Event()
+        self.version = 0
+
+    @property
+    def seeded(self) -> bool:
+        """
+        Whether the topic already holds the task's state.
+        """
+        with self.broker._lock:
+            return self._topic.state is not None
+
+    def seed(self, state: TaskState) -> None:
+        """
+        Set the topic's state from the database, unless another viewer
+        already did. Changes published while the state was unknown are
+        applied on top.
+
+        Args:
+            state: Current task state, as built by the subscriber.
+        """
+        with self.broker._lock:
+            topic = self._topic
+            if topic.state is not None:
+                return
+            topic.state = copy.deepcopy(state)
+            for update in topic.pending:
+                _merge(topic.state, update)
+            topic.pending.clear()
+            topic.version += 1
+        self.broker._wake(topic)
+
+    def current(self) -> Optional[TaskState]:
+        """
+        Get the latest state and mark it as seen.
+
+        Returns:
+            Optional[TaskState]: Copy of the state, None if not seeded yet.
+        """
+        with self.broker._lock:
+            self.version = self._topic.version
+            self._changed.clear()
+            state = self._topic.state
+            return copy.deepcopy(state) if state is not None else None
+
+    async def next(self, timeout: Optional[float] = None) -> Optional[TaskState]:
+        """
+        Wait for a state newer than the last one returned.
+
+        Args:
+            timeout: Seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            Optional[TaskState]: The new state, or None on timeout.
+        """
+        while True:
+            with self.broker._lock:
+                if self._topic.state is not None and self._topic.version > self.version:
+                    break
+                self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self.current()
+
+    def _notify(self) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._changed.set)
+        except RuntimeError:
+            # The viewer's event loop has closed
+            pass
+
+    def close(self) -> None:
+        """
+        Stop watching the task.
+        """
+        self.broker._unsubscribe(self)
+
+    async def __aenter__(self) -> "TaskSubscription":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class TaskEventBroker:
+    """
+    Fans task transitions out to the viewers of each task.
+
+    Thread-safe: crews publish from their worker threads while viewers
+    wait on the server's event loop.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the broker.
+        """
+        self._lock = threading.Lock()
+        self._topics: Dict[int, _Topic] = {}
+
+    def subscribe(self, task_id: int) -> TaskSubscription:
+        """
+        Start watching a task. Must be called from the viewer's event loop.
+
+        If the subscription is not ``seeded``, the caller loads the task and
+        passes its state to ``seed``.
+
+        Args:
+            task_id: ID of the task.
+
+        Returns:
+            TaskSubscription: Handle for waiting on the task's state.
+        """
+        with self._lock:
+            topic = self._topics.setdefault(task_id, _Topic())
+            subscription = TaskSubscription(self, task_id, topic)
+            topic.subscriptions.add(subscription)
+        return subscription
+
+    def publish(
+        self,
+        task_id: int,
+        *,
+        status: Optional[str] = None,
+        steps: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Publish a committed change to a task.
+
+        Args:
+            task_id: ID of the task.
+            status: New status, if it changed.
+            steps: Changed steps, each with at least its ``id``.
+        """
+        update = {"status": status, "steps": steps}
+        with self._lock:
+            topic = self._topics.get(task_id)
+            if topic is None:
+                return
+            if topic.state is None:
+                topic.pending.append(update)
+                return
+            _merge(topic.state, update)
+            topic.version += 1
+        self._wake(topic)
+
+    def watcher_count(self, task_id: int) -> int:
+        """
+        Count the subscriptions watching a task.
+
+        Args:
+            task_id: ID of the task.
+
+        Returns:
+            int: Number of subscriptions.
+        """
+        with self._lock:
+            topic = self._topics.get(task_id)
+            return len(topic.subscriptions) if topic is not None else 0
+
+    def _wake(self, topic: _Topic) -> None:
+        with self._lock:
+            subscriptions = list(topic.subscriptions)
+        for subscription in subscriptions:
+            subscription._notify()
+
+    def _unsubscribe(self, subscription: TaskSubscription) -> None:
+        with self._lock:
+            topic = self._topics.get(subscription.task_id)
+            if topic is None:
+                return
+            topic.subscriptions.discard(subscription)
+            if not topic.subscriptions:
+                del self._topics[subscription.task_id]
+
+
+_broker: Optional[TaskEventBroker] = None
+_broker_lock = threading.Lock()
+
+
+def get_task_event_broker() -> TaskEventBroker:
+    """
+    Get the process-wide task event broker, creating it on first use.
+
+    Returns:
+        TaskEventBroker: Shared broker.
+    """
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = TaskEventBroker()
+        return _broker
@@ -0,0 +1,467 @@
+"""
+Offline vector retrieval over a memory-mapped NumPy embedding index.
+
+An index is a directory holding:
+
+- ``embeddings.f32``: L2-normalized float32 rows, appended in place.
+- ``metadata.jsonl`` and ``metadata.idx``: one JSON record per row plus
+  int64 byte offsets, so a hit's metadata is read with a single seek.
+- ``assignments.i32``, ``centroids.npy``: the IVF coarse partitioning, built
+  once the index passes VECTOR_IVF_THRESHOLD rows.
+- ``manifest.json``: row count, dimension, IVF state and tombstoned rows.
+  It is replaced atomically after each append, so readers never see a
+  partially written row.
+
+Embeddings are opened with ``np.memmap``, so every worker shares the OS page
+cache instead of loading its own copy. Small indexes are scanned in blocks
+with a batched dot product; large ones only scan the ``nprobe`` partitions
+whose centroids are closest to the query.
+
+Text is embedded offline with a feature-hashing embedder (signed word and
+bigram hashes), so no model download or network access is required.
+"""
+import functools
+import hashlib
+import json
+import math
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from backend.core.config import settings
+
+
+# Rows scored per block during brute-force scans
+SEARCH_BLOCK_SIZE = 65536
+
+# Chunks embedded and appended per batch during ingestion
+INGEST_BATCH_SIZE = 256
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@functools.lru_cache(maxsize=65536)
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+class HashingEmbedder:
+    """
+    Deterministic text embedder based on signed feature hashing.
+    """
+
+    def __init__(self, dim: int = 384):
+        """
+        Initialize the embedder.
+
+        Args:
+            dim: Embedding dimension.
+        """
+        self.dim = dim
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts as L2-normalized float32 vectors.
+
+        Args:
+            texts: Texts to embed.
+
+        Returns:
+            np.ndarray: Array of shape ``(len(texts), dim)``.
+        """
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = _WORD_RE.findall(text.lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                h = _feature_hash(feature)
+                out[row, h % self.dim] += 1.0 if h >> 63 else -1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return out / norms
+
+
+@dataclass
+class VectorResult:
+    """
+    A single ranked retrieval hit.
+    """
+    source: str
+    text: str
+    score: float
+    row: int
+
+
+def chunk_text(text: str, size: int, overlap: int = 100) -> List[str]:
+    """
+    Split text into overlapping chunks of roughly ``size`` characters,
+    breaking on whitespace where possible.
+
+    Args:
+        text: Text to split.
+        size: Target chunk size in characters.
+        overlap: Characters shared between consecutive chunks.
+
+    Returns:
+        List[str]: Non-empty chunks.
+    """
+    text = text.strip()
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            space = text.rfind(" ", start + size // 2, end)
+            if space != -1:
+                end = space
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return chunks
+
+
+class VectorIndex:
+    """
+    Append-only embedding index stored as memory-mapped NumPy arrays.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        *,
+        dim: Optional[int] = None,
+        embedder: Optional[HashingEmbedder] = None,
+    ):
+        """
+        Open or create an index directory.
+
+        Args:
+            path: Index directory. Defaults to VECTOR_INDEX_PATH.
+            dim: Embedding dimension for a new index. Defaults to VECTOR_DIM;
+                existing indexes keep the dimension they were built with.
+            embedder: Embedder to use. Defaults to a HashingEmbedder.
+        """
+        self.path = path or settings.VECTOR_INDEX_PATH
+        os.makedirs(self.path, exist_ok=True)
+        self._manifest_mtime: Optional[float] = None
+        self._manifest: Dict[str, Any] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self.refresh()
+        if not self._manifest:
+            self._manifest = {
+                "dim": dim or settings.VECTOR_DIM,
+                "count": 0,
+                "ivf": None,
+                "tombstones": [],
+                "sources": {},
+            }
+            self._write_manifest()
+        self.embedder = embedder or HashingEmbedder(self.dim)
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    @property
+    def dim(self) -> int:
+        return self._manifest["dim"]
+
+    @property
+    def count(self) -> int:
+        return self._manifest["count"]
+
+    def refresh(self) -> None:
+        """
+        Reload the manifest if another process has appended to the index.
+        """
+        try:
+            mtime = os.stat(self._file("manifest.json")).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._manifest_mtime:
+            return
+        with open(self._file("manifest.json"), encoding="utf-8") as f:
+            self._manifest = json.load(f)
+        self._manifest_mtime = mtime
+        self._centroids = None
+
+    def _write_manifest(self) -> None:
+        tmp = self._file("manifest.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._file("manifest.json"))
+        self._manifest_mtime = os.stat(self._file("manifest.json")).st_mtime_ns
+
+    def _vectors(self) -> np.ndarray:
+        if self.count == 0:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.memmap(
+            self._file("embeddings.f32"), dtype=np.float32, mode="r",
+            shape=(self.count, self.dim),
+        )
+
+    def _assignments(self) -> np.ndarray:
+        ivf = self._manifest["ivf"]
+        return np.memmap(
+            self._file("assignments.i32"), dtype=np.int32, mode="r",
+            shape=(ivf["assigned"],),
+        )
+
+    def _get_centroids(self) -> np.ndarray:
+        if self._centroids is None:
+            self._centroids = np.load(self._file("centroids.npy"))
+        return self._centroids
+
+    def add(self, records: Sequence[Dict[str, Any]]) -> int:
+        """
+        Embed and append records to the index.
+
+        Args:
+            records: Dicts with a ``text`` key plus any metadata (for
+                example ``source``).
+
+        Returns:
+            int: Number of rows appended.
+        """
+        if not records:
+            return 0
+        vectors = self.embedder.embed([record["text"] for record in records])
+        start = self.count
+
+        with open(self._file("embeddings.f32"), "ab") as f:
+            f.write(vectors.astype(np.float32, copy=False).tobytes())
+        with open(self._file("metadata.jsonl"), "ab") as meta, open(self._file("metadata.idx"), "ab") as idx:
+            offset = meta.tell()
+            offsets = []
+            for record in records:
+                line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+                offsets.append(offset)
+                meta.write(line)
+                offset += len(line)
+            idx.write(np.asarray(offsets, dtype=np.int64).tobytes())
+
+        ivf = self._manifest["ivf"]
+        if ivf is not None:
+            lists = np.argmax(vectors @ self._get_centroids().T, axis=1).astype(np.int32)
+            with open(self._file("assignments.i32"), "ab") as f:
+                f.write(lists.tobytes())
+            ivf["assigned"] += len(records)
+
+        self._manifest["count"] = start + len(records)
+        self._write_manifest()
+
+        threshold = settings.VECTOR_IVF_THRESHOLD
+        if ivf is None and self.count >= threshold:
+            self.build_ivf()
+        elif ivf is not None and self.count >= 2 * ivf["trained_on"]:
+            # Retrain once the index has doubled so partitions stay balanced
+            self.build_ivf()
+        return len(records)
+
+    def build_ivf(self, n_lists: Optional[int] = None, iterations: int = 10, seed: int = 0) -> None:
+        """
+        Train coarse centroids with spherical k-means and assign every row.
+
+        Args:
+            n_lists: Number of partitions. Defaults to about sqrt(count).
+            iterations: k-means iterations.
+            seed: Random seed for sampling and initialization.
+        """
+        vectors = self._vectors()
+        count = len(vectors)
+        if count == 0:
+            return
+        n_lists = max(1, min(n_lists or int(math.sqrt(count)), count))
+        rng = np.random.default_rng(seed)
+        sample_size = min(count, 256 * n_lists)
+        sample = np.asarray(vectors[np.sort(rng.choice(count, sample_size, replace=False))])
+
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for k in range(n_lists):
+                members = sample[labels == k]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    if norm > 0:
+                        centroids[k] = centroid / norm
+
+        with open(self._file("assignments.i32"), "wb") as f:
+            for start in range(0, count, SEARCH_BLOCK_SIZE):
+                block = np.asarray(vectors[start:start + SEARCH_BLOCK_SIZE])
+                f.write(np.argmax(block @ centroids.T, axis=1).astype(np.int32).tobytes())
+        np.save(self._file("centroids.npy"), centroids.astype(np.float32))
+
+        self._centroids = centroids.astype(np.float32)
+        self._manifest["ivf"] = {"lists": n_lists, "trained_on": count, "assigned": count}
+        self._write_manifest()
+
+    def _candidates(self, query: np.ndarray, nprobe: int) -> Optional[np.ndarray]:
+        ivf = self._manifest["ivf"]
+        if ivf is None:
+            return None
+        probe = np.argsort(self._get_centroids() @ query)[::-1][:nprobe]
+        rows = np.flatnonzero(np.isin(self._assignments(), probe))
+        # Rows appended by another writer after our last assignment pass
+        tail = np.arange(ivf["assigned"], self.count)
+        return np.concatenate([rows, tail]) if len(tail) else rows
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        *,
+        nprobe: Optional[int] = None,
+        source_prefix: Optional[str] = None,
+    ) -> List[VectorResult]:
+        """
+        Find the rows most similar to ``query`` by cosine similarity.
+
+        Args:
+            query: Query text.
+            top_k: Maximum number of results.
+            nprobe: IVF partitions to scan. Defaults to VECTOR_IVF_NPROBE.
+            source_prefix: Only return rows whose ``source`` starts with this.
+
+        Returns:
+            List[VectorResult]: Hits ordered by similarity, best first.
+        """
+        self.refresh()
+        if self.count == 0 or top_k <= 0:
+            return []
+        q = self.embedder.embed([query])[0]
+        vectors = self._vectors()
+        candidates = self._candidates(q, nprobe or settings.VECTOR_IVF_NPROBE)
+        # Over-fetch when filtering so enough rows survive the filter
+        fetch = top_k * 10 if source_prefix or self._manifest["tombstones"] else top_k
+
+        rows: List[np.ndarray] = []
+        scores: List[np.ndarray] = []
+        total = self.count if candidates is None else len(candidates)
+        for start in range(0, total, SEARCH_BLOCK_SIZE):
+            if candidates is None:
+                block_rows = np.arange(start, min(start + SEARCH_BLOCK_SIZE, total))
+                block = vectors[start:start + SEARCH_BLOCK_SIZE]
+            else:
+                block_rows = candidates[start:start + SEARCH_BLOCK_SIZE]
+                block = vectors[block_rows]
+            block_scores = np.asarray(block) @ q
+            if len(block_scores) > fetch:
+                keep = np.argpartition(block_scores, -fetch)[-fetch:]
+                block_rows, block_scores = block_rows[keep], block_scores[keep]
+            rows.append(block_rows)
+            scores.append(block_scores)
+
+        if not rows:
+            return []
+        all_rows = np.concatenate(rows)
+        all_scores = np.concatenate(scores)
+        order = np.argsort(all_scores)[::-1]
+
+        dead = self._dead_rows()
+        results = []
+        for i in order:
+            row = int(all_rows[i])
+            if row in dead:
+                continue
+            record = self._record(row)
+            source = record.get("source", "")
+            if source_prefix and not source.startswith(source_prefix):
+                continue
+            results.append(VectorResult(source, record["text"], float(all_scores[i]), row))
+            if len(results) == top_k:
+                break
+        return results
+
+    def _dead_rows(self) -> set:
+        dead = set()
+        for start, end in self._manifest["tombstones"]:
+            dead.update(range(start, end))
+        return dead
+
+    def _record(self, row: int) -> Dict[str, Any]:
+        offsets = np.memmap(self._file("metadata.idx"), dtype=np.int64, mode="r", shape=(self.count,))
+        with open(self._file("metadata.jsonl"), "rb") as f:
+            f.seek(int(offsets[row]))
+            return json.loads(f.readline())
+
+    def ingest(
+        self,
+        directories: Iterable[str],
+        *,
+        extensions: Optional[Sequence[str]] = None,
+        chunk_size: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """
+        Append chunks from new or changed files under ``directories``.
+
+        Unchanged files (same mtime and size) are skipped. Rows from earlier
+        versions of a changed file are tombstoned rather than rewritten.
+
+        Args:
+            directories: Directories to ingest.
+            extensions: File suffixes to include. Defaults to
+                SEARCH_FILE_EXTENSIONS.
+            chunk_size: Characters per chunk. Defaults to VECTOR_CHUNK_SIZE.
+
+        Returns:
+            Dict[str, int]: Counts of ``files`` ingested, ``chunks`` appended
+            and ``unchanged`` files skipped.
+        """
+        if extensions is None:
+            extensions = settings.SEARCH_FILE_EXTENSIONS
+        suffixes = tuple(ext.lower() for ext in extensions)
+        chunk_size = chunk_size or settings.VECTOR_CHUNK_SIZE
+        sources = self._manifest["sources"]
+        stats = {"files": 0, "chunks": 0, "unchanged": 0}
+        pending: List[Dict[str, Any]] = []
+
+        for directory in directories:
+            for root, dirs, files in os.walk(os.path.abspath(directory)):
+                dirs[:] = [d for d in dirs if not d.startswith(".")]
+                for name in sorted(files):
+                    if suffixes and not name.lower().endswith(suffixes):
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                        with open(path, encoding="utf-8", errors="replace") as f:
+                            text = f.read()
+                    except OSError:
+                        continue
+                    known = sources.get(path)
+                    if known and known["mtime"] == stat.st_mtime and known["size"] == stat.st_size:
+                        stats["unchanged"] += 1
+                        continue
+                    if known:
+                        self._manifest["tombstones"].append(known["rows"])
+
+                    chunks = [{"source": path, "text": chunk} for chunk in chunk_text(text, chunk_size)]
+                    first = self.count + len(pending)
+                    sources[path] = {
+                        "mtime": stat.st_mtime,
+                        "size": stat.st_size,
+                        "rows": [first, first + len(chunks)],
+                    }
+                    pending.extend(chunks)
+                    stats["files"] += 1
+                    stats["chunks"] += len(chunks)
+                    if len(pending) >= INGEST_BATCH_SIZE:
+                        self.add(pending)
+                        pending = []
+
+        if pending:
+            self.add(pending)
+        else:
+            self._write_manifest()
+        return stats
@@ -3,7 +3,7 @@ API router for v1 endpoints.
 """
 from fastapi import APIRouter
 
-from backend.api.v1.endpoints import auth, users, agents, tasks
+from backend.api.v1.endpoints import auth, users, agents, tasks, metrics
 
 api_router = APIRouter()
 
@@ -11,4 +11,5 @@ api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 api_router.include_router(users.router, prefix="/users", tags=["Users"])
 api_router.include_router(agents.router, prefix="/agents", tags=["Agents"])
-api_router.include_router(tasks.router, prefix="/tasks", tags=["Tasks"])
\ No newline at end of file
+api_router.include_router(tasks.router, prefix="/tasks", tags=["Tasks"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
@@ -0,0 +1,48 @@
+"""
+Helpers for batch create, update and delete endpoints.
+"""
+from typing import Collection, Iterable, Set
+
+from fastapi import HTTPException, status
+
+from backend.core.config import settings
+
+
+def check_batch_size(count: int) -> None:
+    """
+    Reject batches larger than BATCH_MAX_ITEMS.
+    
+    Args:
+        count: Number of records in the request.
+        
+    Raises:
+        HTTPException: If the batch is too large.
+    """
+    if count > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch too large (at most {settings.BATCH_MAX_ITEMS} items)",
+        )
+
+
+def check_all_found(ids: Iterable[int], found: Collection[int], name: str) -> None:
+    """
+    Reject a batch that refers to records which do not exist.
+    
+    Batches are applied all or nothing, so one unknown ID fails the whole
+    request.
+    
+    Args:
+        ids: Requested record IDs.
+        found: IDs that exist.
+        name: Plural record name for the error message.
+        
+    Raises:
+        HTTPException: If any requested ID is missing.
+    """
+    missing: Set[int] = set(ids) - set(found)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{name.capitalize()} not found: {sorted(missing)}",
+        )
@@ -8,14 +8,15 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from backend.core.config import settings
 from backend.core.security import ALGORITHM
-from backend.db.database import SessionLocal
+from backend.db.database import SessionLocal, get_async_db
 from backend.db.models import User
 from backend.schemas.user import TokenPayload
-from backend.crud.user import user as user_crud
+from backend.crud.user import user as user_crud, user_async
 
 # OAuth2 token URL
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
@@ -35,21 +36,18 @@ def get_db() -> Generator:
         db.close()
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
+def decode_access_token(token: str) -> TokenPayload:
     """
-    Dependency for getting the current authenticated user.
+    Decode and validate a JWT access token.
     
     Args:
-        db: Database session.
         token: JWT access token.
         
     Returns:
-        User: Current authenticated user.
+        TokenPayload: Token claims.
         
     Raises:
-        HTTPException: If authentication fails.
+        HTTPException: If the token is invalid or expired.
     """
     try:
         payload = jwt.decode(
@@ -71,6 +69,27 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    return token_data
+
+
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> User:
+    """
+    Dependency for getting the current authenticated user.
+    
+    Args:
+        db: Database session.
+        token: JWT access token.
+        
+    Returns:
+        User: Current authenticated user.
+        
+    Raises:
+        HTTPException: If authentication fails.
+    """
+    token_data = decode_access_token(token)
+    
     user = user_crud.get(db, id=int(token_data.sub))
     if not user:
         raise HTTPException(
@@ -126,4 +145,56 @@ def get_current_superuser(
             detail="Not enough permissions",
         )
     
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> User:
+    """
+    Dependency for getting the current authenticated user in async endpoints.
+    
+    Args:
+        db: Async database session.
+        token: JWT access token.
+        
+    Returns:
+        User: Current authenticated user.
+        
+    Raises:
+        HTTPException: If authentication fails.
+    """
+    token_data = decode_access_token(token)
+    
+    user = await user_async.get(db, id=int(token_data.sub))
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    
+    return user
+
+
+async def get_current_active_user_async(
+    current_user: User = Depends(get_current_user_async),
+) -> User:
+    """
+    Dependency for getting the current active user in async endpoints.
+    
+    Raises:
+        HTTPException: If the user is inactive.
+    """
+    return get_current_active_user(current_user)
+
+
+async def get_current_superuser_async(
+    current_user: User = Depends(get_current_active_user_async),
+) -> User:
+    """
+    Dependency for getting the current superuser in async endpoints.
+    
+    Raises:
+        HTTPException: If the user is not a superuser.
+    """
+    return get_current_superuser(current_user)
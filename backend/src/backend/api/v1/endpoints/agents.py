@@ -1,32 +1,74 @@
 """
 Agent management endpoints.
 """
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from backend.api.v1.dependencies import get_db, get_current_active_user
-from backend.crud.agent import agent as agent_crud
+from backend.api.v1.batch import check_all_found, check_batch_size
+from backend.api.v1.pagination import respond_with_page, set_total_count
+from backend.crud.base import unit_of_work
+from backend.crud.agent import agent as agent_crud, agent_async
+from backend.db.database import get_async_db
 from backend.db.models import User, Agent as AgentModel
-from backend.schemas.agent import Agent, AgentCreate, AgentUpdate
+from backend.schemas.agent import Agent, AgentBatchUpdate, AgentCreate, AgentUpdate
+from backend.schemas.base import BatchDeleteResult
 
 router = APIRouter()
 
 
+def _get_default_owner(db: Session) -> User:
+    """
+    Get the owner for agents created without authentication.
+    
+    Since we're not requiring authentication, we use the first user in the
+    database, creating a default one if none exists.
+    """
+    user = db.query(User).first()
+    if not user:
+        from backend.core.security import get_password_hash
+        user = User(
+            email="default@example.com",
+            username="default",
+            hashed_password=get_password_hash("default"),
+            is_active=True
+        )
+        db.add(user)
+        db.flush()
+    return user
+
+
 @router.get("", response_model=List[Agent])
-def read_agents(
-    db: Session = Depends(get_db),
+async def read_agents(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     # Commenting out the authentication requirement
     # current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
     Read all agents. (Authentication requirement removed for development)
+    
+    Pass ``cursor`` (empty for the first page) to page newest first by
+    creation time; the following page's cursor is returned in the
+    ``X-Next-Cursor`` header. Without it, ``skip``/``limit`` offsets are
+    used. ``include_total`` adds an ``X-Total-Count`` header.
     """
     # Return all agents instead of just those owned by the current user
-    agents = agent_crud.get_multi(db, skip=skip, limit=limit)
+    if cursor is not None:
+        return await respond_with_page(response, agent_async.get_page(
+            db, cursor=cursor, limit=limit, with_total=include_total
+        ))
+    
+    agents = await agent_async.get_multi(db, skip=skip, limit=limit)
+    if include_total:
+        set_total_count(response, await agent_async.count(db))
     return agents
 
 
@@ -41,32 +83,67 @@ def create_agent(
     """
     Create a new agent. (Authentication requirement removed for development)
     """
-    # Since we're not requiring authentication, we'll use a default user
-    # Get the first user from the database or create one if none exists
-    user = db.query(User).first()
-    if not user:
-        # If no user exists, create a default user
-        from backend.core.security import get_password_hash
-        user = User(
-            email="default@example.com",
-            username="default",
-            hashed_password=get_password_hash("default"),
-            is_active=True
+    with unit_of_work(db):
+        user = _get_default_owner(db)
+        agent = agent_crud.create_with_owner(
+            db, obj_in=agent_in, user_id=user.id
         )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-    
-    agent = agent_crud.create_with_owner(
-        db, obj_in=agent_in, user_id=user.id
-    )
     return agent
 
 
-@router.get("/{agent_id}", response_model=Agent)
-def read_agent(
+@router.post("/batch", response_model=List[Agent])
+def create_agents(
     *,
     db: Session = Depends(get_db),
+    agents_in: List[AgentCreate],
+) -> Any:
+    """
+    Create several agents in one transaction. (Authentication requirement
+    removed for development)
+    """
+    check_batch_size(len(agents_in))
+    with unit_of_work(db):
+        user = _get_default_owner(db)
+        return agent_crud.create_many_with_owner(db, objs_in=agents_in, user_id=user.id)
+
+
+@router.put("/batch", response_model=List[Agent])
+def update_agents(
+    *,
+    db: Session = Depends(get_db),
+    agents_in: List[AgentBatchUpdate],
+) -> Any:
+    """
+    Update several agents in one transaction. Fails without changes if any
+    agent does not exist. (Authentication requirement removed for
+    development)
+    """
+    check_batch_size(len(agents_in))
+    ids = [agent_in.id for agent_in in agents_in]
+    check_all_found(ids, agent_crud.existing_ids(db, ids), "agents")
+    return agent_crud.update_many(db, objs_in={agent_in.id: agent_in for agent_in in agents_in})
+
+
+@router.delete("/batch", response_model=BatchDeleteResult)
+def delete_agents(
+    *,
+    db: Session = Depends(get_db),
+    ids: List[int] = Query(...),
+) -> Any:
+    """
+    Delete several agents in one transaction. Fails without changes if any
+    agent does not exist. (Authentication requirement removed for
+    development)
+    """
+    check_batch_size(len(ids))
+    check_all_found(ids, agent_crud.existing_ids(db, ids), "agents")
+    return {"deleted": agent_crud.remove_many(db, ids=ids)}
+
+
+@router.get("/{agent_id}", response_model=Agent)
+async def read_agent(
+    *,
+    db: AsyncSession = Depends(get_async_db),
     agent_id: int,
     # Commenting out the authentication requirement
     # current_user: User = Depends(get_current_active_user),
@@ -74,7 +151,7 @@ def read_agent(
     """
     Get a specific agent by ID. (Authentication requirement removed for development)
     """
-    agent = agent_crud.get(db, id=agent_id)
+    agent = await agent_async.get(db, id=agent_id)
     if not agent:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -105,7 +182,8 @@ def update_agent(
         )
     
     # Removed permission check for development
-    agent = agent_crud.update(db, db_obj=agent, obj_in=agent_in)
+    with unit_of_work(db):
+        agent = agent_crud.update(db, db_obj=agent, obj_in=agent_in)
     return agent
 
 
@@ -128,5 +206,6 @@ def delete_agent(
         )
     
     # Removed permission check for development
-    agent = agent_crud.remove(db, id=agent_id)
+    with unit_of_work(db):
+        agent = agent_crud.remove(db, id=agent_id)
     return agent
\ No newline at end of file
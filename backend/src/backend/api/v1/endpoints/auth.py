@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 from backend.api.v1.dependencies import get_db
 from backend.core.config import settings
 from backend.core.security import create_access_token
+from backend.crud.base import unit_of_work
 from backend.crud.user import user as user_crud
 from backend.schemas.user import Token, User, UserCreate
 
@@ -75,5 +76,6 @@ def register(
         )
     
     # Create new user
-    user = user_crud.create(db, obj_in=user_in)
+    with unit_of_work(db):
+        user = user_crud.create(db, obj_in=user_in)
     return user
\ No newline at end of file
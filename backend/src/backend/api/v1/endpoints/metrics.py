@@ -0,0 +1,27 @@
+"""
+Operational metrics endpoints.
+"""
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from backend.api.v1.dependencies import get_current_superuser
+from backend.core.config import settings
+from backend.db.models import User as UserModel
+from backend.db.write_funnel import funnel_metrics
+
+router = APIRouter()
+
+
+@router.get("/write-funnel")
+def read_write_funnel_metrics(
+    current_user: UserModel = Depends(get_current_superuser),
+) -> Any:
+    """
+    Get commit batch size and latency metrics for the database write funnel.
+    Only available to superusers.
+    """
+    return {
+        "enabled": settings.DB_WRITE_FUNNEL_ENABLED,
+        "metrics": funnel_metrics(),
+    }
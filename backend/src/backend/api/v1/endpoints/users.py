@@ -1,13 +1,22 @@
 """
 User management endpoints.
 """
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from backend.api.v1.dependencies import get_db, get_current_active_user, get_current_superuser
-from backend.crud.user import user as user_crud
+from backend.api.v1.dependencies import (
+    get_db,
+    get_current_active_user,
+    get_current_superuser,
+    get_current_superuser_async,
+)
+from backend.api.v1.pagination import respond_with_page, set_total_count
+from backend.crud.base import unit_of_work
+from backend.crud.user import user as user_crud, user_async
+from backend.db.database import get_async_db
 from backend.schemas.user import User, UserCreate, UserUpdate
 from backend.db.models import User as UserModel
 
@@ -34,21 +43,37 @@ def update_user_me(
     """
     Update current user.
     """
-    user = user_crud.update(db, db_obj=current_user, obj_in=user_in)
+    with unit_of_work(db):
+        user = user_crud.update(db, db_obj=current_user, obj_in=user_in)
     return user
 
 
 @router.get("", response_model=List[User])
-def read_users(
-    db: Session = Depends(get_db),
+async def read_users(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: UserModel = Depends(get_current_superuser),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    current_user: UserModel = Depends(get_current_superuser_async),
 ) -> Any:
     """
     Read users. Only available to superusers.
+    
+    Pass ``cursor`` (empty for the first page) to page newest first by
+    creation time; the following page's cursor is returned in the
+    ``X-Next-Cursor`` header. Without it, ``skip``/``limit`` offsets are
+    used. ``include_total`` adds an ``X-Total-Count`` header.
     """
-    users = user_crud.get_multi(db, skip=skip, limit=limit)
+    if cursor is not None:
+        return await respond_with_page(response, user_async.get_page(
+            db, cursor=cursor, limit=limit, with_total=include_total
+        ))
+    
+    users = await user_async.get_multi(db, skip=skip, limit=limit)
+    if include_total:
+        set_total_count(response, await user_async.count(db))
     return users
 
 
@@ -105,7 +130,8 @@ def create_user(
         )
     
     # Create new user
-    user = user_crud.create(db, obj_in=user_in)
+    with unit_of_work(db):
+        user = user_crud.create(db, obj_in=user_in)
     return user
 
 
@@ -127,5 +153,6 @@ def update_user(
             detail="User not found",
         )
     
-    user = user_crud.update(db, db_obj=user, obj_in=user_in)
+    with unit_of_work(db):
+        user = user_crud.update(db, db_obj=user, obj_in=user_in)
     return user
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""
+Helpers for paginated list endpoints.
+"""
+from typing import Any, Awaitable, List, Optional
+
+from fastapi import HTTPException, Response, status
+
+from backend.crud.pagination import InvalidCursorError, Page
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+async def respond_with_page(
+    response: Response,
+    get_page: Awaitable[Page[Any]],
+) -> List[Any]:
+    """
+    Run a keyset page query and describe the page in response headers.
+    
+    Args:
+        response: Response whose headers receive ``X-Next-Cursor`` (when
+            more rows follow) and ``X-Total-Count`` (when counted).
+        get_page: Pending async CRUD ``get_page`` call.
+        
+    Returns:
+        List[Any]: Records on the page.
+        
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    try:
+        page = await get_page
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    set_total_count(response, page.total)
+    return page.items
+
+
+def set_total_count(response: Response, total: Optional[int]) -> None:
+    """
+    Set the ``X-Total-Count`` header if a total was computed.
+    """
+    if total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
@@ -9,13 +9,18 @@ from pathlib import Path
 from contextlib import contextmanager
 
 from backend.core.config import settings
-from backend.db.database import Base, engine, SessionLocal
+from backend.db.database import SessionLocal
+from backend.db.migrate import upgrade_database
+from backend.db.retention import archive_tasks, count_archivable
+from backend.db.task_stats import rebuild_status_counts
 from backend.main import start as start_app
 from backend.crud.agent import agent as agent_crud
 from backend.crud.task import task as task_crud
 from backend.schemas.agent import AgentCreate, AgentConfigBase
 from backend.schemas.task import TaskCreate
 from backend.agents.crew import CrewManager
+from backend.agents.search_index import SearchIndex
+from backend.agents.vector_index import VectorIndex
 
 # Default User ID for entities created via CLI
 DEFAULT_USER_ID = 1
@@ -38,9 +43,9 @@ def get_db_session():
         db.close()
 
 def init_db_command(args):
-    """Initialize database."""
-    Base.metadata.create_all(bind=engine)
-    logging.info("Database tables created.")
+    """Initialize database, applying any pending migrations."""
+    upgrade_database(revision=args.revision)
+    logging.info(f"Database migrated to revision '{args.revision}'.")
 
 def run_app_command(args):
     """Run application."""
@@ -129,6 +134,68 @@ def handle_run_task(args):
         # The CLI will print this message and exit, while the task runs in the background.
         logging.info(f"Task {args.task_id} execution started in the background.")
 
+def handle_index_documents(args):
+    """Handles the 'index-documents' CLI command."""
+    directories = args.path or settings.SEARCH_DOCUMENT_DIRS
+    if not directories:
+        logging.error("No document directories given. Use --path or set SEARCH_DOCUMENT_DIRS.")
+        return
+
+    index = SearchIndex(args.index)
+    stats = index.update(directories, workers=args.workers)
+    logging.info(
+        f"Indexed {index.path}: {stats.added} added, {stats.updated} updated, "
+        f"{stats.removed} removed, {stats.unchanged} unchanged, {stats.skipped} skipped"
+    )
+
+def handle_index_vectors(args):
+    """Handles the 'index-vectors' CLI command."""
+    directories = args.path or settings.SEARCH_DOCUMENT_DIRS
+    if not directories:
+        logging.error("No document directories given. Use --path or set SEARCH_DOCUMENT_DIRS.")
+        return
+
+    index = VectorIndex(args.index)
+    stats = index.ingest(directories, chunk_size=args.chunk_size)
+    if args.build_ivf:
+        index.build_ivf()
+    logging.info(
+        f"Indexed {index.path}: {stats['files']} files ({stats['chunks']} chunks) appended, "
+        f"{stats['unchanged']} unchanged, {index.count} rows total"
+    )
+
+def handle_archive_tasks(args):
+    """Handles the 'archive-tasks' CLI command."""
+    if args.dry_run:
+        with get_db_session() as db:
+            count = count_archivable(db, older_than_days=args.older_than_days)
+        logging.info(f"{count} tasks would be archived.")
+        return
+
+    stats = archive_tasks(
+        older_than_days=args.older_than_days,
+        batch_size=args.batch_size,
+        max_batches=args.max_batches,
+    )
+    logging.info(
+        f"Archived {stats.tasks} tasks ({stats.steps} steps) in {stats.batches} batches."
+    )
+
+def handle_reconcile_task_stats(args):
+    """Handles the 'reconcile-task-stats' CLI command."""
+    with get_db_session() as db:
+        drift = rebuild_status_counts(db)
+        if args.dry_run:
+            db.rollback()
+        else:
+            db.commit()
+    for (user_id, status), (stored, actual) in sorted(drift.items()):
+        logging.info(f"User {user_id}, status '{status}': stored {stored}, actual {actual}")
+    if args.dry_run:
+        logging.info(f"{len(drift)} task counts have drifted.")
+    else:
+        logging.info(f"Rebuilt task counts; {len(drift)} had drifted.")
+
 def main():
     """Execute CLI command."""
     setup_logging()
@@ -139,6 +206,7 @@ def main():
 
     # Init DB command
     parser_init_db = subparsers.add_parser("init-db", help="Initialize database")
+    parser_init_db.add_argument("--revision", type=str, default="head", help="Migration revision to upgrade to (defaults to head)")
     parser_init_db.set_defaults(func=init_db_command)
 
     # Run app command
@@ -174,6 +242,34 @@ def main():
     parser_run_task = subparsers.add_parser("run-task", help="Run a specific task by ID")
     parser_run_task.add_argument("--task-id", type=int, required=True, help="ID of the task to run")
     parser_run_task.set_defaults(func=handle_run_task)
+
+    # Index Documents command
+    parser_index_documents = subparsers.add_parser("index-documents", help="Build or refresh the local search index")
+    parser_index_documents.add_argument("--path", type=str, action="append", help="Directory to index (repeatable, defaults to SEARCH_DOCUMENT_DIRS)")
+    parser_index_documents.add_argument("--index", type=str, help="Index file (defaults to SEARCH_INDEX_PATH)")
+    parser_index_documents.add_argument("--workers", type=int, help="Processes used to prepare documents (defaults to CPU count)")
+    parser_index_documents.set_defaults(func=handle_index_documents)
+
+    # Index Vectors command
+    parser_index_vectors = subparsers.add_parser("index-vectors", help="Append documents to the offline vector index")
+    parser_index_vectors.add_argument("--path", type=str, action="append", help="Directory to index (repeatable, defaults to SEARCH_DOCUMENT_DIRS)")
+    parser_index_vectors.add_argument("--index", type=str, help="Index directory (defaults to VECTOR_INDEX_PATH)")
+    parser_index_vectors.add_argument("--chunk-size", type=int, help="Characters per chunk (defaults to VECTOR_CHUNK_SIZE)")
+    parser_index_vectors.add_argument("--build-ivf", action="store_true", help="Rebuild the coarse partitioning after ingesting")
+    parser_index_vectors.set_defaults(func=handle_index_vectors)
+
+    # Archive Tasks command
+    parser_archive_tasks = subparsers.add_parser("archive-tasks", help="Move old finished tasks to the archive tables")
+    parser_archive_tasks.add_argument("--older-than-days", type=int, help="Minimum age by last update (defaults to RETENTION_DAYS)")
+    parser_archive_tasks.add_argument("--batch-size", type=int, help="Tasks moved per transaction (defaults to RETENTION_BATCH_SIZE)")
+    parser_archive_tasks.add_argument("--max-batches", type=int, help="Stop after this many batches (defaults to no limit)")
+    parser_archive_tasks.add_argument("--dry-run", action="store_true", help="Only report how many tasks would be archived")
+    parser_archive_tasks.set_defaults(func=handle_archive_tasks)
+
+    # Reconcile Task Stats command
+    parser_reconcile_stats = subparsers.add_parser("reconcile-task-stats", help="Rebuild the per-user task status counts from the tasks table")
+    parser_reconcile_stats.add_argument("--dry-run", action="store_true", help="Only report the counts that have drifted")
+    parser_reconcile_stats.set_defaults(func=handle_reconcile_task_stats)
     
     args = parser.parse_args()
     
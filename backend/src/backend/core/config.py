@@ -3,7 +3,7 @@ Core configuration settings for the Agentic backend.
 """
 import os
 import secrets
-from typing import List, Union
+from typing import List, Optional, Union
 
 from pydantic import AnyHttpUrl, field_validator
 from pydantic_settings import BaseSettings
@@ -34,10 +34,85 @@ class Settings(BaseSettings):
 
     # Database Configuration
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./agentic.db")
+    # Used by async endpoints; derived from DATABASE_URL when unset
+    ASYNC_DATABASE_URL: Optional[str] = os.getenv("ASYNC_DATABASE_URL")
+
+    # SQLite Pragmas (applied to every new connection when using SQLite)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE: int = -64000  # Negative values are KiB, so 64 MB
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_TEMP_STORE: str = "MEMORY"
+
+    # Write Funnel Configuration (group commits for crew status and step writes)
+    DB_WRITE_FUNNEL_ENABLED: bool = False
+    DB_WRITE_FUNNEL_MAX_BATCH: int = 64
+    DB_WRITE_FUNNEL_MAX_DELAY_MS: float = 2.0
+    
+    # JSON Column Configuration
+    JSON_COMPRESSION: str = "zstd"  # zstd, zlib or none; zstd falls back to zlib if unavailable
+    JSON_COMPRESSION_THRESHOLD: int = 1024  # Encoded bytes before a value is compressed
+    JSON_COMPRESSION_LEVEL: Optional[int] = None  # Codec default when unset
+    
+    # Blob Store Configuration
+    BLOB_STORE_PATH: str = os.getenv("BLOB_STORE_PATH", "./blobs")
+    BLOB_OFFLOAD_THRESHOLD: int = 64 * 1024  # Encoded bytes before a value moves to the blob store
+    
+    # Batch API Configuration
+    BATCH_MAX_ITEMS: int = 1000  # Records per batch create, update or delete request
+    
+    # Retention Configuration (moves old finished tasks to the archive tables)
+    RETENTION_ENABLED: bool = False  # Run the background job in the API process
+    RETENTION_DAYS: int = 90  # Age, by last update, at which finished tasks are archived
+    RETENTION_BATCH_SIZE: int = 200  # Tasks moved per transaction
+    RETENTION_BATCH_PAUSE: float = 0.05  # Seconds between batches, to let other writers in
+    RETENTION_INTERVAL: float = 3600.0  # Seconds between background runs
+    
+    # Task Event Configuration
+    TASK_EVENTS_KEEPALIVE: float = 15.0  # Seconds between SSE keepalive comments
     
     # Ollama Configuration
     OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
     OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "agentic-specialist")
+
+    # Tool Sandbox Configuration
+    TOOL_SANDBOX_ENABLED: bool = False
+    TOOL_SANDBOX_WORKERS: int = 2
+    TOOL_SANDBOX_TIMEOUT: float = 10.0  # Wall-clock seconds per call
+    TOOL_SANDBOX_CPU_TIME: int = 5  # CPU seconds per call
+    TOOL_SANDBOX_MEMORY_MB: int = 512  # RLIMIT_AS per worker
+
+    # Concurrent Tool Execution Configuration
+    TOOL_EXECUTOR_WORKERS: int = 16  # Shared across all running tasks
+    TOOL_MAX_CONCURRENCY_PER_TASK: int = 4
+
+    # File Writer Configuration
+    FILE_WRITER_BUFFER_BYTES: int = 64 * 1024  # Pending bytes per file before a flush
+    FILE_WRITER_FLUSH_INTERVAL: float = 2.0  # Max seconds appends stay buffered
+    FILE_WRITER_FSYNC: str = "flush"  # always, flush or never
+
+    # Search Index Configuration
+    SEARCH_INDEX_PATH: str = os.getenv("SEARCH_INDEX_PATH", "./search_index.db")
+    SEARCH_DOCUMENT_DIRS: List[str] = []
+    SEARCH_FILE_EXTENSIONS: List[str] = [".txt", ".md", ".rst", ".py", ".json", ".csv", ".html"]
+    SEARCH_TOP_K: int = 5
+
+    # Vector Index Configuration
+    VECTOR_INDEX_PATH: str = os.getenv("VECTOR_INDEX_PATH", "./vector_index")
+    VECTOR_DIM: int = 384
+    VECTOR_CHUNK_SIZE: int = 800  # Characters per indexed chunk
+    VECTOR_IVF_THRESHOLD: int = 50000  # Rows before coarse partitioning is built
+    VECTOR_IVF_NPROBE: int = 8
+
+    @field_validator("SEARCH_DOCUMENT_DIRS", "SEARCH_FILE_EXTENSIONS", mode="before")
+    @classmethod
+    def assemble_search_lists(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
+        if isinstance(v, str) and not v.startswith("["):
+            return [i.strip() for i in v.split(",") if i.strip()]
+        elif isinstance(v, (list, str)):
+            return v
+        raise ValueError(v)
     
     class Config:
         case_sensitive = True
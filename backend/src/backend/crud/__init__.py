@@ -1,6 +1,7 @@
 """
 CRUD module for the Agentic backend.
 """
-from backend.crud.user import user
-from backend.crud.agent import agent
-from backend.crud.task import task
\ No newline at end of file
+from backend.crud.base import async_unit_of_work, unit_of_work
+from backend.crud.user import user, user_async
+from backend.crud.agent import agent, agent_async
+from backend.crud.task import task, task_async, archived_task, archived_task_async
\ No newline at end of file
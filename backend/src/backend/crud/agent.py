@@ -1,12 +1,16 @@
 """
 CRUD operations for agent management.
 """
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Union
 
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.interfaces import LoaderOption
 
-from backend.crud.base import CRUDBase
-from backend.db.models import Agent, AgentConfig
+from backend.crud.base import AsyncCRUDBase, CRUDBase
+from backend.crud.pagination import Page
+from backend.db.models import Agent, AgentConfig, TaskAgent
 from backend.schemas.agent import AgentCreate, AgentUpdate, AgentConfigCreate
 
 
@@ -15,6 +19,13 @@ class CRUDAgent(CRUDBase[Agent, AgentCreate, AgentUpdate]):
     CRUD operations for Agent model.
     """
     
+    def eager_options(self) -> Sequence[LoaderOption]:
+        """
+        Load each agent's config in the same query (schemas.agent.Agent
+        embeds it).
+        """
+        return (joinedload(Agent.config),)
+    
     def create_with_owner(
         self, db: Session, *, obj_in: AgentCreate, user_id: int
     ) -> Agent:
@@ -31,18 +42,16 @@ class CRUDAgent(CRUDBase[Agent, AgentCreate, AgentUpdate]):
         """
         obj_in_data = obj_in.dict(exclude={"config"})
         db_obj = Agent(**obj_in_data, user_id=user_id)
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
         
-        # Create agent config if provided
+        # Create agent config if provided; the relationship inserts it
+        # after the agent in the same flush
         if obj_in.config:
             config_data = obj_in.config.dict()
-            db_config = AgentConfig(**config_data, agent_id=db_obj.id, user_id=user_id)
-            db.add(db_config)
-            db.commit()
-            db.refresh(db_obj)
+            db_obj.config = AgentConfig(**config_data, user_id=user_id)
         
+        db.add(db_obj)
+        self._commit(db)
+        self._refresh(db, db_obj)
         return db_obj
     
     def get_multi_by_owner(
@@ -61,13 +70,43 @@ class CRUDAgent(CRUDBase[Agent, AgentCreate, AgentUpdate]):
             List[Agent]: List of agents owned by the user.
         """
         return (
-            db.query(self.model)
+            self.query(db)
             .filter(Agent.user_id == user_id)
             .offset(skip)
             .limit(limit)
             .all()
         )
     
+    def get_page_by_owner(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        with_total: bool = False,
+    ) -> Page[Agent]:
+        """
+        Get a page of agents owned by a user, newest first.
+        
+        Args:
+            db: Database session.
+            user_id: ID of the owner.
+            cursor: ``next_cursor`` of the previous page, or None.
+            limit: Maximum number of records to return.
+            with_total: Whether to also count all of the user's agents.
+            
+        Returns:
+            Page[Agent]: Agents and the cursor of the next page.
+        """
+        return self.get_page(
+            db,
+            cursor=cursor,
+            limit=limit,
+            filters=[Agent.user_id == user_id],
+            with_total=with_total,
+        )
+    
     def update(
         self,
         db: Session,
@@ -101,6 +140,220 @@ class CRUDAgent(CRUDBase[Agent, AgentCreate, AgentUpdate]):
         
         # Continue with normal update for agent
         return super().update(db, db_obj=db_obj, obj_in=update_data)
+    
+    def create_many_with_owner(
+        self, db: Session, *, objs_in: Sequence[AgentCreate], user_id: int
+    ) -> List[Agent]:
+        """
+        Create several agents and their configs in one transaction.
+        
+        Args:
+            db: Database session.
+            objs_in: Agent data.
+            user_id: ID of the owner.
+            
+        Returns:
+            List[Agent]: Created agents, in the order of ``objs_in``.
+        """
+        ids = self.insert_many(db, [
+            {**obj_in.dict(exclude={"config"}), "user_id": user_id} for obj_in in objs_in
+        ])
+        configs = [
+            {**obj_in.config.dict(), "agent_id": agent_id, "user_id": user_id}
+            for agent_id, obj_in in zip(ids, objs_in)
+            if obj_in.config
+        ]
+        if configs:
+            db.execute(insert(AgentConfig), configs)
+        self._commit(db)
+        return self.get_many(db, ids=ids)
+    
+    def update_many(
+        self,
+        db: Session,
+        *,
+        objs_in: Dict[int, Union[AgentUpdate, Dict[str, Any]]]
+    ) -> List[Agent]:
+        """
+        Update several agents and their existing configs in one transaction.
+        
+        Args:
+            db: Database session.
+            objs_in: Updated agent data, by agent ID.
+            
+        Returns:
+            List[Agent]: Updated agents; IDs that do not exist are skipped.
+        """
+        update_data: Dict[int, Dict[str, Any]] = {}
+        config_data: Dict[int, Dict[str, Any]] = {}
+        for agent_id, obj_in in objs_in.items():
+            if isinstance(obj_in, dict):
+                data = dict(obj_in)
+                config = data.pop("config", None)
+            else:
+                data = obj_in.dict(exclude_unset=True, exclude={"config"})
+                config = obj_in.config.dict(exclude_unset=True) if obj_in.config else None
+            update_data[agent_id] = data
+            if config:
+                config_data[agent_id] = config
+        
+        # Update configs of agents that have one, like ``update``
+        if config_data:
+            config_ids = db.execute(
+                select(AgentConfig.agent_id, AgentConfig.id)
+                .where(AgentConfig.agent_id.in_(config_data))
+            ).all()
+            rows = [{"id": config_id, **config_data[agent_id]} for agent_id, config_id in config_ids]
+            if rows:
+                db.execute(update(AgentConfig), rows)
+        
+        return super().update_many(db, objs_in=update_data)
+    
+    def remove_many(self, db: Session, *, ids: Sequence[int]) -> List[int]:
+        """
+        Remove several agents with their configs and task assignments.
+        
+        Args:
+            db: Database session.
+            ids: Agent IDs.
+            
+        Returns:
+            List[int]: IDs of the agents that were removed.
+        """
+        if not ids:
+            return []
+        db.execute(delete(AgentConfig).where(AgentConfig.agent_id.in_(ids)))
+        db.execute(delete(TaskAgent).where(TaskAgent.agent_id.in_(ids)))
+        return super().remove_many(db, ids=ids)
+
+
+agent = CRUDAgent(Agent)
+
+
+class AsyncCRUDAgent(AsyncCRUDBase[Agent, AgentCreate, AgentUpdate]):
+    """
+    Async CRUD operations for Agent model.
+    """
+    
+    def eager_options(self) -> Sequence[LoaderOption]:
+        """
+        Same relationships as the sync CRUDAgent.
+        """
+        return agent.eager_options()
+    
+    async def create_with_owner(
+        self, db: AsyncSession, *, obj_in: AgentCreate, user_id: int
+    ) -> Agent:
+        """
+        Create a new agent with an owner.
+        
+        Args:
+            db: Async database session.
+            obj_in: Agent data.
+            user_id: ID of the owner.
+            
+        Returns:
+            Agent: Created agent.
+        """
+        obj_in_data = obj_in.dict(exclude={"config"})
+        db_obj = Agent(**obj_in_data, user_id=user_id)
+        db.add(db_obj)
+        await db.flush()
+        
+        # Create agent config if provided
+        if obj_in.config:
+            config_data = obj_in.config.dict()
+            db.add(AgentConfig(**config_data, agent_id=db_obj.id, user_id=user_id))
+        
+        await self._commit(db)
+        return await self.reload(db, db_obj.id)
+    
+    async def get_multi_by_owner(
+        self, db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 100
+    ) -> List[Agent]:
+        """
+        Get multiple agents by owner.
+        
+        Args:
+            db: Async database session.
+            user_id: ID of the owner.
+            skip: Number of records to skip.
+            limit: Maximum number of records to return.
+            
+        Returns:
+            List[Agent]: List of agents owned by the user.
+        """
+        result = await db.execute(
+            self.select()
+            .filter(Agent.user_id == user_id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+    
+    async def get_page_by_owner(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        with_total: bool = False,
+    ) -> Page[Agent]:
+        """
+        Get a page of agents owned by a user, newest first.
+        
+        Args:
+            db: Async database session.
+            user_id: ID of the owner.
+            cursor: ``next_cursor`` of the previous page, or None.
+            limit: Maximum number of records to return.
+            with_total: Whether to also count all of the user's agents.
+            
+        Returns:
+            Page[Agent]: Agents and the cursor of the next page.
+        """
+        return await self.get_page(
+            db,
+            cursor=cursor,
+            limit=limit,
+            filters=[Agent.user_id == user_id],
+            with_total=with_total,
+        )
+    
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Agent,
+        obj_in: Union[AgentUpdate, Dict[str, Any]]
+    ) -> Agent:
+        """
+        Update an agent.
+        
+        Args:
+            db: Async database session.
+            db_obj: Existing agent, loaded with its config.
+            obj_in: Updated agent data.
+            
+        Returns:
+            Agent: Updated agent.
+        """
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+            config_data = update_data.pop("config", None)
+        else:
+            update_data = obj_in.dict(exclude_unset=True, exclude={"config"})
+            config_data = obj_in.config.dict(exclude_unset=True) if obj_in.config else None
+        
+        # Update agent config if provided
+        if config_data and db_obj.config:
+            for field, value in config_data.items():
+                setattr(db_obj.config, field, value)
+            db.add(db_obj.config)
+        
+        # Continue with normal update for agent
+        return await super().update(db, db_obj=db_obj, obj_in=update_data)
 
 
-agent = CRUDAgent(Agent)
\ No newline at end of file
+agent_async = AsyncCRUDAgent(Agent)
@@ -1,12 +1,31 @@
 """
 Base CRUD operations for the Agentic backend.
 """
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from contextlib import asynccontextmanager, contextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, delete, func, insert, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.orm.interfaces import LoaderOption
 
+from backend.crud.pagination import Page, build_page, keyset_filter, keyset_order
 from backend.db.database import Base
 
 
@@ -14,6 +33,85 @@ ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# Session.info key holding the unit-of-work nesting depth
+UNIT_OF_WORK_KEY = "unit_of_work_depth"
+
+
+def in_unit_of_work(db: Union[Session, AsyncSession]) -> bool:
+    """
+    Check whether the session is inside a ``unit_of_work`` block.
+    
+    Args:
+        db: Database session.
+        
+    Returns:
+        bool: True if CRUD writes should flush instead of commit.
+    """
+    return db.info.get(UNIT_OF_WORK_KEY, 0) > 0
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    """
+    Group CRUD writes into one transaction.
+    
+    Inside the block, CRUD methods flush instead of committing and skip
+    refreshing objects that are still loaded. The block commits once when it
+    exits, or rolls back if it raises. Nested blocks join the outermost one.
+    
+    The final commit does not expire the session's objects: what the block
+    wrote is already in them, so returning them from an endpoint does not
+    read each one back.
+    
+    Args:
+        db: Database session.
+        
+    Yields:
+        Session: The same session.
+    """
+    depth = db.info.get(UNIT_OF_WORK_KEY, 0)
+    db.info[UNIT_OF_WORK_KEY] = depth + 1
+    try:
+        yield db
+        if depth == 0:
+            expire_on_commit = db.expire_on_commit
+            db.expire_on_commit = False
+            try:
+                db.commit()
+            finally:
+                db.expire_on_commit = expire_on_commit
+    except BaseException:
+        if depth == 0:
+            db.rollback()
+        raise
+    finally:
+        db.info[UNIT_OF_WORK_KEY] = depth
+
+
+@asynccontextmanager
+async def async_unit_of_work(db: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    Group async CRUD writes into one transaction, like ``unit_of_work``.
+    
+    Args:
+        db: Async database session.
+        
+    Yields:
+        AsyncSession: The same session.
+    """
+    depth = db.info.get(UNIT_OF_WORK_KEY, 0)
+    db.info[UNIT_OF_WORK_KEY] = depth + 1
+    try:
+        yield db
+        if depth == 0:
+            await db.commit()
+    except BaseException:
+        if depth == 0:
+            await db.rollback()
+        raise
+    finally:
+        db.info[UNIT_OF_WORK_KEY] = depth
+
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
@@ -29,6 +127,51 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         self.model = model
     
+    def eager_options(self) -> Sequence[LoaderOption]:
+        """
+        Loader options for the relationships the API schema embeds.
+        
+        Subclasses override this so that serializing a page of records
+        loads related rows in a fixed number of queries instead of one lazy
+        load per record.
+        
+        Returns:
+            Sequence[LoaderOption]: Options applied by ``query``.
+        """
+        return ()
+    
+    def query(self, db: Session) -> Query:
+        """
+        Start a query for the model with the eager-loading options applied.
+        
+        Args:
+            db: Database session.
+            
+        Returns:
+            Query: Query for the model.
+        """
+        return db.query(self.model).options(*self.eager_options())
+    
+    def _commit(self, db: Session) -> None:
+        """
+        Finish a write: commit, or only flush inside ``unit_of_work``.
+        """
+        if in_unit_of_work(db):
+            db.flush()
+        else:
+            db.commit()
+    
+    def _refresh(self, db: Session, db_obj: ModelType) -> None:
+        """
+        Reload an object expired by ``_commit``.
+        
+        Inside ``unit_of_work`` the object was only flushed, so it is still
+        loaded, generated IDs and column defaults included, and nothing is
+        read.
+        """
+        if not in_unit_of_work(db):
+            db.refresh(db_obj)
+    
     def get(self, db: Session, id: int) -> Optional[ModelType]:
         """
         Get a single record by ID.
@@ -40,7 +183,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             Optional[ModelType]: Record if found, None otherwise.
         """
-        return db.query(self.model).filter(self.model.id == id).first()
+        return self.query(db).filter(self.model.id == id).first()
     
     def get_multi(
         self, db: Session, *, skip: int = 0, limit: int = 100
@@ -56,7 +199,57 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             List[ModelType]: List of records.
         """
-        return db.query(self.model).offset(skip).limit(limit).all()
+        return self.query(db).offset(skip).limit(limit).all()
+    
+    def get_page(
+        self,
+        db: Session,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Sequence[Any] = (),
+        with_total: bool = False,
+    ) -> Page[ModelType]:
+        """
+        Get a page of records, newest first, using keyset pagination.
+        
+        Args:
+            db: Database session.
+            cursor: ``next_cursor`` of the previous page, or None for the
+                first page.
+            limit: Maximum number of records to return.
+            filters: Extra filter criteria, e.g. the owner.
+            with_total: Whether to also count all records matching
+                ``filters``.
+            
+        Returns:
+            Page[ModelType]: Records and the cursor of the next page.
+            
+        Raises:
+            InvalidCursorError: If ``cursor`` is malformed.
+        """
+        query = self.query(db).filter(*filters)
+        if cursor:
+            query = query.filter(keyset_filter(self.model, cursor))
+        # Fetch one extra row to learn whether another page follows
+        rows = query.order_by(*keyset_order(self.model)).limit(limit + 1).all()
+        page = build_page(rows, limit)
+        if with_total:
+            page.total = self.count(db, filters=filters)
+        return page
+    
+    def count(self, db: Session, *, filters: Sequence[Any] = ()) -> int:
+        """
+        Count records.
+        
+        Args:
+            db: Database session.
+            filters: Filter criteria.
+            
+        Returns:
+            int: Number of matching records.
+        """
+        return db.query(func.count(self.model.id)).filter(*filters).scalar()
     
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         """
@@ -72,8 +265,8 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        self._commit(db)
+        self._refresh(db, db_obj)
         return db_obj
     
     def update(
@@ -94,17 +287,16 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             ModelType: Updated record.
         """
-        obj_data = jsonable_encoder(db_obj)
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
             update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
+        for field in inspect(self.model).columns.keys():
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        self._commit(db)
+        self._refresh(db, db_obj)
         return db_obj
     
     def remove(self, db: Session, *, id: int) -> ModelType:
@@ -120,5 +312,349 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         obj = db.query(self.model).get(id)
         db.delete(obj)
-        db.commit()
-        return obj
\ No newline at end of file
+        self._commit(db)
+        return obj
+    
+    def get_many(self, db: Session, *, ids: Sequence[int]) -> List[ModelType]:
+        """
+        Get the records with the given IDs in one query, reloading any
+        already in the session.
+        
+        Args:
+            db: Database session.
+            ids: Record IDs.
+            
+        Returns:
+            List[ModelType]: Records in the order of ``ids``; IDs that do
+            not exist are skipped.
+        """
+        if not ids:
+            return []
+        # populate_existing replaces relationships of objects already in the
+        # session, which bulk writes do not update
+        query = self.query(db).filter(self.model.id.in_(ids)).populate_existing()
+        by_id = {obj.id: obj for obj in query}
+        return [by_id[id] for id in ids if id in by_id]
+    
+    def existing_ids(self, db: Session, ids: Iterable[int]) -> Set[int]:
+        """
+        Find which of the given IDs exist.
+        
+        Args:
+            db: Database session.
+            ids: Record IDs.
+            
+        Returns:
+            Set[int]: IDs that have a record.
+        """
+        ids = list(ids)
+        if not ids:
+            return set()
+        return set(db.scalars(select(self.model.id).where(self.model.id.in_(ids))))
+    
+    def insert_many(self, db: Session, rows: Sequence[Dict[str, Any]]) -> List[int]:
+        """
+        Insert rows with multi-row INSERT statements, without committing.
+        
+        Args:
+            db: Database session.
+            rows: Column values per record.
+            
+        Returns:
+            List[int]: IDs of the new records, in the order of ``rows``.
+        """
+        if not rows:
+            return []
+        # sort_by_parameter_order would make SQLite insert one row per
+        # statement; IDs are assigned in VALUES order, so sorting the
+        # RETURNING rows restores the order of ``rows`` instead
+        return sorted(db.scalars(insert(self.model).returning(self.model.id), rows))
+    
+    def create_many(
+        self, db: Session, *, objs_in: Sequence[CreateSchemaType]
+    ) -> List[ModelType]:
+        """
+        Create several records in a single transaction.
+        
+        Unlike calling ``create`` in a loop, this commits once instead of
+        once per record, and reads the new records back in one query.
+        
+        Args:
+            db: Database session.
+            objs_in: Schemas with data to create.
+            
+        Returns:
+            List[ModelType]: Created records, in the order of ``objs_in``.
+        """
+        ids = self.insert_many(db, [jsonable_encoder(obj_in) for obj_in in objs_in])
+        self._commit(db)
+        return self.get_many(db, ids=ids)
+    
+    def update_many(
+        self,
+        db: Session,
+        *,
+        objs_in: Dict[int, Union[UpdateSchemaType, Dict[str, Any]]]
+    ) -> List[ModelType]:
+        """
+        Update several records in a single transaction.
+        
+        Records are updated by primary key with executemany, grouped by the
+        set of columns that change, and committed once.
+        
+        Args:
+            db: Database session.
+            objs_in: Schema or dict with data to update, by record ID.
+            
+        Returns:
+            List[ModelType]: Updated records, in the order of ``objs_in``;
+            IDs that do not exist are skipped.
+        """
+        columns = set(inspect(self.model).columns.keys()) - {"id"}
+        existing = self.existing_ids(db, objs_in)
+        rows = []
+        for id, obj_in in objs_in.items():
+            if id not in existing:
+                continue
+            if isinstance(obj_in, dict):
+                update_data = obj_in
+            else:
+                update_data = obj_in.dict(exclude_unset=True)
+            values = {field: value for field, value in update_data.items() if field in columns}
+            if values:
+                rows.append({"id": id, **values})
+        if rows:
+            db.execute(update(self.model), rows)
+        self._commit(db)
+        return self.get_many(db, ids=[id for id in objs_in if id in existing])
+    
+    def remove_many(self, db: Session, *, ids: Sequence[int]) -> List[int]:
+        """
+        Remove several records with one DELETE and a single commit.
+        
+        ORM cascades are not applied; subclasses delete dependent rows
+        first.
+        
+        Args:
+            db: Database session.
+            ids: Record IDs.
+            
+        Returns:
+            List[int]: IDs of the records that were removed.
+        """
+        if not ids:
+            return []
+        removed = list(db.scalars(
+            delete(self.model).where(self.model.id.in_(ids)).returning(self.model.id)
+        ))
+        self._commit(db)
+        return removed
+
+
+class AsyncCRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """
+    Base class for CRUD operations on an ``AsyncSession``.
+    
+    Mirrors CRUDBase for ``async def`` endpoints. Relationships cannot be
+    lazy-loaded from async code, so everything a response embeds must be
+    covered by ``eager_options``, and returned objects are reloaded with
+    those options after writes.
+    """
+    
+    def __init__(self, model: Type[ModelType]):
+        """
+        Initialize with SQLAlchemy model class.
+        
+        Args:
+            model: The SQLAlchemy model class.
+        """
+        self.model = model
+    
+    def eager_options(self) -> Sequence[LoaderOption]:
+        """
+        Loader options for the relationships the API schema embeds.
+        
+        Returns:
+            Sequence[LoaderOption]: Options applied by ``select``.
+        """
+        return ()
+    
+    def select(self) -> Select:
+        """
+        Start a SELECT for the model with the eager-loading options applied.
+        
+        Returns:
+            Select: Statement selecting the model.
+        """
+        return select(self.model).options(*self.eager_options())
+    
+    async def _commit(self, db: AsyncSession) -> None:
+        """
+        Finish a write: commit, or only flush inside ``async_unit_of_work``.
+        """
+        if in_unit_of_work(db):
+            await db.flush()
+        else:
+            await db.commit()
+    
+    async def get(self, db: AsyncSession, id: int) -> Optional[ModelType]:
+        """
+        Get a single record by ID.
+        
+        Args:
+            db: Async database session.
+            id: Record ID.
+            
+        Returns:
+            Optional[ModelType]: Record if found, None otherwise.
+        """
+        result = await db.execute(self.select().filter(self.model.id == id))
+        return result.scalars().first()
+    
+    async def get_multi(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+    ) -> List[ModelType]:
+        """
+        Get multiple records with pagination.
+        
+        Args:
+            db: Async database session.
+            skip: Number of records to skip.
+            limit: Maximum number of records to return.
+            
+        Returns:
+            List[ModelType]: List of records.
+        """
+        result = await db.execute(self.select().offset(skip).limit(limit))
+        return list(result.scalars().all())
+    
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Sequence[Any] = (),
+        with_total: bool = False,
+    ) -> Page[ModelType]:
+        """
+        Get a page of records, newest first, using keyset pagination.
+        
+        Args:
+            db: Async database session.
+            cursor: ``next_cursor`` of the previous page, or None.
+            limit: Maximum number of records to return.
+            filters: Extra filter criteria, e.g. the owner.
+            with_total: Whether to also count all records matching
+                ``filters``.
+            
+        Returns:
+            Page[ModelType]: Records and the cursor of the next page.
+            
+        Raises:
+            InvalidCursorError: If ``cursor`` is malformed.
+        """
+        statement = self.select().filter(*filters)
+        if cursor:
+            statement = statement.filter(keyset_filter(self.model, cursor))
+        statement = statement.order_by(*keyset_order(self.model)).limit(limit + 1)
+        rows = (await db.execute(statement)).scalars().all()
+        page = build_page(rows, limit)
+        if with_total:
+            page.total = await self.count(db, filters=filters)
+        return page
+    
+    async def count(self, db: AsyncSession, *, filters: Sequence[Any] = ()) -> int:
+        """
+        Count records.
+        
+        Args:
+            db: Async database session.
+            filters: Filter criteria.
+            
+        Returns:
+            int: Number of matching records.
+        """
+        result = await db.execute(select(func.count(self.model.id)).filter(*filters))
+        return result.scalar_one()
+    
+    async def reload(self, db: AsyncSession, id: int) -> Optional[ModelType]:
+        """
+        Re-read a record with its eager-loaded relationships refreshed.
+        
+        Args:
+            db: Async database session.
+            id: Record ID.
+            
+        Returns:
+            Optional[ModelType]: Record if found, None otherwise.
+        """
+        statement = (
+            self.select()
+            .filter(self.model.id == id)
+            .execution_options(populate_existing=True)
+        )
+        return (await db.execute(statement)).scalars().first()
+    
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        """
+        Create a new record.
+        
+        Args:
+            db: Async database session.
+            obj_in: Schema with data to create.
+            
+        Returns:
+            ModelType: Created record.
+        """
+        obj_in_data = jsonable_encoder(obj_in)
+        db_obj = self.model(**obj_in_data)
+        db.add(db_obj)
+        await self._commit(db)
+        return await self.reload(db, db_obj.id)
+    
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        """
+        Update a record.
+        
+        Args:
+            db: Async database session.
+            db_obj: Existing record to update.
+            obj_in: Schema or dict with data to update.
+            
+        Returns:
+            ModelType: Updated record.
+        """
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        for field in inspect(self.model).columns.keys():
+            if field in update_data:
+                setattr(db_obj, field, update_data[field])
+        db.add(db_obj)
+        await self._commit(db)
+        return await self.reload(db, db_obj.id)
+    
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[ModelType]:
+        """
+        Remove a record.
+        
+        Args:
+            db: Async database session.
+            id: Record ID.
+            
+        Returns:
+            Optional[ModelType]: Removed record, None if it did not exist.
+        """
+        obj = await self.get(db, id)
+        if obj is not None:
+            await db.delete(obj)
+            await self._commit(db)
+        return obj
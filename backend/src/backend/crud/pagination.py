@@ -0,0 +1,121 @@
+"""
+Keyset pagination helpers.
+
+Pages are ordered newest first by ``(created_at, id)``. A cursor encodes the
+sort key of the last row of a page, and the next page starts strictly after
+it. Unlike offsets, this costs the same for deep pages and does not skip or
+repeat rows when new ones are inserted between requests.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import tuple_
+
+
+T = TypeVar("T")
+
+
+class InvalidCursorError(ValueError):
+    """
+    Raised when a pagination cursor cannot be decoded.
+    """
+
+
+@dataclass
+class Page(Generic[T]):
+    """
+    One page of results from keyset pagination.
+    """
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """
+    Encode a sort key as an opaque cursor.
+    
+    Args:
+        created_at: Creation time of the last row on the page.
+        id: ID of the last row on the page.
+        
+    Returns:
+        str: URL-safe cursor.
+    """
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by :func:`encode_cursor`.
+    
+    Args:
+        cursor: Cursor from a previous page.
+        
+    Returns:
+        Tuple[datetime, int]: The ``(created_at, id)`` sort key.
+        
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+
+def keyset_order(model: Any) -> Tuple[Any, Any]:
+    """
+    Get the newest-first ordering used for keyset pages.
+    
+    Args:
+        model: SQLAlchemy model class with ``created_at`` and ``id``.
+        
+    Returns:
+        Tuple: ORDER BY clauses.
+    """
+    return model.created_at.desc(), model.id.desc()
+
+
+def keyset_filter(model: Any, cursor: str) -> Any:
+    """
+    Build the criterion selecting rows after a cursor.
+    
+    Args:
+        model: SQLAlchemy model class with ``created_at`` and ``id``.
+        cursor: Cursor from a previous page.
+        
+    Returns:
+        Filter criterion.
+        
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    return tuple_(model.created_at, model.id) < tuple_(*decode_cursor(cursor))
+
+
+def build_page(rows: Sequence[T], limit: int) -> Page[T]:
+    """
+    Build a page from up to ``limit + 1`` rows fetched in keyset order.
+    
+    The extra row only signals that another page follows.
+    
+    Args:
+        rows: Rows fetched with ``LIMIT limit + 1``.
+        limit: Page size.
+        
+    Returns:
+        Page: The first ``limit`` rows and the next cursor, if any.
+    """
+    page = Page(items=list(rows[:limit]))
+    if len(rows) > limit:
+        last = page.items[-1]
+        page.next_cursor = encode_cursor(last.created_at, last.id)
+    return page
@@ -1,12 +1,27 @@
 """
 CRUD operations for task management.
 """
-from typing import Any, Dict, List, Optional, Union
+import collections
+from typing import Any, Dict, List, Optional, Sequence, Union
 
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
 
-from backend.crud.base import CRUDBase
-from backend.db.models import Task, TaskAgent, TaskStep
+from backend.crud.base import AsyncCRUDBase, CRUDBase
+from backend.crud.pagination import Page
+from backend.db.models import Agent, ArchivedTask, ArchivedTaskStep, Task, TaskAgent, TaskStep
+from backend.db.task_stats import (
+    StatusDeltas,
+    add_status_delta,
+    apply_status_deltas,
+    apply_status_deltas_async,
+    deltas_for_removal,
+    get_status_counts,
+    get_status_counts_async,
+    grouped_counts,
+)
 from backend.schemas.task import TaskCreate, TaskUpdate, TaskStepCreate
 
 
@@ -15,6 +30,17 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
     CRUD operations for Task model.
     """
     
+    def eager_options(self) -> Sequence[LoaderOption]:
+        """
+        Load the agents (with their configs) and steps embedded by
+        schemas.task.Task with one extra query per relationship for the
+        whole page.
+        """
+        return (
+            selectinload(Task.agents).joinedload(Agent.config),
+            selectinload(Task.tasks_steps),
+        )
+    
     def create_with_owner(
         self, db: Session, *, obj_in: TaskCreate, user_id: int
     ) -> Task:
@@ -29,21 +55,22 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         Returns:
             Task: Created task.
         """
-        # Create task without agents
+        # Create task without agents; flush to get its ID
         obj_in_data = obj_in.dict(exclude={"agent_ids"})
         db_obj = Task(**obj_in_data, user_id=user_id)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         
         # Add agent associations
-        for agent_id in obj_in.agent_ids:
-            task_agent = TaskAgent(task_id=db_obj.id, agent_id=agent_id)
-            db.add(task_agent)
-        
-        db.commit()
-        db.refresh(db_obj)
+        db.add_all(
+            TaskAgent(task_id=db_obj.id, agent_id=agent_id) for agent_id in obj_in.agent_ids
+        )
+        deltas: StatusDeltas = collections.Counter()
+        add_status_delta(deltas, user_id, new_status=db_obj.status)
+        apply_status_deltas(db, deltas)
         
+        self._commit(db)
+        self._refresh(db, db_obj)
         return db_obj
     
     def get_multi_by_owner(
@@ -62,13 +89,56 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
             List[Task]: List of tasks owned by the user.
         """
         return (
-            db.query(self.model)
+            self.query(db)
             .filter(Task.user_id == user_id)
             .offset(skip)
             .limit(limit)
             .all()
         )
     
+    def get_page_by_owner(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        with_total: bool = False,
+    ) -> Page[Task]:
+        """
+        Get a page of tasks owned by a user, newest first.
+        
+        Args:
+            db: Database session.
+            user_id: ID of the owner.
+            cursor: ``next_cursor`` of the previous page, or None.
+            limit: Maximum number of records to return.
+            with_total: Whether to also count all of the user's tasks.
+            
+        Returns:
+            Page[Task]: Tasks and the cursor of the next page.
+        """
+        return self.get_page(
+            db,
+            cursor=cursor,
+            limit=limit,
+            filters=[Task.user_id == user_id],
+            with_total=with_total,
+        )
+    
+    def get_status_counts(self, db: Session, *, user_id: int) -> Dict[str, int]:
+        """
+        Get a user's task counts by status from the maintained counters.
+        
+        Args:
+            db: Database session.
+            user_id: ID of the owner.
+            
+        Returns:
+            Dict[str, int]: Count per status.
+        """
+        return get_status_counts(db, user_id)
+    
     def update(
         self,
         db: Session,
@@ -103,10 +173,142 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
             for agent_id in agent_ids:
                 task_agent = TaskAgent(task_id=db_obj.id, agent_id=agent_id)
                 db.add(task_agent)
+            db.expire(db_obj, ["agents"])
+        
+        if "status" in update_data:
+            deltas: StatusDeltas = collections.Counter()
+            add_status_delta(deltas, db_obj.user_id, db_obj.status, update_data["status"])
+            apply_status_deltas(db, deltas)
         
         # Continue with normal update for task
         return super().update(db, db_obj=db_obj, obj_in=update_data)
     
+    def create_many_with_owner(
+        self, db: Session, *, objs_in: Sequence[TaskCreate], user_id: int
+    ) -> List[Task]:
+        """
+        Create several tasks and their agent associations in one transaction.
+        
+        Args:
+            db: Database session.
+            objs_in: Task data.
+            user_id: ID of the owner.
+            
+        Returns:
+            List[Task]: Created tasks, in the order of ``objs_in``.
+        """
+        ids = self.insert_many(db, [
+            {**obj_in.dict(exclude={"agent_ids"}), "user_id": user_id} for obj_in in objs_in
+        ])
+        links = [
+            {"task_id": task_id, "agent_id": agent_id}
+            for task_id, obj_in in zip(ids, objs_in)
+            for agent_id in obj_in.agent_ids
+        ]
+        if links:
+            db.execute(insert(TaskAgent), links)
+        deltas: StatusDeltas = collections.Counter()
+        for obj_in in objs_in:
+            add_status_delta(deltas, user_id, new_status=obj_in.status)
+        apply_status_deltas(db, deltas)
+        self._commit(db)
+        return self.get_many(db, ids=ids)
+    
+    def update_many(
+        self,
+        db: Session,
+        *,
+        objs_in: Dict[int, Union[TaskUpdate, Dict[str, Any]]]
+    ) -> List[Task]:
+        """
+        Update several tasks, replacing the agent associations of those
+        that include ``agent_ids``, in one transaction.
+        
+        Args:
+            db: Database session.
+            objs_in: Updated task data, by task ID.
+            
+        Returns:
+            List[Task]: Updated tasks; IDs that do not exist are skipped.
+        """
+        existing = self.existing_ids(db, objs_in)
+        update_data: Dict[int, Dict[str, Any]] = {}
+        agent_ids: Dict[int, List[int]] = {}
+        for task_id, obj_in in objs_in.items():
+            if isinstance(obj_in, dict):
+                data = dict(obj_in)
+                ids = data.pop("agent_ids", None)
+            else:
+                data = obj_in.dict(exclude_unset=True, exclude={"agent_ids"})
+                ids = obj_in.agent_ids
+            update_data[task_id] = data
+            if ids is not None and task_id in existing:
+                agent_ids[task_id] = ids
+        
+        # Replace agent associations where provided
+        if agent_ids:
+            db.execute(delete(TaskAgent).where(TaskAgent.task_id.in_(agent_ids)))
+            links = [
+                {"task_id": task_id, "agent_id": agent_id}
+                for task_id, ids in agent_ids.items()
+                for agent_id in ids
+            ]
+            if links:
+                db.execute(insert(TaskAgent), links)
+        
+        # Move the counts of tasks whose status changes
+        new_status = {
+            task_id: data["status"]
+            for task_id, data in update_data.items()
+            if "status" in data and task_id in existing
+        }
+        if new_status:
+            deltas: StatusDeltas = collections.Counter()
+            for task_id, user_id, status in db.execute(
+                select(Task.id, Task.user_id, Task.status).where(Task.id.in_(new_status))
+            ):
+                add_status_delta(deltas, user_id, status, new_status[task_id])
+            apply_status_deltas(db, deltas)
+        
+        return super().update_many(db, objs_in=update_data)
+    
+    def remove(self, db: Session, *, id: int) -> Task:
+        """
+        Remove a task.
+        
+        Args:
+            db: Database session.
+            id: Task ID.
+            
+        Returns:
+            Task: Removed task.
+        """
+        db_obj = db.get(Task, id)
+        deltas: StatusDeltas = collections.Counter()
+        add_status_delta(deltas, db_obj.user_id, old_status=db_obj.status)
+        apply_status_deltas(db, deltas)
+        return super().remove(db, id=id)
+    
+    def remove_many(self, db: Session, *, ids: Sequence[int]) -> List[int]:
+        """
+        Remove several tasks with their steps and agent associations.
+        
+        Args:
+            db: Database session.
+            ids: Task IDs.
+            
+        Returns:
+            List[int]: IDs of the tasks that were removed.
+        """
+        if not ids:
+            return []
+        apply_status_deltas(
+            db, deltas_for_removal(db.execute(grouped_counts(Task.id.in_(ids))))
+        )
+        db.execute(delete(TaskStep).where(TaskStep.task_id.in_(ids)))
+        db.execute(delete(TaskAgent).where(TaskAgent.task_id.in_(ids)))
+        return super().remove_many(db, ids=ids)
+    
     def add_task_step(
         self, db: Session, *, obj_in: TaskStepCreate
     ) -> TaskStep:
@@ -123,10 +325,99 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         step_data = obj_in.dict()
         db_step = TaskStep(**step_data)
         db.add(db_step)
-        db.commit()
-        db.refresh(db_step)
+        self._commit(db)
+        self._refresh(db, db_step)
         return db_step
     
+    def set_status(
+        self,
+        db: Session,
+        *,
+        task_id: int,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Set a task's status (and optionally its result) without committing.
+        
+        Used by write operations that are committed by the caller, such as
+        those sent through the write funnel.
+        
+        Args:
+            db: Database session.
+            task_id: ID of the task.
+            status: New status.
+            result: New result, if it should change.
+        """
+        values: Dict[str, Any] = {"status": status}
+        if result is not None:
+            values["result"] = result
+        row = db.execute(select(Task.user_id, Task.status).where(Task.id == task_id)).first()
+        if row is None:
+            return
+        db.query(Task).filter(Task.id == task_id).update(
+            values, synchronize_session=False
+        )
+        deltas: StatusDeltas = collections.Counter()
+        add_status_delta(deltas, row.user_id, row.status, status)
+        apply_status_deltas(db, deltas)
+    
+    def add_task_steps(
+        self, db: Session, *, steps: List[TaskStepCreate]
+    ) -> List[int]:
+        """
+        Add several steps to a task without committing.
+        
+        Args:
+            db: Database session.
+            steps: Step data.
+            
+        Returns:
+            List[int]: IDs of the created steps.
+        """
+        db_steps = [TaskStep(**step.dict()) for step in steps]
+        db.add_all(db_steps)
+        db.flush()
+        return [step.id for step in db_steps]
+    
+    def complete_steps(
+        self, db: Session, *, task_id: int, output_data: Dict[str, Any]
+    ) -> None:
+        """
+        Mark every unfinished step of a task as completed without committing.
+        
+        Args:
+            db: Database session.
+            task_id: ID of the task.
+            output_data: Output data stored on each completed step.
+        """
+        db.query(TaskStep).filter(
+            TaskStep.task_id == task_id, TaskStep.status != "completed"
+        ).update(
+            {"status": "completed", "output_data": output_data},
+            synchronize_session=False,
+        )
+    
+    def get_task_step(
+        self, db: Session, *, task_id: int, step_id: int
+    ) -> Optional[TaskStep]:
+        """
+        Get a single step of a task.
+        
+        Args:
+            db: Database session.
+            task_id: ID of the task.
+            step_id: ID of the step.
+            
+        Returns:
+            Optional[TaskStep]: Step if it belongs to the task, None otherwise.
+        """
+        return (
+            db.query(TaskStep)
+            .filter(TaskStep.id == step_id, TaskStep.task_id == task_id)
+            .first()
+        )
+    
     def get_task_steps(
         self, db: Session, *, task_id: int
     ) -> List[TaskStep]:
@@ -148,4 +439,298 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         )
 
 
-task = CRUDTask(Task)
\ No newline at end of file
+task = CRUDTask(Task)
+
+
+class AsyncCRUDTask(AsyncCRUDBase[Task, TaskCreate, TaskUpdate]):
+    """
+    Async CRUD operations for Task model.
+    """
+    
+    def eager_options(self) -> Sequence[LoaderOption]:
+        """
+        Same relationships as the sync CRUDTask.
+        """
+        return task.eager_options()
+    
+    async def create_with_owner(
+        self, db: AsyncSession, *, obj_in: TaskCreate, user_id: int
+    ) -> Task:
+        """
+        Create a new task with an owner.
+        
+        Args:
+            db: Async database session.
+            obj_in: Task data.
+            user_id: ID of the owner.
+            
+        Returns:
+            Task: Created task.
+        """
+        obj_in_data = obj_in.dict(exclude={"agent_ids"})
+        db_obj = Task(**obj_in_data, user_id=user_id)
+        db.add(db_obj)
+        await db.flush()
+        
+        # Add agent associations
+        db.add_all(
+            TaskAgent(task_id=db_obj.id, agent_id=agent_id) for agent_id in obj_in.agent_ids
+        )
+        deltas: StatusDeltas = collections.Counter()
+        add_status_delta(deltas, user_id, new_status=db_obj.status)
+        await apply_status_deltas_async(db, deltas)
+        
+        await self._commit(db)
+        return await self.reload(db, db_obj.id)
+    
+    async def get_multi_by_owner(
+        self, db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 100
+    ) -> List[Task]:
+        """
+        Get multiple tasks by owner.
+        
+        Args:
+            db: Async database session.
+            user_id: ID of the owner.
+            skip: Number of records to skip.
+            limit: Maximum number of records to return.
+            
+        Returns:
+            List[Task]: List of tasks owned by the user.
+        """
+        result = await db.execute(
+            self.select()
+            .filter(Task.user_id == user_id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+    
+    async def get_page_by_owner(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        with_total: bool = False,
+    ) -> Page[Task]:
+        """
+        Get a page of tasks owned by a user, newest first.
+        
+        Args:
+            db: Async database session.
+            user_id: ID of the owner.
+            cursor: ``next_cursor`` of the previous page, or None.
+            limit: Maximum number of records to return.
+            with_total: Whether to also count all of the user's tasks.
+            
+        Returns:
+            Page[Task]: Tasks and the cursor of the next page.
+        """
+        return await self.get_page(
+            db,
+            cursor=cursor,
+            limit=limit,
+            filters=[Task.user_id == user_id],
+            with_total=with_total,
+        )
+    
+    async def get_status_counts(self, db: AsyncSession, *, user_id: int) -> Dict[str, int]:
+        """
+        Get a user's task counts by status from the maintained counters.
+        
+        Args:
+            db: Async database session.
+            user_id: ID of the owner.
+            
+        Returns:
+            Dict[str, int]: Count per status.
+        """
+        return await get_status_counts_async(db, user_id)
+    
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Task,
+        obj_in: Union[TaskUpdate, Dict[str, Any]]
+    ) -> Task:
+        """
+        Update a task.
+        
+        Args:
+            db: Async database session.
+            db_obj: Existing task.
+            obj_in: Updated task data.
+            
+        Returns:
+            Task: Updated task.
+        """
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+            agent_ids = update_data.pop("agent_ids", None)
+        else:
+            update_data = obj_in.dict(exclude_unset=True, exclude={"agent_ids"})
+            agent_ids = obj_in.agent_ids if obj_in.agent_ids is not None else None
+        
+        # Update agent associations if provided
+        if agent_ids is not None:
+            await db.execute(delete(TaskAgent).where(TaskAgent.task_id == db_obj.id))
+            db.add_all(TaskAgent(task_id=db_obj.id, agent_id=agent_id) for agent_id in agent_ids)
+        
+        if "status" in update_data:
+            deltas: StatusDeltas = collections.Counter()
+            add_status_delta(deltas, db_obj.user_id, db_obj.status, update_data["status"])
+            await apply_status_deltas_async(db, deltas)
+        
+        # Continue with normal update for task
+        return await super().update(db, db_obj=db_obj, obj_in=update_data)
+    
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[Task]:
+        """
+        Remove a task.
+        
+        Args:
+            db: Async database session.
+            id: Task ID.
+            
+        Returns:
+            Optional[Task]: Removed task, None if it did not exist.
+        """
+        db_obj = await self.get(db, id)
+        if db_obj is not None:
+            deltas: StatusDeltas = collections.Counter()
+            add_status_delta(deltas, db_obj.user_id, old_status=db_obj.status)
+            await apply_status_deltas_async(db, deltas)
+            await db.delete(db_obj)
+            await self._commit(db)
+        return db_obj
+    
+    async def get_task_steps(
+        self, db: AsyncSession, *, task_id: int
+    ) -> List[TaskStep]:
+        """
+        Get all steps for a task.
+        
+        Args:
+            db: Async database session.
+            task_id: ID of the task.
+            
+        Returns:
+            List[TaskStep]: Steps ordered by step number.
+        """
+        result = await db.execute(
+            select(TaskStep)
+            .filter(TaskStep.task_id == task_id)
+            .order_by(TaskStep.step_number)
+        )
+        return list(result.scalars().all())
+
+
+task_async = AsyncCRUDTask(Task)
+
+
+class CRUDArchivedTask(CRUDBase[ArchivedTask, TaskCreate, TaskUpdate]):
+    """
+    Read access to tasks moved to the archive by backend.db.retention.
+    """
+    
+    def eager_options(self) -> Sequence[LoaderOption]:
+        """
+        Load the same relationships as CRUDTask.
+        """
+        return (
+            selectinload(ArchivedTask.agents).joinedload(Agent.config),
+            selectinload(ArchivedTask.tasks_steps),
+        )
+    
+    def get_task_step(
+        self, db: Session, *, task_id: int, step_id: int
+    ) -> Optional[ArchivedTaskStep]:
+        """
+        Get a single step of an archived task.
+        
+        Args:
+            db: Database session.
+            task_id: ID of the task.
+            step_id: ID of the step.
+            
+        Returns:
+            Optional[ArchivedTaskStep]: Step if it belongs to the task, None
+            otherwise.
+        """
+        return (
+            db.query(ArchivedTaskStep)
+            .filter(ArchivedTaskStep.id == step_id, ArchivedTaskStep.task_id == task_id)
+            .first()
+        )
+    
+    def get_task_steps(
+        self, db: Session, *, task_id: int
+    ) -> List[ArchivedTaskStep]:
+        """
+        Get all steps of an archived task.
+        
+        Args:
+            db: Database session.
+            task_id: ID of the task.
+            
+        Returns:
+            List[ArchivedTaskStep]: Steps ordered by step number.
+        """
+        return (
+            db.query(ArchivedTaskStep)
+            .filter(ArchivedTaskStep.task_id == task_id)
+            .order_by(ArchivedTaskStep.step_number)
+            .all()
+        )
+
+
+archived_task = CRUDArchivedTask(ArchivedTask)
+
+
+class AsyncCRUDArchivedTask(AsyncCRUDBase[ArchivedTask, TaskCreate, TaskUpdate]):
+    """
+    Async read access to archived tasks.
+    """
+    
+    def eager_options(self) -> Sequence[LoaderOption]:
+        """
+        Same relationships as the sync CRUDArchivedTask.
+        """
+        return archived_task.eager_options()
+    
+    async def get_page_by_owner(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        with_total: bool = False,
+    ) -> Page[ArchivedTask]:
+        """
+        Get a page of a user's archived tasks, newest first.
+        
+        Args:
+            db: Async database session.
+            user_id: ID of the owner.
+            cursor: ``next_cursor`` of the previous page, or None.
+            limit: Maximum number of records to return.
+            with_total: Whether to also count all of the user's archived
+                tasks.
+            
+        Returns:
+            Page[ArchivedTask]: Tasks and the cursor of the next page.
+        """
+        return await self.get_page(
+            db,
+            cursor=cursor,
+            limit=limit,
+            filters=[ArchivedTask.user_id == user_id],
+            with_total=with_total,
+        )
+
+
+archived_task_async = AsyncCRUDArchivedTask(ArchivedTask)
@@ -3,10 +3,12 @@ CRUD operations for user management.
 """
 from typing import Any, Dict, Optional, Union
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from backend.core.security import get_password_hash, verify_password
-from backend.crud.base import CRUDBase
+from backend.crud.base import AsyncCRUDBase, CRUDBase
 from backend.db.models import User
 from backend.schemas.user import UserCreate, UserUpdate
 
@@ -61,8 +63,8 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             is_superuser=obj_in.is_superuser,
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        self._commit(db)
+        self._refresh(db, db_obj)
         return db_obj
     
     def update(
@@ -133,4 +135,108 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         return user.is_superuser
 
 
-user = CRUDUser(User)
\ No newline at end of file
+user = CRUDUser(User)
+
+
+class AsyncCRUDUser(AsyncCRUDBase[User, UserCreate, UserUpdate]):
+    """
+    Async CRUD operations for User model.
+    """
+    
+    async def get_by_email(self, db: AsyncSession, *, email: str) -> Optional[User]:
+        """
+        Get a user by email.
+        
+        Args:
+            db: Async database session.
+            email: User email.
+            
+        Returns:
+            Optional[User]: User if found, None otherwise.
+        """
+        result = await db.execute(select(User).filter(User.email == email))
+        return result.scalars().first()
+    
+    async def get_by_username(self, db: AsyncSession, *, username: str) -> Optional[User]:
+        """
+        Get a user by username.
+        
+        Args:
+            db: Async database session.
+            username: Username.
+            
+        Returns:
+            Optional[User]: User if found, None otherwise.
+        """
+        result = await db.execute(select(User).filter(User.username == username))
+        return result.scalars().first()
+    
+    async def create(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
+        """
+        Create a new user with hashed password.
+        
+        Args:
+            db: Async database session.
+            obj_in: User data.
+            
+        Returns:
+            User: Created user.
+        """
+        db_obj = User(
+            email=obj_in.email,
+            username=obj_in.username,
+            hashed_password=get_password_hash(obj_in.password),
+            is_active=obj_in.is_active,
+            is_superuser=obj_in.is_superuser,
+        )
+        db.add(db_obj)
+        await self._commit(db)
+        return await self.reload(db, db_obj.id)
+    
+    async def update(
+        self, db: AsyncSession, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> User:
+        """
+        Update a user.
+        
+        Args:
+            db: Async database session.
+            db_obj: Existing user.
+            obj_in: Updated user data.
+            
+        Returns:
+            User: Updated user.
+        """
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        if "password" in update_data and update_data["password"]:
+            hashed_password = get_password_hash(update_data["password"])
+            del update_data["password"]
+            update_data["hashed_password"] = hashed_password
+        return await super().update(db, db_obj=db_obj, obj_in=update_data)
+    
+    async def authenticate(
+        self, db: AsyncSession, *, username: str, password: str
+    ) -> Optional[User]:
+        """
+        Authenticate a user.
+        
+        Args:
+            db: Async database session.
+            username: Username.
+            password: Plaintext password.
+            
+        Returns:
+            Optional[User]: User if authentication succeeds, None otherwise.
+        """
+        user = await self.get_by_username(db, username=username)
+        if not user:
+            return None
+        if not verify_password(password, user.hashed_password):
+            return None
+        return user
+
+
+user_async = AsyncCRUDUser(User)
@@ -0,0 +1,163 @@
+"""
+Content-addressed storage for large JSON values.
+
+Task results and step outputs above BLOB_OFFLOAD_THRESHOLD are written to
+files named by the SHA-256 of their content, and the database row keeps a
+small reference instead. Identical outputs share one file. Because the
+files hold plain JSON, the API can stream them straight from disk.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+import orjson
+
+from backend.core.config import settings
+
+
+# Key identifying a blob reference stored in place of a value
+BLOB_REF_KEY = "$blob"
+
+BLOB_MEDIA_TYPE = "application/json"
+
+
+def is_blob_ref(value: Any) -> bool:
+    """
+    Check whether a stored value is a blob reference.
+    
+    Args:
+        value: Value loaded from a JSON column.
+        
+    Returns:
+        bool: True if the value points into the blob store.
+    """
+    return isinstance(value, dict) and BLOB_REF_KEY in value
+
+
+class BlobStore:
+    """
+    Directory of immutable, hash-named blobs.
+    """
+    
+    def __init__(self, root: Optional[str] = None):
+        """
+        Initialize the store.
+        
+        Args:
+            root: Directory holding the blobs. Defaults to BLOB_STORE_PATH.
+        """
+        self.root = os.path.abspath(root or settings.BLOB_STORE_PATH)
+    
+    def path(self, digest: str) -> str:
+        """
+        Get the file path for a digest.
+        
+        Args:
+            digest: Hex SHA-256 of the blob.
+            
+        Returns:
+            str: Path of the blob file, which may not exist.
+        """
+        if len(digest) != 64 or not all(c in "0123456789abcdef" for c in digest):
+            raise ValueError(f"Invalid blob digest: {digest!r}")
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+    
+    def put(self, data: bytes) -> str:
+        """
+        Store bytes, unless a blob with the same content already exists.
+        
+        Args:
+            data: Content to store.
+            
+        Returns:
+            str: Hex SHA-256 digest of the content.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if os.path.exists(path):
+            return digest
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, 0o644)
+            # Concurrent writers of the same content produce identical files,
+            # so whichever rename lands last is equally correct
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        return digest
+    
+    def get(self, digest: str) -> bytes:
+        """
+        Read a blob.
+        
+        Args:
+            digest: Hex SHA-256 of the blob.
+            
+        Returns:
+            bytes: Blob content.
+        """
+        with open(self.path(digest), "rb") as f:
+            return f.read()
+    
+    def exists(self, digest: str) -> bool:
+        """
+        Check whether a blob is present.
+        """
+        return os.path.exists(self.path(digest))
+    
+    def put_json(self, encoded: bytes) -> Dict[str, Any]:
+        """
+        Store an encoded JSON value and build the reference kept in its place.
+        
+        Args:
+            encoded: UTF-8 JSON.
+            
+        Returns:
+            Dict[str, Any]: Blob reference with the digest and size.
+        """
+        return {BLOB_REF_KEY: self.put(encoded), "size": len(encoded)}
+    
+    def resolve(self, value: Any) -> Any:
+        """
+        Load the value behind a blob reference.
+        
+        Args:
+            value: Value loaded from a JSON column.
+            
+        Returns:
+            Any: The referenced value, or ``value`` itself if it is not a
+            reference.
+        """
+        if not is_blob_ref(value):
+            return value
+        return orjson.loads(self.get(value[BLOB_REF_KEY]))
+
+
+_store: Optional[BlobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    """
+    Get the process-wide blob store.
+    
+    Returns:
+        BlobStore: Store rooted at BLOB_STORE_PATH.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = BlobStore()
+        return _store
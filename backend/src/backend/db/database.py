@@ -1,17 +1,72 @@
 """
 Database connection utilities for SQLAlchemy.
 """
-from sqlalchemy import create_engine
+import threading
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from backend.core.config import settings
 
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    """
+    Get the SQLite pragmas configured in settings.
+    
+    Returns:
+        Dict[str, Any]: Pragma names mapped to their values, in the order
+        they should be applied.
+    """
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+
+
+def configure_sqlite_engine(engine: Engine, pragmas: Optional[Dict[str, Any]] = None) -> Engine:
+    """
+    Apply pragmas to every new connection of a SQLite engine.
+    
+    WAL lets readers proceed while a writer commits, and busy_timeout makes
+    writers wait for the lock instead of failing with "database is locked".
+    
+    Args:
+        engine: SQLAlchemy engine.
+        pragmas: Pragmas to apply. Defaults to the values from settings.
+        
+    Returns:
+        Engine: The same engine, for chaining.
+    """
+    if engine.dialect.name != "sqlite":
+        return engine
+    pragmas = sqlite_pragmas() if pragmas is None else pragmas
+    
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                if value is not None:
+                    cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+    
+    return engine
+
+
 # Create database engine
-engine = create_engine(
+engine = configure_sqlite_engine(create_engine(
     settings.DATABASE_URL, 
     connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
-)
+))
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -31,4 +86,97 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Async drivers used for each sync driver in DATABASE_URL
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: Optional[str] = None) -> str:
+    """
+    Get the URL for the async engine.
+    
+    Uses ASYNC_DATABASE_URL if set, otherwise DATABASE_URL with its driver
+    swapped for the async one (aiosqlite for SQLite, asyncpg for PostgreSQL).
+    
+    Args:
+        url: Sync database URL. Defaults to the configured one.
+        
+    Returns:
+        str: Async database URL.
+    """
+    if url is None and settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    parsed = make_url(url or settings.DATABASE_URL)
+    driver = ASYNC_DRIVERS.get(parsed.drivername)
+    if driver is None:
+        return parsed.render_as_string(hide_password=False)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+_async_lock = threading.Lock()
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Get the process-wide async engine, creating it on first use.
+    
+    Created lazily so that the sync-only CLI and workers never open it, and
+    do not need the async driver installed.
+    
+    Returns:
+        AsyncEngine: Async engine with the same SQLite pragmas as the sync one.
+    """
+    global _async_engine
+    with _async_lock:
+        if _async_engine is None:
+            _async_engine = create_async_engine(async_database_url())
+            configure_sqlite_engine(_async_engine.sync_engine)
+        return _async_engine
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    """
+    Get the factory for async sessions.
+    
+    Sessions do not expire objects on commit, since expired attributes
+    cannot be lazy-loaded from async code.
+    
+    Returns:
+        async_sessionmaker: Session factory bound to the async engine.
+    """
+    global _async_session_factory
+    engine = get_async_engine()
+    with _async_lock:
+        if _async_session_factory is None:
+            _async_session_factory = async_sessionmaker(
+                engine, autoflush=False, expire_on_commit=False
+            )
+        return _async_session_factory
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get async database session.
+    
+    Yields:
+        AsyncSession: Database session.
+    """
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    """
+    Close the async engine's connections, if it was created.
+    """
+    if _async_engine is not None:
+        await _async_engine.dispose()
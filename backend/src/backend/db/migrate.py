@@ -0,0 +1,52 @@
+"""
+Programmatic access to the Alembic migrations.
+"""
+import os
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+from backend.db.database import engine as default_engine
+
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+# Revision matching the schema created by create_all before migrations existed
+BASELINE_REVISION = "0001"
+
+
+def alembic_config() -> Config:
+    """
+    Build an Alembic config pointing at the bundled migrations.
+    
+    Returns:
+        Config: Alembic configuration.
+    """
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    return config
+
+
+def upgrade_database(engine: Optional[Engine] = None, revision: str = "head") -> None:
+    """
+    Upgrade a database to the given revision.
+    
+    Databases that already have the application tables but were never
+    migrated (created with ``create_all``) are stamped with the baseline
+    revision first, so only the later migrations run against them.
+    
+    Args:
+        engine: Engine to migrate. Defaults to the application engine.
+        revision: Target revision.
+    """
+    engine = engine or default_engine
+    config = alembic_config()
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        tables = set(inspect(connection).get_table_names())
+        if "alembic_version" not in tables and "users" in tables:
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, revision)
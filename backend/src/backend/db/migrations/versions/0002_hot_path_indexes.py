@@ -0,0 +1,47 @@
+"""Add indexes for hot query paths
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00
+
+- tasks(user_id, created_at) and agents(user_id, created_at): listing a
+  user's tasks and agents, newest first.
+- tasks(status): finding pending and running tasks.
+- task_steps(task_id, step_number): a task's steps in order, without a sort.
+- task_agents(agent_id): the tasks an agent is assigned to. The primary key
+  (task_id, agent_id) only serves lookups by task.
+
+Databases created by ``create_all`` after these indexes were added to the
+models already have them, hence ``if_not_exists``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("ix_tasks_user_id_created_at", "tasks", ["user_id", "created_at"]),
+    ("ix_tasks_status", "tasks", ["status"]),
+    ("ix_agents_user_id_created_at", "agents", ["user_id", "created_at"]),
+    ("ix_task_steps_task_id_step_number", "task_steps", ["task_id", "step_number"]),
+    ("ix_task_agents_agent_id", "task_agents", ["agent_id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,61 @@
+"""Use native JSON columns where the dialect has them
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00
+
+CompressedJSON maps to JSONB on PostgreSQL and JSON on MySQL. Existing
+values are plain JSON text there, so they convert in place. On SQLite the
+columns stay TEXT; compressed values are stored as BLOBs alongside the
+existing JSON text, which CompressedJSON still reads.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql, postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = [
+    ("agent_configs", "tools"),
+    ("tasks", "result"),
+    ("task_steps", "input_data"),
+    ("task_steps", "output_data"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    for table, column in COLUMNS:
+        if dialect == "postgresql":
+            op.alter_column(
+                table, column,
+                existing_type=sa.Text(),
+                type_=postgresql.JSONB(),
+                postgresql_using=f"{column}::jsonb",
+            )
+        elif dialect == "mysql":
+            op.alter_column(table, column, existing_type=sa.Text(), type_=mysql.JSON())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    for table, column in COLUMNS:
+        if dialect == "postgresql":
+            op.alter_column(
+                table, column,
+                existing_type=postgresql.JSONB(),
+                type_=sa.Text(),
+                postgresql_using=f"{column}::text",
+            )
+        elif dialect == "mysql":
+            op.alter_column(table, column, existing_type=mysql.JSON(), type_=sa.Text())
@@ -0,0 +1,92 @@
+"""Add archive tables for task retention
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:00
+
+Old completed and failed tasks are moved here by backend.db.retention so
+the live tables only hold recent runs. Columns mirror tasks, task_steps and
+task_agents; IDs are kept, and users and agents are referenced without
+foreign keys so deleting them later does not touch the archive.
+
+Databases created by ``create_all`` after these models were added already
+have the tables, hence ``if_not_exists``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.db.types import CompressedJSON
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "archived_tasks",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("title", sa.String(), nullable=True),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("expected_output", sa.String(), nullable=True),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("result", CompressedJSON(offload=True), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("archived_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_archived_tasks_user_id_created_at",
+        "archived_tasks",
+        ["user_id", "created_at"],
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "archived_task_agents",
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("agent_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["task_id"], ["archived_tasks.id"]),
+        sa.PrimaryKeyConstraint("task_id", "agent_id"),
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "archived_task_steps",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=True),
+        sa.Column("agent_id", sa.Integer(), nullable=True),
+        sa.Column("step_number", sa.Integer(), nullable=True),
+        sa.Column("input_data", CompressedJSON(), nullable=True),
+        sa.Column("output_data", CompressedJSON(offload=True), nullable=True),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["task_id"], ["archived_tasks.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_archived_task_steps_task_id_step_number",
+        "archived_task_steps",
+        ["task_id", "step_number"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_archived_task_steps_task_id_step_number", table_name="archived_task_steps")
+    op.drop_table("archived_task_steps")
+    op.drop_table("archived_task_agents")
+    op.drop_index("ix_archived_tasks_user_id_created_at", table_name="archived_tasks")
+    op.drop_table("archived_tasks")
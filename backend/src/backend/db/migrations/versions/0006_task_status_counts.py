@@ -0,0 +1,48 @@
+"""Add per-user task status counters
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 00:00:00
+
+backend.db.task_stats keeps one row per (user, status) up to date in the
+same transaction as every task write, so GET /tasks/stats does not scan
+tasks. The counts are backfilled from the existing tasks; databases created
+by ``create_all`` already have the (empty) table, hence ``if_not_exists``
+and replacing any rows it holds.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "task_status_counts",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id", "status"),
+        if_not_exists=True,
+    )
+    op.execute("DELETE FROM task_status_counts")
+    op.execute(
+        "INSERT INTO task_status_counts (user_id, status, count) "
+        "SELECT user_id, status, COUNT(id) FROM tasks "
+        "WHERE user_id IS NOT NULL AND status IS NOT NULL "
+        "GROUP BY user_id, status"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("task_status_counts")
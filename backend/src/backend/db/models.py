@@ -3,31 +3,13 @@ Database models for the Agentic backend.
 """
 from datetime import datetime
 from typing import Dict, List, Optional, Any
-import json
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Float, Index
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.orm import relationship
-from sqlalchemy.types import TypeDecorator
 
 from backend.db.database import Base
-
-
-class JSONEncodedDict(TypeDecorator):
-    """
-    Represents a JSON-encoded dictionary.
-    """
-    impl = Text
-
-    def process_bind_param(self, value, dialect):
-        if value is not None:
-            value = json.dumps(value)
-        return value
-
-    def process_result_value(self, value, dialect):
-        if value is not None:
-            value = json.loads(value)
-        return value
+from backend.db.types import CompressedJSON
 
 
 class User(Base):
@@ -35,6 +17,9 @@ class User(Base):
     User model for authentication.
     """
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True)
@@ -56,6 +41,10 @@ class Agent(Base):
     AI Agent model.
     """
     __tablename__ = "agents"
+    __table_args__ = (
+        Index("ix_agents_user_id_created_at", "user_id", "created_at"),
+        Index("ix_agents_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
@@ -87,7 +76,7 @@ class AgentConfig(Base):
     max_tokens = Column(Integer, default=1000)
     verbose = Column(Boolean, default=False)
     allow_delegation = Column(Boolean, default=True)
-    tools = Column(JSONEncodedDict)
+    tools = Column(CompressedJSON)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -101,13 +90,17 @@ class Task(Base):
     Task model for agent tasks.
     """
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_user_id_created_at", "user_id", "created_at"),
+        Index("ix_tasks_status", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
     description = Column(String)
     expected_output = Column(String)
     status = Column(String, default="pending")  # pending, in_progress, completed, failed
-    result = Column(JSONEncodedDict, nullable=True)
+    result = Column(CompressedJSON(offload=True), nullable=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -123,6 +116,9 @@ class TaskAgent(Base):
     Association table for tasks and agents.
     """
     __tablename__ = "task_agents"
+    __table_args__ = (
+        Index("ix_task_agents_agent_id", "agent_id"),
+    )
 
     task_id = Column(Integer, ForeignKey("tasks.id"), primary_key=True)
     agent_id = Column(Integer, ForeignKey("agents.id"), primary_key=True)
@@ -133,17 +129,105 @@ class TaskStep(Base):
     Step in a task execution.
     """
     __tablename__ = "task_steps"
+    __table_args__ = (
+        Index("ix_task_steps_task_id_step_number", "task_id", "step_number"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     task_id = Column(Integer, ForeignKey("tasks.id"))
     agent_id = Column(Integer, ForeignKey("agents.id"))
     step_number = Column(Integer)
-    input_data = Column(JSONEncodedDict, nullable=True)
-    output_data = Column(JSONEncodedDict, nullable=True)
+    input_data = Column(CompressedJSON, nullable=True)
+    output_data = Column(CompressedJSON(offload=True), nullable=True)
     status = Column(String, default="pending")  # pending, in_progress, completed, failed
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     task = relationship("Task", back_populates="tasks_steps")
-    agent = relationship("Agent")
\ No newline at end of file
+    agent = relationship("Agent")
+
+
+class TaskStatusCount(Base):
+    """
+    Number of a user's live tasks in each status.
+
+    Maintained by backend.db.task_stats in the same transaction as every
+    write that creates, deletes or changes the status of a task, so reading
+    a user's counts never scans ``tasks``.
+    """
+    __tablename__ = "task_status_counts"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    status = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class ArchivedTask(Base):
+    """
+    Completed or failed task moved out of ``tasks`` by the retention job.
+    
+    Columns mirror Task so rows can be copied with INSERT ... SELECT, and
+    the relationships use the same names so the Task schema can serialize
+    either. Users and agents are referenced without foreign keys, since
+    they may be deleted long after their tasks were archived.
+    """
+    __tablename__ = "archived_tasks"
+    __table_args__ = (
+        Index("ix_archived_tasks_user_id_created_at", "user_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String)
+    description = Column(String)
+    expected_output = Column(String)
+    status = Column(String)
+    result = Column(CompressedJSON(offload=True), nullable=True)
+    user_id = Column(Integer)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    agents = relationship(
+        "Agent",
+        secondary="archived_task_agents",
+        primaryjoin="ArchivedTask.id == ArchivedTaskAgent.task_id",
+        secondaryjoin="foreign(ArchivedTaskAgent.agent_id) == Agent.id",
+        viewonly=True,
+    )
+    tasks_steps = relationship(
+        "ArchivedTaskStep",
+        order_by="ArchivedTaskStep.step_number",
+        cascade="all, delete-orphan",
+    )
+
+
+class ArchivedTaskAgent(Base):
+    """
+    Agents assigned to an archived task.
+    """
+    __tablename__ = "archived_task_agents"
+
+    task_id = Column(Integer, ForeignKey("archived_tasks.id"), primary_key=True)
+    agent_id = Column(Integer, primary_key=True)
+
+
+class ArchivedTaskStep(Base):
+    """
+    Step of an archived task.
+    """
+    __tablename__ = "archived_task_steps"
+    __table_args__ = (
+        Index("ix_archived_task_steps_task_id_step_number", "task_id", "step_number"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    task_id = Column(Integer, ForeignKey("archived_tasks.id"))
+    agent_id = Column(Integer)
+    step_number = Column(Integer)
+    input_data = Column(CompressedJSON, nullable=True)
+    output_data = Column(CompressedJSON(offload=True), nullable=True)
+    status = Column(String)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
@@ -0,0 +1,267 @@
+"""
+Retention of finished tasks.
+
+Completed and failed tasks older than RETENTION_DAYS are moved, with their
+steps and agent assignments, from the live tables into the archive tables
+(see models.ArchivedTask). Rows are copied with INSERT ... SELECT and then
+deleted, one small batch per transaction, so the job never holds the write
+lock for longer than a single batch takes. Stored values are copied as is,
+so results offloaded to the blob store keep their references.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Sequence
+
+from sqlalchemy import DateTime, delete, func, insert, literal, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.core.config import settings
+from backend.db.database import SessionLocal
+from backend.db.models import (
+    ArchivedTask,
+    ArchivedTaskAgent,
+    ArchivedTaskStep,
+    Task,
+    TaskAgent,
+    TaskStep,
+)
+from backend.db.task_stats import apply_status_deltas, deltas_for_removal, grouped_counts
+
+
+logger = logging.getLogger(__name__)
+
+ARCHIVABLE_STATUSES = ("completed", "failed")
+
+
+@dataclass
+class ArchiveStats:
+    """
+    Summary of an archival run.
+    """
+    tasks: int = 0
+    steps: int = 0
+    batches: int = 0
+
+
+def _column_names(model) -> List[str]:
+    return [column.name for column in model.__table__.columns]
+
+
+def _archivable(cutoff: datetime, statuses: Sequence[str]) -> List:
+    return [Task.status.in_(statuses), Task.updated_at < cutoff]
+
+
+def count_archivable(
+    db: Session,
+    *,
+    older_than_days: Optional[int] = None,
+    statuses: Sequence[str] = ARCHIVABLE_STATUSES,
+) -> int:
+    """
+    Count the tasks the next archival run would move.
+
+    Args:
+        db: Database session.
+        older_than_days: Minimum age by last update. Defaults to
+            RETENTION_DAYS.
+        statuses: Task statuses eligible for archival.
+
+    Returns:
+        int: Number of eligible tasks.
+    """
+    days = settings.RETENTION_DAYS if older_than_days is None else older_than_days
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    return db.scalar(select(func.count(Task.id)).where(*_archivable(cutoff, statuses)))
+
+
+def archive_batch(db: Session, task_ids: Sequence[int], archived_at: datetime) -> int:
+    """
+    Move tasks, their steps and agent assignments to the archive tables.
+
+    Archived tasks stop counting towards their owner's status counts.
+    Does not commit.
+
+    Args:
+        db: Database session.
+        task_ids: IDs of the tasks to move.
+        archived_at: Timestamp recorded on the archived tasks.
+
+    Returns:
+        int: Number of steps moved.
+    """
+    task_columns = _column_names(Task)
+    db.execute(
+        insert(ArchivedTask).from_select(
+            task_columns + ["archived_at"],
+            select(
+                *(Task.__table__.c[name] for name in task_columns),
+                literal(archived_at, DateTime()),
+            ).where(Task.id.in_(task_ids)),
+        )
+    )
+    db.execute(
+        insert(ArchivedTaskAgent).from_select(
+            ["task_id", "agent_id"],
+            select(TaskAgent.task_id, TaskAgent.agent_id).where(TaskAgent.task_id.in_(task_ids)),
+        )
+    )
+    step_columns = _column_names(TaskStep)
+    steps = db.execute(
+        insert(ArchivedTaskStep).from_select(
+            step_columns,
+            select(*(TaskStep.__table__.c[name] for name in step_columns)).where(
+                TaskStep.task_id.in_(task_ids)
+            ),
+        )
+    ).rowcount
+
+    apply_status_deltas(
+        db, deltas_for_removal(db.execute(grouped_counts(Task.id.in_(task_ids))))
+    )
+    db.execute(delete(TaskStep).where(TaskStep.task_id.in_(task_ids)))
+    db.execute(delete(TaskAgent).where(TaskAgent.task_id.in_(task_ids)))
+    db.execute(delete(Task).where(Task.id.in_(task_ids)))
+    return steps
+
+
+def archive_tasks(
+    session_factory: sessionmaker = SessionLocal,
+    *,
+    older_than_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+    pause: Optional[float] = None,
+    statuses: Sequence[str] = ARCHIVABLE_STATUSES,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> ArchiveStats:
+    """
+    Archive finished tasks older than the retention age, in batches.
+
+    Each batch is its own short transaction; the oldest tasks go first.
+
+    Args:
+        session_factory: Factory for the sessions used by each batch.
+        older_than_days: Minimum age by last update. Defaults to
+            RETENTION_DAYS.
+        batch_size: Tasks moved per transaction. Defaults to
+            RETENTION_BATCH_SIZE.
+        max_batches: Stop after this many batches, or None to run until no
+            eligible tasks remain.
+        pause: Seconds to sleep between batches. Defaults to
+            RETENTION_BATCH_PAUSE.
+        statuses: Task statuses eligible for archival.
+        should_stop: Checked before each batch; returning True ends the run.
+
+    Returns:
+        ArchiveStats: Number of tasks, steps and batches moved.
+    """
+    days = settings.RETENTION_DAYS if older_than_days is None else older_than_days
+    batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+    pause = settings.RETENTION_BATCH_PAUSE if pause is None else pause
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    stats = ArchiveStats()
+
+    while max_batches is None or stats.batches < max_batches:
+        if should_stop is not None and should_stop():
+            break
+        db = session_factory()
+        try:
+            task_ids = db.scalars(
+                select(Task.id)
+                .where(*_archivable(cutoff, statuses))
+                .order_by(Task.id)
+                .limit(batch_size)
+            ).all()
+            if not task_ids:
+                break
+            steps = archive_batch(db, task_ids, datetime.utcnow())
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        stats.tasks += len(task_ids)
+        stats.steps += steps
+        stats.batches += 1
+        if len(task_ids) < batch_size:
+            break
+        if pause > 0:
+            time.sleep(pause)
+
+    return stats
+
+
+class RetentionJob:
+    """
+    Background thread that runs ``archive_tasks`` periodically.
+    """
+
+    def __init__(self, interval: Optional[float] = None):
+        """
+        Initialize the job.
+
+        Args:
+            interval: Seconds between runs. Defaults to RETENTION_INTERVAL.
+        """
+        self.interval = settings.RETENTION_INTERVAL if interval is None else interval
+        self.last_run: Optional[ArchiveStats] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Start the background thread if it is not already running.
+        """
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="task-retention", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.last_run = archive_tasks(should_stop=self._stopped.is_set)
+                if self.last_run.tasks:
+                    logger.info(
+                        "Archived %d tasks (%d steps) in %d batches",
+                        self.last_run.tasks, self.last_run.steps, self.last_run.batches,
+                    )
+            except Exception:
+                logger.exception("Task retention run failed")
+            self._stopped.wait(self.interval)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the background thread after its current batch.
+
+        Args:
+            timeout: Seconds to wait for the thread.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+_job: Optional[RetentionJob] = None
+_job_lock = threading.Lock()
+
+
+def get_retention_job() -> RetentionJob:
+    """
+    Get the process-wide retention job, creating it on first use.
+
+    Returns:
+        RetentionJob: Shared job; call ``start`` to run it.
+    """
+    global _job
+    with _job_lock:
+        if _job is None:
+            _job = RetentionJob()
+        return _job
@@ -0,0 +1,212 @@
+"""
+Per-user task counts by status.
+
+The ``task_status_counts`` table holds one row per (user, status) with the
+number of that user's live tasks in that status. Writes that create or
+delete tasks or change their status collect the change as a ``Counter`` of
+deltas and apply it with ``apply_status_deltas`` before they commit, so the
+counts move in the same transaction as the tasks and reading them is a
+lookup by user. Archived tasks are not counted, matching ``GET /tasks``.
+
+``rebuild_status_counts`` recomputes every row from ``tasks``; run it with
+the ``reconcile-task-stats`` CLI command after writing to ``tasks`` outside
+the CRUD layer.
+"""
+import collections
+from typing import Counter, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Executable
+
+from backend.db.models import Task, TaskStatusCount
+
+
+# Statuses always present in stats responses, even with a zero count
+TASK_STATUSES = ("pending", "in_progress", "completed", "failed")
+
+# Count changes by (user_id, status)
+StatusDeltas = Counter[Tuple[int, str]]
+
+
+def add_status_delta(
+    deltas: StatusDeltas,
+    user_id: Optional[int],
+    old_status: Optional[str] = None,
+    new_status: Optional[str] = None,
+) -> None:
+    """
+    Record that one of a user's tasks left ``old_status`` and entered
+    ``new_status``.
+
+    Pass only ``new_status`` for a created task and only ``old_status`` for
+    a deleted one. Tasks without an owner or status are not counted.
+
+    Args:
+        deltas: Deltas to update in place.
+        user_id: ID of the task's owner.
+        old_status: Status before the write, if the task existed.
+        new_status: Status after the write, if the task still exists.
+    """
+    if user_id is None or old_status == new_status:
+        return
+    if old_status is not None:
+        deltas[(user_id, old_status)] -= 1
+    if new_status is not None:
+        deltas[(user_id, new_status)] += 1
+
+
+def deltas_for_removal(rows: Iterable[Tuple[Optional[int], Optional[str], int]]) -> StatusDeltas:
+    """
+    Build the deltas for deleting tasks from grouped counts.
+
+    Args:
+        rows: (user_id, status, count) rows, as selected by
+            ``grouped_counts``.
+
+    Returns:
+        StatusDeltas: Negative deltas for the counted tasks.
+    """
+    deltas: StatusDeltas = collections.Counter()
+    for user_id, status, count in rows:
+        if user_id is not None and status is not None:
+            deltas[(user_id, status)] -= count
+    return deltas
+
+
+def grouped_counts(*filters) -> Executable:
+    """
+    Select (user_id, status, count) for the tasks matching ``filters``.
+    """
+    return (
+        select(Task.user_id, Task.status, func.count(Task.id))
+        .where(*filters)
+        .group_by(Task.user_id, Task.status)
+    )
+
+
+def _upsert(dialect_name: str, deltas: StatusDeltas) -> Optional[Executable]:
+    rows = [
+        {"user_id": user_id, "status": status, "count": delta}
+        for (user_id, status), delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return None
+    dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    statement = dialect_insert(TaskStatusCount).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=[TaskStatusCount.user_id, TaskStatusCount.status],
+        set_={"count": TaskStatusCount.count + statement.excluded.count},
+    )
+
+
+def apply_status_deltas(db: Session, deltas: StatusDeltas) -> None:
+    """
+    Add deltas to the stored counts with one upsert. Does not commit.
+
+    Args:
+        db: Database session.
+        deltas: Count changes by (user_id, status).
+    """
+    statement = _upsert(db.get_bind().dialect.name, deltas)
+    if statement is not None:
+        db.execute(statement)
+
+
+async def apply_status_deltas_async(db: AsyncSession, deltas: StatusDeltas) -> None:
+    """
+    Async version of ``apply_status_deltas``. Does not commit.
+
+    Args:
+        db: Async database session.
+        deltas: Count changes by (user_id, status).
+    """
+    statement = _upsert(db.get_bind().dialect.name, deltas)
+    if statement is not None:
+        await db.execute(statement)
+
+
+def _counts_query(user_id: int) -> Executable:
+    return select(TaskStatusCount.status, TaskStatusCount.count).where(
+        TaskStatusCount.user_id == user_id
+    )
+
+
+def _by_status(rows: Iterable[Tuple[str, int]]) -> Dict[str, int]:
+    counts = dict.fromkeys(TASK_STATUSES, 0)
+    counts.update((status, count) for status, count in rows if count)
+    return counts
+
+
+def get_status_counts(db: Session, user_id: int) -> Dict[str, int]:
+    """
+    Get a user's task counts by status.
+
+    Args:
+        db: Database session.
+        user_id: ID of the user.
+
+    Returns:
+        Dict[str, int]: Count per status; every status in TASK_STATUSES is
+        present.
+    """
+    return _by_status(db.execute(_counts_query(user_id)).all())
+
+
+async def get_status_counts_async(db: AsyncSession, user_id: int) -> Dict[str, int]:
+    """
+    Async version of ``get_status_counts``.
+
+    Args:
+        db: Async database session.
+        user_id: ID of the user.
+
+    Returns:
+        Dict[str, int]: Count per status.
+    """
+    result = await db.execute(_counts_query(user_id))
+    return _by_status(result.all())
+
+
+def rebuild_status_counts(db: Session) -> Dict[Tuple[int, str], Tuple[int, int]]:
+    """
+    Recompute every count from ``tasks``. Does not commit.
+
+    Args:
+        db: Database session.
+
+    Returns:
+        Dict[Tuple[int, str], Tuple[int, int]]: (stored, actual) counts for
+        each (user_id, status) that had drifted.
+    """
+    stored = {
+        (user_id, status): count
+        for user_id, status, count in db.execute(
+            select(TaskStatusCount.user_id, TaskStatusCount.status, TaskStatusCount.count)
+        )
+    }
+    actual = {
+        (user_id, status): count
+        for user_id, status, count in db.execute(
+            grouped_counts(Task.user_id.is_not(None), Task.status.is_not(None))
+        )
+    }
+    drift = {
+        key: (stored.get(key, 0), actual.get(key, 0))
+        for key in stored.keys() | actual.keys()
+        if stored.get(key, 0) != actual.get(key, 0)
+    }
+
+    db.execute(delete(TaskStatusCount))
+    if actual:
+        db.execute(
+            insert(TaskStatusCount),
+            [
+                {"user_id": user_id, "status": status, "count": count}
+                for (user_id, status), count in sorted(actual.items())
+            ],
+        )
+    return drift
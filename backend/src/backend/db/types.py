@@ -0,0 +1,153 @@
+"""
+Custom column types.
+"""
+import json
+import zlib
+from typing import Any, Optional
+
+import orjson
+from sqlalchemy.dialects import mysql, postgresql
+from sqlalchemy.types import Text, TypeDecorator
+
+from backend.core.config import settings
+from backend.db.blob_store import get_blob_store, is_blob_ref
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+
+# First byte of a compressed value. Neither can start a JSON document, so
+# compressed values are told apart from plain (and legacy) JSON text.
+ZLIB_MARKER = b"\x01"
+ZSTD_MARKER = b"\x02"
+
+# Dialects whose native JSON type is used instead of encoded text
+NATIVE_JSON_DIALECTS = {"postgresql": postgresql.JSONB(), "mysql": mysql.JSON()}
+
+
+def encode_json(value: Any) -> bytes:
+    """
+    Serialize a value to JSON with orjson.
+    
+    Args:
+        value: JSON-serializable value; non-string dict keys are converted
+            to strings like the stdlib encoder does.
+        
+    Returns:
+        bytes: UTF-8 encoded JSON.
+    """
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def compress(data: bytes, codec: Optional[str] = None, level: Optional[int] = None) -> bytes:
+    """
+    Compress data and prefix it with the codec's marker byte.
+    
+    Args:
+        data: Bytes to compress.
+        codec: ``zstd`` or ``zlib``. Defaults to JSON_COMPRESSION; ``zstd``
+            falls back to zlib when zstandard is not installed.
+        level: Compression level. Defaults to JSON_COMPRESSION_LEVEL.
+        
+    Returns:
+        bytes: Marker byte followed by the compressed data.
+    """
+    codec = codec or settings.JSON_COMPRESSION
+    level = settings.JSON_COMPRESSION_LEVEL if level is None else level
+    if codec == "zstd" and zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+        return ZSTD_MARKER + compressor.compress(data)
+    return ZLIB_MARKER + zlib.compress(data, 6 if level is None else level)
+
+
+def decompress(data: bytes) -> bytes:
+    """
+    Reverse :func:`compress`. Data without a marker byte is returned as is.
+    
+    Args:
+        data: Stored bytes.
+        
+    Returns:
+        bytes: Decompressed data.
+    """
+    marker = data[:1]
+    if marker == ZSTD_MARKER:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed values")
+        return zstandard.ZstdDecompressor().decompress(data[1:])
+    if marker == ZLIB_MARKER:
+        return zlib.decompress(data[1:])
+    return data
+
+
+class CompressedJSON(TypeDecorator):
+    """
+    JSON value stored compactly.
+    
+    On PostgreSQL and MySQL the native JSON type is used. Elsewhere values are
+    encoded with orjson; encodings of at least ``threshold`` bytes are
+    compressed and stored as a marker byte plus the compressed data, smaller
+    ones as plain JSON text. Plain JSON text written by earlier versions
+    (stdlib ``json`` into a Text column) reads back unchanged.
+    """
+    impl = Text
+    cache_ok = True
+    
+    def __init__(
+        self,
+        threshold: Optional[int] = None,
+        codec: Optional[str] = None,
+        offload: bool = False,
+        *args: Any,
+        **kwargs: Any,
+    ):
+        """
+        Initialize the type.
+        
+        Args:
+            threshold: Encoded size in bytes from which values are compressed.
+                Defaults to JSON_COMPRESSION_THRESHOLD.
+            codec: ``zstd``, ``zlib`` or ``none``. Defaults to JSON_COMPRESSION.
+            offload: Whether large values go to the blob store.
+        """
+        super().__init__(*args, **kwargs)
+        self.threshold = threshold
+        self.codec = codec
+        self.offload = offload
+    
+    def load_dialect_impl(self, dialect):
+        if dialect.name in NATIVE_JSON_DIALECTS:
+            return dialect.type_descriptor(NATIVE_JSON_DIALECTS[dialect.name])
+        return dialect.type_descriptor(Text())
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+        encoded = None
+        if self.offload and not is_blob_ref(value):
+            encoded = encode_json(value)
+            if len(encoded) >= settings.BLOB_OFFLOAD_THRESHOLD:
+                value = get_blob_store().put_json(encoded)
+                encoded = None
+        if dialect.name in NATIVE_JSON_DIALECTS:
+            return value
+        if encoded is None:
+            encoded = encode_json(value)
+        codec = self.codec or settings.JSON_COMPRESSION
+        threshold = settings.JSON_COMPRESSION_THRESHOLD if self.threshold is None else self.threshold
+        if codec != "none" and len(encoded) >= threshold:
+            return compress(encoded, codec)
+        return encoded.decode("utf-8")
+    
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name in NATIVE_JSON_DIALECTS:
+            return value
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return orjson.loads(decompress(bytes(value)))
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            # Legacy rows may contain NaN/Infinity, which only stdlib json accepts
+            return json.loads(value)
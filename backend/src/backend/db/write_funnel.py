@@ -0,0 +1,253 @@
+"""
+Single-writer group-commit funnel for database writes.
+
+SQLite allows one writer at a time and every commit is an fsync. When many
+crews commit small status and step updates independently they queue on the
+write lock, occasionally fail with "database is locked", and pay one fsync
+each. The funnel runs all submitted write operations on one dedicated thread
+and commits them in groups: operations queued while the previous batch was
+committing are applied in a single transaction, so N writes cost one fsync.
+Callers wait on a future for their own operation's result.
+"""
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.core.config import settings
+from backend.db.database import SessionLocal
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+WriteOperation = Callable[[Session], T]
+
+
+class WriteFunnel:
+    """
+    Dedicated writer thread that applies queued operations in group commits.
+
+    Operations receive the writer's session and must not commit; the funnel
+    commits once per batch. They should return plain values (IDs, dicts)
+    rather than ORM objects, which are expired once the batch commits. If an
+    operation raises, the rest of its batch is rolled back and re-run one by
+    one, so operations should only touch the database.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker = SessionLocal,
+        max_batch: Optional[int] = None,
+        max_delay: Optional[float] = None,
+    ):
+        """
+        Initialize the funnel and start its writer thread.
+
+        Args:
+            session_factory: Factory for the writer's sessions.
+            max_batch: Maximum operations per commit. Defaults to
+                DB_WRITE_FUNNEL_MAX_BATCH.
+            max_delay: Seconds to wait for more operations after the first
+                one arrives. Defaults to DB_WRITE_FUNNEL_MAX_DELAY_MS.
+        """
+        self.session_factory = session_factory
+        self.max_batch = max_batch or settings.DB_WRITE_FUNNEL_MAX_BATCH
+        self.max_delay = (
+            settings.DB_WRITE_FUNNEL_MAX_DELAY_MS / 1000 if max_delay is None else max_delay
+        )
+        self._queue: "queue.Queue[Optional[Tuple[WriteOperation, Future, float]]]" = queue.Queue()
+        self._metrics_lock = threading.Lock()
+        self._batches = 0
+        self._operations = 0
+        self._failed = 0
+        self._max_batch_size = 0
+        self._commit_time = 0.0
+        self._last_commit_time = 0.0
+        self._wait_time = 0.0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="db-write-funnel", daemon=True)
+        self._thread.start()
+
+    def submit(self, operation: WriteOperation) -> "Future[T]":
+        """
+        Queue a write operation.
+
+        Args:
+            operation: Callable taking the writer's session.
+
+        Returns:
+            Future: Resolves to the operation's return value once its batch
+            has committed, or to the exception it raised.
+        """
+        if self._closed:
+            raise RuntimeError("Write funnel has been shut down")
+        future: Future = Future()
+        self._queue.put((operation, future, time.perf_counter()))
+        return future
+
+    def run(self, operation: WriteOperation, timeout: Optional[float] = None) -> T:
+        """
+        Queue a write operation and wait for its result.
+
+        Args:
+            operation: Callable taking the writer's session.
+            timeout: Seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            The operation's return value.
+        """
+        return self.submit(operation).result(timeout=timeout)
+
+    async def run_async(self, operation: WriteOperation) -> T:
+        """
+        Queue a write operation and await its result without blocking the
+        event loop.
+
+        Args:
+            operation: Callable taking the writer's session.
+
+        Returns:
+            The operation's return value.
+        """
+        return await asyncio.wrap_future(self.submit(operation))
+
+    def _next_batch(self) -> List[Tuple[WriteOperation, Future, float]]:
+        first = self._queue.get()
+        if first is None:
+            return []
+        batch = [first]
+        deadline = time.perf_counter() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Put the sentinel back so the loop exits after this batch
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            started = time.perf_counter()
+            try:
+                self._commit_batch(batch)
+            except Exception:
+                logger.exception("Write funnel batch failed")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError("Write funnel batch failed"))
+            finally:
+                self._record(batch, started)
+
+    def _commit_batch(self, batch: List[Tuple[WriteOperation, Future, float]]) -> None:
+        db = self.session_factory()
+        error: Optional[Exception] = None
+        try:
+            results = [operation(db) for operation, _, _ in batch]
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            error = e
+        finally:
+            db.close()
+
+        if error is None:
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+        elif len(batch) == 1:
+            with self._metrics_lock:
+                self._failed += 1
+            batch[0][1].set_exception(error)
+        else:
+            # One operation failed; retry them individually so the others
+            # still commit and only the failing caller sees the error
+            for item in batch:
+                self._commit_batch([item])
+
+    def _record(self, batch: List[Tuple[WriteOperation, Future, float]], started: float) -> None:
+        elapsed = time.perf_counter() - started
+        with self._metrics_lock:
+            self._batches += 1
+            self._operations += len(batch)
+            self._max_batch_size = max(self._max_batch_size, len(batch))
+            self._commit_time += elapsed
+            self._last_commit_time = elapsed
+            self._wait_time += sum(started - queued for _, _, queued in batch)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get commit batch size and latency metrics.
+
+        Returns:
+            Dict[str, Any]: Counters and averages since the funnel started.
+            Latencies are in milliseconds.
+        """
+        with self._metrics_lock:
+            batches = self._batches or 1
+            operations = self._operations or 1
+            return {
+                "batches": self._batches,
+                "operations": self._operations,
+                "failed_operations": self._failed,
+                "queue_depth": self._queue.qsize(),
+                "mean_batch_size": round(self._operations / batches, 2),
+                "max_batch_size": self._max_batch_size,
+                "mean_commit_ms": round(self._commit_time / batches * 1000, 3),
+                "last_commit_ms": round(self._last_commit_time * 1000, 3),
+                "mean_queue_wait_ms": round(self._wait_time / operations * 1000, 3),
+            }
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop accepting operations and wait for queued ones to commit.
+
+        Args:
+            timeout: Seconds to wait for the writer thread.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+
+_funnel: Optional[WriteFunnel] = None
+_funnel_lock = threading.Lock()
+
+
+def get_write_funnel() -> WriteFunnel:
+    """
+    Get the process-wide write funnel, starting it on first use.
+
+    Returns:
+        WriteFunnel: Shared funnel.
+    """
+    global _funnel
+    with _funnel_lock:
+        if _funnel is None:
+            _funnel = WriteFunnel()
+        return _funnel
+
+
+def funnel_metrics() -> Optional[Dict[str, Any]]:
+    """
+    Get metrics for the shared funnel without starting it.
+
+    Returns:
+        Optional[Dict[str, Any]]: Metrics, or None if the funnel never ran.
+    """
+    return _funnel.metrics() if _funnel is not None else None
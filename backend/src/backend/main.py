@@ -11,8 +11,9 @@ from sqlalchemy.orm import Session
 
 from backend.api import api_router
 from backend.core.config import settings
-from backend.db.database import Base, engine, get_db, SessionLocal
+from backend.db.database import Base, engine, get_db, SessionLocal, dispose_async_engine
 from backend.db.models import User
+from backend.db.retention import get_retention_job
 from backend.core.security import get_password_hash
 from backend.schemas.user import UserCreate
 
@@ -36,6 +37,7 @@ if settings.CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "X-Total-Count"],
     )
 else:
     # For development, allow all origins
@@ -45,6 +47,7 @@ else:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "X-Total-Count"],
     )
 
 # Include API router
@@ -80,6 +83,32 @@ async def create_superuser() -> None:
         db.close()
 
 
+@app.on_event("startup")
+def start_retention_job() -> None:
+    """
+    Start the background task retention job if it is enabled.
+    """
+    if settings.RETENTION_ENABLED:
+        get_retention_job().start()
+
+
+@app.on_event("shutdown")
+def stop_retention_job() -> None:
+    """
+    Stop the background task retention job.
+    """
+    if settings.RETENTION_ENABLED:
+        get_retention_job().stop(timeout=5)
+
+
+@app.on_event("shutdown")
+async def close_async_engine() -> None:
+    """
+    Close the async engine's pooled connections on shutdown.
+    """
+    await dispose_async_engine()
+
+
 @app.get("/")
 def root() -> Any:
     """
@@ -2,5 +2,5 @@
 Schemas module for the Agentic backend.
 """
 from backend.schemas.user import User, UserCreate, UserUpdate, UserInDB, Token, TokenPayload
-from backend.schemas.agent import Agent, AgentCreate, AgentUpdate, AgentConfig, AgentConfigCreate, AgentConfigUpdate
-from backend.schemas.task import Task, TaskCreate, TaskUpdate, TaskStep, TaskStepCreate, TaskStepUpdate
\ No newline at end of file
+from backend.schemas.agent import Agent, AgentCreate, AgentUpdate, AgentBatchUpdate, AgentConfig, AgentConfigCreate, AgentConfigUpdate
+from backend.schemas.task import Task, TaskCreate, TaskUpdate, TaskBatchUpdate, TaskStats, TaskStep, TaskStepCreate, TaskStepUpdate
\ No newline at end of file
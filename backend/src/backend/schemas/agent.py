@@ -81,6 +81,13 @@ class AgentUpdate(AgentBase):
     config: Optional[AgentConfigBase] = None
 
 
+class AgentBatchUpdate(AgentUpdate):
+    """
+    Schema for one agent in a batch update.
+    """
+    id: int
+
+
 class AgentInDBBase(AgentBase):
     """
     Base schema for an agent in the database.
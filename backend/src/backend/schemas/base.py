@@ -13,4 +13,11 @@ class BaseSchema(BaseModel):
     """
     class Config:
         from_attributes = True
-        populate_by_name = True
\ No newline at end of file
+        populate_by_name = True
+
+
+class BatchDeleteResult(BaseModel):
+    """
+    Result of a batch delete.
+    """
+    deleted: List[int]
\ No newline at end of file
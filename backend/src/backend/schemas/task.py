@@ -84,6 +84,13 @@ class TaskUpdate(TaskBase):
     agent_ids: Optional[List[int]] = None
 
 
+class TaskBatchUpdate(TaskUpdate):
+    """
+    Schema for one task in a batch update.
+    """
+    id: int
+
+
 class TaskInDBBase(TaskBase):
     """
     Base schema for a task in the database.
@@ -99,4 +106,12 @@ class Task(TaskInDBBase):
     Schema for a task.
     """
     agents: Optional[List[Agent]] = None
-    tasks_steps: Optional[List[TaskStep]] = None
\ No newline at end of file
+    tasks_steps: Optional[List[TaskStep]] = None
+    archived_at: Optional[datetime] = None
+
+class TaskStats(BaseModel):
+    """
+    Schema for a user's task counts.
+    """
+    total: int
+    by_status: Dict[str, int]
@@ -0,0 +1,77 @@
+"""
+Tests for the calculator expression evaluator.
+"""
+import math
+
+import pytest
+
+from backend.agents.calculator import (
+    ExpressionError,
+    compile_expression,
+    evaluate,
+    evaluate_batch,
+)
+from backend.agents.factory import AgentToolFactory
+
+
+def test_evaluate_scalar() -> None:
+    """Test scalar expressions with math functions and variables."""
+    assert evaluate("2 + 3 * 4") == 14
+    assert evaluate("sqrt(16) + max(1, 5)") == 9
+    assert evaluate("x * pi", {"x": 2}) == pytest.approx(2 * math.pi)
+
+
+def test_compiled_expressions_are_cached() -> None:
+    """Test that repeated expressions reuse the compiled form."""
+    compile_expression.cache_clear()
+    evaluate("1 + 1")
+    evaluate("1 + 1")
+    info = compile_expression.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "__import__('os')",
+        "().__class__",
+        "open('/etc/passwd')",
+        "x if x else 1",
+        "'a' * 3",
+        "9**9**9**9",
+    ],
+)
+def test_rejects_unsafe_expressions(expression: str) -> None:
+    """Test that disallowed syntax and runaway powers are rejected."""
+    with pytest.raises(ValueError):
+        evaluate(expression, {"x": 1})
+
+
+def test_undefined_variable() -> None:
+    """Test that undefined variables are reported by name."""
+    with pytest.raises(ExpressionError, match="y"):
+        evaluate("x + y", {"x": 1})
+
+
+def test_evaluate_batch_vectorized() -> None:
+    """Test that column variables evaluate every expression per row."""
+    results = evaluate_batch(
+        ["a + b", "max(a, b)", "sum(a)", "k * 2"],
+        {"a": [1, 2, 3], "b": [3, 2, 1], "k": 5},
+    )
+    assert results == [[4.0, 4.0, 4.0], [3.0, 2.0, 3.0], 6.0, 10]
+
+
+def test_evaluate_batch_mismatched_columns() -> None:
+    """Test that columns of different lengths are rejected."""
+    with pytest.raises(ExpressionError):
+        evaluate_batch(["a + b"], {"a": [1, 2], "b": [1, 2, 3]})
+
+
+def test_calculator_tool_batch() -> None:
+    """Test the calculator tool with a list of expressions."""
+    calculator = AgentToolFactory.get_tool("calculator", {})
+    output = calculator.invoke({"expressions": ["1 + 1", "x ** 2"], "variables": {"x": 3}})
+    assert output == "Results:\n1 + 1 = 2\nx ** 2 = 9"
+    assert calculator.invoke({"expression": "abs(-4)"}) == "Result: 4"
@@ -0,0 +1,76 @@
+"""
+Tests for concurrent tool execution.
+"""
+import threading
+import time
+
+from backend.agents.executor import ToolCallBatcher, release_task_batcher
+from backend.agents.factory import AgentToolFactory
+
+
+def test_batch_runs_concurrently_in_order() -> None:
+    """Test that results keep call order and the speedup is recorded."""
+    batcher = ToolCallBatcher(max_concurrency=4)
+    calls = [lambda i=i: (time.sleep(0.1), i)[1] for i in range(4)]
+    start = time.perf_counter()
+    assert batcher.run(calls) == [0, 1, 2, 3]
+    assert time.perf_counter() - start < 0.3
+
+    summary = batcher.summary()
+    assert summary["batches"] == 1
+    assert summary["calls"] == 4
+    assert summary["speedup"] > 2
+
+
+def test_concurrency_cap() -> None:
+    """Test that a task never has more calls in flight than its cap."""
+    batcher = ToolCallBatcher(max_concurrency=2)
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def call() -> None:
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.pop()
+
+    batcher.run([call] * 6)
+    assert max(peak) == 2
+
+
+def test_errors_are_returned_in_place() -> None:
+    """Test that a failing call does not hide other results."""
+    def fail() -> None:
+        raise RuntimeError("boom")
+
+    results = ToolCallBatcher().run([lambda: "ok", fail])
+    assert results[0] == "ok"
+    assert isinstance(results[1], RuntimeError)
+
+
+def test_parallel_tools(tmp_path) -> None:
+    """Test the parallel_tools tool built for a task."""
+    for name in ("a", "b"):
+        (tmp_path / f"{name}.txt").write_text(f"content {name}", encoding="utf-8")
+
+    tools = AgentToolFactory.build_tools(
+        ["file_reader", {"name": "calculator"}, "unknown"], task_id=991
+    )
+    assert [t.name for t in tools] == ["file_reader", "calculator", "parallel_tools"]
+
+    output = tools[-1].invoke({"calls": [
+        {"tool": "file_reader", "args": {"file_path": str(tmp_path / "a.txt")}},
+        {"tool": "file_reader", "args": {"file_path": str(tmp_path / "b.txt")}},
+        {"tool": "calculator", "args": {"expression": "6 * 7"}},
+    ]})
+    assert output == (
+        "[1] file_reader: content a\n\n"
+        "[2] file_reader: content b\n\n"
+        "[3] calculator: Result: 42"
+    )
+    summary = release_task_batcher(991)
+    assert summary["calls"] == 3
+    assert release_task_batcher(991) is None
@@ -0,0 +1,77 @@
+"""
+Tests for buffered and atomic file writes.
+"""
+import os
+import time
+
+import pytest
+
+from backend.agents.factory import AgentToolFactory
+from backend.agents.file_buffer import (
+    WriteBehindBuffer,
+    atomic_write,
+    close_task_buffer,
+)
+
+
+def test_atomic_write_replaces_file(tmp_path) -> None:
+    """Test that full writes replace the file and leave no temp files."""
+    target = tmp_path / "out" / "report.md"
+    atomic_write(str(target), "first")
+    atomic_write(str(target), "second")
+    assert target.read_text() == "second"
+    assert os.listdir(target.parent) == ["report.md"]
+
+
+def test_appends_flush_on_size(tmp_path) -> None:
+    """Test that appends stay buffered until the size threshold."""
+    target = tmp_path / "log.txt"
+    buffer = WriteBehindBuffer(max_bytes=10, max_delay=0, fsync_policy="never")
+    buffer.append(str(target), "abc")
+    assert not target.exists()
+    buffer.append(str(target), "defghij")
+    assert target.read_text() == "abcdefghij"
+
+
+def test_appends_flush_on_time(tmp_path) -> None:
+    """Test that the background flusher writes out old appends."""
+    target = tmp_path / "log.txt"
+    buffer = WriteBehindBuffer(max_bytes=1 << 20, max_delay=0.1, fsync_policy="never")
+    buffer.append(str(target), "late")
+    deadline = time.monotonic() + 2
+    while not target.exists() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert target.read_text() == "late"
+    buffer.close()
+
+
+def test_write_discards_pending_appends(tmp_path) -> None:
+    """Test that a full write supersedes earlier buffered appends."""
+    target = tmp_path / "doc.txt"
+    buffer = WriteBehindBuffer(max_bytes=1 << 20, max_delay=0, fsync_policy="flush")
+    buffer.append(str(target), "stale")
+    buffer.write(str(target), "fresh")
+    buffer.append(str(target), " tail")
+    buffer.close()
+    assert target.read_text() == "fresh tail"
+
+
+def test_invalid_fsync_policy() -> None:
+    """Test that unknown fsync policies are rejected."""
+    with pytest.raises(ValueError):
+        WriteBehindBuffer(fsync_policy="sometimes")
+
+
+def test_task_tools_share_buffer(tmp_path) -> None:
+    """Test that task tools buffer appends and flush before reads and at task end."""
+    target = str(tmp_path / "report.md")
+    writer, reader = AgentToolFactory.build_tools(["file_writer", "file_reader"], task_id=992)[:2]
+
+    writer.invoke({"file_path": target, "content": "# Report\n"})
+    writer.invoke({"file_path": target, "content": "part 1\n", "mode": "append"})
+    assert reader.invoke({"file_path": target}) == "# Report\npart 1\n"
+
+    writer.invoke({"file_path": target, "content": "part 2\n", "mode": "append"})
+    close_task_buffer(992)
+    with open(target) as f:
+        assert f.read() == "# Report\npart 1\npart 2\n"
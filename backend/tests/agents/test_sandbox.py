@@ -0,0 +1,72 @@
+"""
+Tests for the process-pool tool sandbox.
+"""
+import os
+
+import pytest
+
+from backend.agents.sandbox import ToolSandbox, ToolSandboxError, ToolTimeoutError
+
+
+def _spin() -> None:
+    while True:
+        pass
+
+
+def _allocate(size: int) -> int:
+    return len(bytearray(size))
+
+
+def _fail() -> None:
+    raise ValueError("boom")
+
+
+@pytest.fixture
+def sandbox():
+    """Create a small sandbox with tight limits."""
+    sandbox = ToolSandbox(workers=1, timeout=5, cpu_time=1, memory_limit_mb=64)
+    try:
+        yield sandbox
+    finally:
+        sandbox.shutdown()
+
+
+def test_run_reuses_worker(sandbox: ToolSandbox) -> None:
+    """Test that calls run out of process on a reused worker."""
+    first = sandbox.run(os.getpid)
+    second = sandbox.run(os.getpid)
+    assert first != os.getpid()
+    assert first == second
+    assert sandbox.run(pow, 2, 10) == 1024
+
+
+def test_cpu_limit_kills_and_replaces_worker(sandbox: ToolSandbox) -> None:
+    """Test that a runaway call fails fast and the pool recovers."""
+    pid = sandbox.run(os.getpid)
+    with pytest.raises(ToolTimeoutError):
+        sandbox.run(_spin)
+    assert sandbox.run(os.getpid) != pid
+
+
+def test_wall_clock_timeout() -> None:
+    """Test that the wall-clock timeout applies without a CPU limit."""
+    sandbox = ToolSandbox(workers=1, timeout=0.5, cpu_time=None, memory_limit_mb=None)
+    try:
+        with pytest.raises(ToolTimeoutError):
+            sandbox.run(_spin)
+        assert sandbox.run(pow, 3, 2) == 9
+    finally:
+        sandbox.shutdown()
+
+
+def test_memory_limit(sandbox: ToolSandbox) -> None:
+    """Test that allocations above the memory cap fail inside the worker."""
+    with pytest.raises(ToolSandboxError, match="Memory limit exceeded"):
+        sandbox.run(_allocate, 256 * 1024 * 1024)
+    assert sandbox.run(_allocate, 1024) == 1024
+
+
+def test_errors_are_reported(sandbox: ToolSandbox) -> None:
+    """Test that exceptions raised by the tool are surfaced."""
+    with pytest.raises(ToolSandboxError, match="ValueError: boom"):
+        sandbox.run(_fail)
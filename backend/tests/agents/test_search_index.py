@@ -0,0 +1,70 @@
+"""
+Tests for the local full-text search index.
+"""
+import os
+
+from backend.agents.factory import AgentToolFactory
+from backend.agents.search_index import SearchIndex, build_match_query
+
+
+def _write(path, content: str) -> None:
+    path.write_text(content, encoding="utf-8")
+
+
+def test_build_match_query_quotes_terms() -> None:
+    """Test that FTS5 syntax in queries is neutralized."""
+    assert build_match_query('crew NEAR("x") -y') == '"crew" OR "NEAR" OR "x" OR "y"'
+    assert build_match_query("!!!") == ""
+
+
+def test_search_ranks_and_snippets(tmp_path) -> None:
+    """Test BM25 ranking, snippets and top-k limits."""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    _write(docs / "crews.md", "# Crews\nA crew runs agents. Crews schedule agents sequentially.")
+    _write(docs / "tools.md", "# Tools\nAgents call tools such as the calculator.")
+    _write(docs / "other.txt", "Nothing relevant here.")
+
+    index = SearchIndex(str(tmp_path / "index.db"))
+    stats = index.update([str(docs)], workers=1)
+    assert stats.added == 3
+
+    results = index.search("crew agents", top_k=5)
+    assert [os.path.basename(r.path) for r in results] == ["crews.md", "tools.md"]
+    assert results[0].title == "crews.md: Crews"
+    assert "[crew]" in results[0].snippet.lower()
+    assert len(index.search("agents", top_k=1)) == 1
+
+
+def test_update_is_incremental(tmp_path) -> None:
+    """Test that only changed files are re-indexed and deleted files removed."""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    _write(docs / "a.txt", "alpha")
+    _write(docs / "b.txt", "beta")
+    index = SearchIndex(str(tmp_path / "index.db"))
+    index.update([str(docs)], workers=1)
+
+    _write(docs / "a.txt", "alpha gamma")
+    (docs / "b.txt").unlink()
+    stats = index.update([str(docs)], workers=1)
+
+    assert (stats.added, stats.updated, stats.removed, stats.unchanged) == (0, 1, 1, 0)
+    assert index.count() == 1
+    assert [os.path.basename(r.path) for r in index.search("gamma")] == ["a.txt"]
+    assert index.update([str(docs)], workers=1).unchanged == 1
+
+
+def test_search_tool(tmp_path) -> None:
+    """Test the search tool against a built index."""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    _write(docs / "notes.md", "Retrieval keeps agents grounded.")
+    index_path = str(tmp_path / "index.db")
+    SearchIndex(index_path).update([str(docs)], workers=1)
+
+    search = AgentToolFactory.get_tool("search", {"index_path": index_path})
+    output = search.invoke({"query": "retrieval"})
+    assert "notes.md" in output
+    assert "[Retrieval]" in output
+    assert search.invoke({"query": "zebra"}) == "No results found for: zebra"
@@ -0,0 +1,77 @@
+"""
+Tests for the in-process task event broker.
+"""
+import asyncio
+import threading
+
+from backend.agents.task_events import TaskEventBroker
+
+
+STATE = {"id": 1, "status": "pending", "steps": []}
+
+
+def test_viewers_share_a_topic() -> None:
+    """Test that a second viewer needs no seeding and both see changes."""
+    broker = TaskEventBroker()
+
+    async def scenario():
+        first = broker.subscribe(1)
+        assert not first.seeded
+        first.seed(STATE)
+        second = broker.subscribe(1)
+        assert second.seeded and broker.watcher_count(1) == 2
+        assert second.current()["status"] == "pending"
+
+        # Publish from a worker thread, as crews do
+        thread = threading.Thread(target=lambda: broker.publish(
+            1, status="in_progress", steps=[{"id": 7, "step_number": 1, "status": "in_progress"}]
+        ))
+        thread.start()
+        thread.join()
+        states = [await first.next(timeout=1), await second.next(timeout=1)]
+        assert await second.next(timeout=0.05) is None
+
+        first.close()
+        second.close()
+        return states
+
+    states = asyncio.run(scenario())
+    assert all(state["status"] == "in_progress" for state in states)
+    assert states[0]["steps"] == [{"id": 7, "step_number": 1, "status": "in_progress"}]
+    assert broker.watcher_count(1) == 0
+
+
+def test_changes_before_seed_are_kept() -> None:
+    """Test that changes published while the state loads are applied on top."""
+    broker = TaskEventBroker()
+    broker.publish(1, status="failed")  # nobody watching: dropped
+
+    async def scenario():
+        async with broker.subscribe(1) as subscription:
+            broker.publish(1, steps=[{"id": 3, "step_number": 2, "status": "completed"}])
+            broker.publish(1, status="in_progress")
+            subscription.seed(STATE)
+            subscription.seed({**STATE, "status": "ignored"})
+            return await subscription.next(timeout=1)
+
+    state = asyncio.run(scenario())
+    assert state["status"] == "in_progress"
+    assert [step["id"] for step in state["steps"]] == [3]
+    assert broker.watcher_count(1) == 0
+
+
+def test_slow_viewer_gets_latest_state() -> None:
+    """Test that several changes coalesce into one wakeup."""
+    broker = TaskEventBroker()
+
+    async def scenario():
+        async with broker.subscribe(1) as subscription:
+            subscription.seed(STATE)
+            subscription.current()
+            for status in ("in_progress", "failed", "completed"):
+                broker.publish(1, status=status)
+            return await subscription.next(timeout=1), await subscription.next(timeout=0.05)
+
+    latest, nothing = asyncio.run(scenario())
+    assert latest["status"] == "completed"
+    assert nothing is None
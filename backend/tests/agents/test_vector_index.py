@@ -0,0 +1,88 @@
+"""
+Tests for the offline vector index.
+"""
+import numpy as np
+
+from backend.agents.factory import AgentToolFactory
+from backend.agents.vector_index import HashingEmbedder, VectorIndex, chunk_text
+
+
+def test_hashing_embedder_is_normalized() -> None:
+    """Test that embeddings are deterministic unit vectors."""
+    embedder = HashingEmbedder(dim=64)
+    vectors = embedder.embed(["agents run tasks", "agents run tasks", ""])
+    assert vectors.shape == (3, 64)
+    assert np.allclose(vectors[0], vectors[1])
+    assert np.isclose(np.linalg.norm(vectors[0]), 1.0)
+    assert not vectors[2].any()
+
+
+def test_chunk_text_overlaps() -> None:
+    """Test that long text is split into bounded chunks."""
+    chunks = chunk_text("word " * 200, size=100, overlap=20)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 100 for chunk in chunks)
+
+
+def test_search_brute_force(tmp_path) -> None:
+    """Test top-k retrieval and source filtering."""
+    index = VectorIndex(str(tmp_path / "index"), dim=128)
+    index.add([
+        {"source": "a/crew.md", "text": "crews schedule agents sequentially"},
+        {"source": "a/tools.md", "text": "the calculator tool evaluates expressions"},
+        {"source": "b/db.md", "text": "sqlite stores tasks and steps"},
+    ])
+    results = index.search("which tool evaluates expressions", top_k=1)
+    assert [r.source for r in results] == ["a/tools.md"]
+    filtered = index.search("sqlite tasks", top_k=3, source_prefix="a/")
+    assert {r.source for r in filtered} <= {"a/crew.md", "a/tools.md"}
+
+
+def test_ivf_matches_brute_force(tmp_path) -> None:
+    """Test that IVF search finds exact matches and keeps appends searchable."""
+    index = VectorIndex(str(tmp_path / "index"), dim=64)
+    rng = np.random.default_rng(1)
+    words = [f"w{i}" for i in range(500)]
+    records = [
+        {"source": f"doc{i}", "text": " ".join(rng.choice(words, 8))}
+        for i in range(400)
+    ]
+    index.add(records)
+    index.build_ivf(n_lists=8)
+    index.add([{"source": "late", "text": "appended after partitioning"}])
+
+    reopened = VectorIndex(str(tmp_path / "index"))
+    assert reopened.count == 401
+    assert reopened.search(records[123]["text"], top_k=1, nprobe=2)[0].source == "doc123"
+    assert reopened.search("appended after partitioning", top_k=1)[0].source == "late"
+
+
+def test_ingest_is_incremental(tmp_path) -> None:
+    """Test that unchanged files are skipped and changed files replace old rows."""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "notes.md").write_text("retrieval keeps agents grounded", encoding="utf-8")
+    index = VectorIndex(str(tmp_path / "index"), dim=64)
+    assert index.ingest([str(docs)])["files"] == 1
+    assert index.ingest([str(docs)])["unchanged"] == 1
+
+    (docs / "notes.md").write_text("embeddings are memory mapped now", encoding="utf-8")
+    index.ingest([str(docs)])
+    results = index.search("retrieval keeps agents grounded", top_k=5)
+    assert [r.text for r in results] == ["embeddings are memory mapped now"]
+
+
+def test_vector_search_tool(tmp_path) -> None:
+    """Test the vector search and website search tools."""
+    index_path = str(tmp_path / "index")
+    VectorIndex(index_path, dim=64).add([
+        {"source": "https://docs.example.com/setup", "text": "install with poetry"},
+        {"source": "https://blog.example.com/post", "text": "install notes from the blog"},
+    ])
+    vector_search = AgentToolFactory.get_tool("vector_search", {"index_path": index_path})
+    assert "install with poetry" in vector_search.invoke({"query": "install poetry"})
+
+    website_search = AgentToolFactory.get_tool("website_search_tool", {"index_path": index_path})
+    output = website_search.invoke({"website_url": "https://blog.example.com", "query": "install"})
+    assert "blog.example.com" in output
+    assert "docs.example.com" not in output
@@ -6,7 +6,7 @@ from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
 from backend.core.security import get_password_hash
-from backend.db.models import User, Agent
+from backend.db.models import User, Agent, AgentConfig
 from backend.schemas.agent import AgentCreate
 
 
@@ -163,4 +163,88 @@ def test_update_agent(client: TestClient, db: Session, test_user: User, user_tok
     updated_agent = db.query(Agent).filter(Agent.id == agent.id).first()
     assert updated_agent.name == "Updated Agent"
     assert updated_agent.role == "updated tester"
-    assert updated_agent.goal == "To test the API updates"
\ No newline at end of file
+    assert updated_agent.goal == "To test the API updates"
+
+@pytest.mark.parametrize("page_size", [5, 50])
+def test_read_agents_query_count(
+    client: TestClient,
+    db: Session,
+    test_user: User,
+    user_token_headers: dict,
+    query_counter: list,
+    page_size: int,
+) -> None:
+    """Test that listing agents loads their configs without extra queries."""
+    for i in range(page_size):
+        agent = Agent(name=f"Agent {i}", role="tester", goal="test", user_id=test_user.id)
+        db.add(agent)
+        db.flush()
+        db.add(AgentConfig(agent_id=agent.id, user_id=test_user.id, model="test"))
+    db.commit()
+    db.expire_all()
+    query_counter.clear()
+
+    response = client.get(f"/api/v1/agents?limit={page_size}", headers=user_token_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == page_size
+    assert all(agent["config"]["model"] == "test" for agent in response.json())
+    # Agents joined with their configs (the endpoint is unauthenticated)
+    assert len(query_counter) == 1
+
+
+def test_read_agents_cursor_pagination(client: TestClient, db: Session, test_user: User) -> None:
+    """Test that agents can be paged with cursors, configs included."""
+    for i in range(7):
+        agent = Agent(name=f"Agent {i}", role="tester", goal="test", user_id=test_user.id)
+        db.add(agent)
+        db.flush()
+        db.add(AgentConfig(agent_id=agent.id, user_id=test_user.id, model="test"))
+    db.commit()
+
+    first = client.get("/api/v1/agents", params={"cursor": "", "limit": 5})
+    assert first.status_code == 200
+    assert len(first.json()) == 5
+    second = client.get("/api/v1/agents", params={"cursor": first.headers["X-Next-Cursor"], "limit": 5})
+    assert len(second.json()) == 2
+    assert "X-Next-Cursor" not in second.headers
+    ids = [agent["id"] for agent in first.json() + second.json()]
+    assert sorted(ids) == sorted(set(ids)) and len(ids) == 7
+    assert all(agent["config"]["model"] == "test" for agent in second.json())
+
+
+def test_batch_create_update_delete_agents(
+    client: TestClient, db: Session, test_user: User, query_counter: list
+) -> None:
+    """Test the batch endpoints and that they commit once per request."""
+    agents_in = [
+        {"name": f"Batch {i}", "role": "tester", "goal": "test", "config": {"model": "test"}}
+        for i in range(20)
+    ]
+    query_counter.clear()
+    response = client.post("/api/v1/agents/batch", json=agents_in)
+    assert response.status_code == 200
+    created = response.json()
+    assert [agent["name"] for agent in created] == [f"Batch {i}" for i in range(20)]
+    assert all(agent["config"]["model"] == "test" for agent in created)
+    # Default owner, multi-row agent and config INSERTs, read back
+    assert len(query_counter) <= 4
+
+    ids = [agent["id"] for agent in created]
+    response = client.put(
+        "/api/v1/agents/batch",
+        json=[{"id": agent_id, "goal": "updated", "config": {"temperature": 0.1}} for agent_id in ids[:5]],
+    )
+    assert response.status_code == 200
+    assert [agent["goal"] for agent in response.json()] == ["updated"] * 5
+    assert all(agent["config"]["temperature"] == 0.1 for agent in response.json())
+
+    response = client.put("/api/v1/agents/batch", json=[{"id": ids[0], "goal": "x"}, {"id": 9999}])
+    assert response.status_code == 404
+    db.expire_all()
+    assert db.get(Agent, ids[0]).goal == "updated"
+
+    response = client.delete("/api/v1/agents/batch", params={"ids": ids[:10]})
+    assert response.status_code == 200
+    assert sorted(response.json()["deleted"]) == ids[:10]
+    assert db.query(Agent).count() == 10
+    assert db.query(AgentConfig).count() == 10
@@ -0,0 +1,351 @@
+"""
+Tests for task management endpoints.
+"""
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from sqlalchemy.orm import Session
+
+from backend.agents.task_events import get_task_event_broker
+from backend.core.config import settings
+from backend.core.security import get_password_hash
+from backend.db import blob_store
+from backend.db.blob_store import BlobStore, is_blob_ref
+from backend.db.models import Agent, AgentConfig, Task, TaskAgent, TaskStep, User
+from backend.db.retention import archive_batch
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch) -> BlobStore:
+    """Use a temporary blob store with a small offload threshold."""
+    store = BlobStore(str(tmp_path / "blobs"))
+    monkeypatch.setattr(blob_store, "_store", store)
+    monkeypatch.setattr(settings, "BLOB_OFFLOAD_THRESHOLD", 1024)
+    return store
+
+
+@pytest.fixture
+def test_user(db: Session) -> User:
+    """Create a test user."""
+    user = User(
+        email="tasks@example.com",
+        username="tasksuser",
+        hashed_password=get_password_hash("testpassword"),
+        is_active=True,
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def user_token_headers(client: TestClient, test_user: User) -> dict:
+    """Get user token headers for authentication."""
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": test_user.username, "password": "testpassword"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _create_task(db: Session, user: User, result=None) -> Task:
+    task = Task(
+        title="Report",
+        description="Write a report",
+        expected_output="A report",
+        status="completed",
+        result=result,
+        user_id=user.id,
+    )
+    db.add(task)
+    db.commit()
+    db.refresh(task)
+    return task
+
+
+def test_large_result_served_from_blob_store(
+    client: TestClient, db: Session, test_user: User, store: BlobStore
+) -> None:
+    """Test that large results are offloaded and served by the result endpoint."""
+    result = {"output": "The findings are as follows. " * 500}
+    task = _create_task(db, test_user, result)
+    assert is_blob_ref(task.result)
+
+    response = client.get(f"/api/v1/tasks/{task.id}")
+    assert response.status_code == 200
+    assert is_blob_ref(response.json()["result"])
+
+    response = client.get(f"/api/v1/tasks/{task.id}/result")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == result
+
+
+def test_small_result_served_inline(
+    client: TestClient, db: Session, test_user: User, store: BlobStore
+) -> None:
+    """Test that small results stay in the row and are served as JSON."""
+    task = _create_task(db, test_user, {"output": "done"})
+    response = client.get(f"/api/v1/tasks/{task.id}/result")
+    assert response.status_code == 200
+    assert response.json() == {"output": "done"}
+
+
+def test_missing_result(client: TestClient, db: Session, test_user: User) -> None:
+    """Test that a task without a result returns 404."""
+    task = _create_task(db, test_user)
+    assert client.get(f"/api/v1/tasks/{task.id}/result").status_code == 404
+    assert client.get("/api/v1/tasks/9999/result").status_code == 404
+
+
+def _create_tasks_with_agents(db: Session, user: User, count: int) -> None:
+    agents = [Agent(name=f"Agent {i}", role="tester", goal="test", user_id=user.id) for i in range(2)]
+    db.add_all(agents)
+    db.flush()
+    db.add_all(AgentConfig(agent_id=agent.id, user_id=user.id, model="test") for agent in agents)
+    for i in range(count):
+        task = Task(title=f"Task {i}", description="d", expected_output="e", user_id=user.id)
+        db.add(task)
+        db.flush()
+        db.add_all(TaskAgent(task_id=task.id, agent_id=agent.id) for agent in agents)
+        db.add(TaskStep(task_id=task.id, agent_id=agents[0].id, step_number=1))
+    db.commit()
+
+
+@pytest.mark.parametrize("page_size", [5, 50])
+def test_read_tasks_query_count(
+    client: TestClient,
+    db: Session,
+    test_user: User,
+    user_token_headers: dict,
+    query_counter: list,
+    page_size: int,
+) -> None:
+    """Test that listing tasks takes a fixed number of queries per page."""
+    _create_tasks_with_agents(db, test_user, page_size)
+    db.expire_all()
+    query_counter.clear()
+
+    response = client.get(f"/api/v1/tasks?limit={page_size}", headers=user_token_headers)
+    assert response.status_code == 200
+    tasks = response.json()
+    assert len(tasks) == page_size
+    assert all(len(task["agents"]) == 2 and task["agents"][0]["config"] for task in tasks)
+    assert all(len(task["tasks_steps"]) == 1 for task in tasks)
+    # Current user, tasks, task agents with configs, task steps
+    assert len(query_counter) == 4
+
+
+def test_create_task_single_transaction(
+    client: TestClient, db: Session, test_user: User, query_counter: list
+) -> None:
+    """Test that creating a task commits once and does not read it back."""
+    agent = Agent(name="Agent", role="tester", goal="test", user_id=test_user.id)
+    db.add(agent)
+    db.commit()
+    query_counter.clear()
+
+    response = client.post("/api/v1/tasks", json={
+        "title": "Task", "description": "d", "expected_output": "e", "agent_ids": [agent.id],
+    })
+    assert response.status_code == 200
+    assert response.json()["agents"][0]["id"] == agent.id
+    assert not any(statement.lstrip().startswith("SELECT tasks.") for statement in query_counter)
+    # Task, agent links, status counter
+    assert sum(statement.lstrip().upper().startswith("INSERT") for statement in query_counter) == 3
+
+
+def test_read_task_stats(client: TestClient, test_user: User, user_token_headers: dict) -> None:
+    """Test that task counts follow tasks created and updated through the API."""
+    ids = [
+        client.post("/api/v1/tasks", json={
+            "title": f"Task {i}", "description": "d", "expected_output": "e", "agent_ids": [],
+        }).json()["id"]
+        for i in range(3)
+    ]
+    client.put(f"/api/v1/tasks/{ids[0]}", json={"status": "completed"}, headers=user_token_headers)
+
+    response = client.get("/api/v1/tasks/stats", headers=user_token_headers)
+    assert response.status_code == 200
+    assert response.json() == {
+        "total": 3,
+        "by_status": {"pending": 2, "in_progress": 0, "completed": 1, "failed": 0},
+    }
+
+
+def test_read_tasks_cursor_pagination(
+    client: TestClient, db: Session, test_user: User, user_token_headers: dict
+) -> None:
+    """Test that following next cursors visits every task once, newest first."""
+    start = datetime(2025, 1, 1)
+    for i in range(25):
+        db.add(Task(title=f"Task {i}", user_id=test_user.id, created_at=start + timedelta(minutes=i % 5)))
+    db.commit()
+
+    seen, cursor = [], ""
+    while True:
+        response = client.get(
+            "/api/v1/tasks",
+            params={"cursor": cursor, "limit": 10, "include_total": True},
+            headers=user_token_headers,
+        )
+        assert response.status_code == 200
+        assert response.headers["X-Total-Count"] == str(25 + len(seen) // 10)
+        seen.extend((task["created_at"], task["id"]) for task in response.json())
+        # A task created between pages must not shift later pages
+        db.add(Task(title="New", user_id=test_user.id, created_at=start + timedelta(days=1)))
+        db.commit()
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert len(seen) == 25
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_read_tasks_invalid_cursor(
+    client: TestClient, test_user: User, user_token_headers: dict
+) -> None:
+    """Test that a malformed cursor is rejected."""
+    response = client.get("/api/v1/tasks", params={"cursor": "not-a-cursor"}, headers=user_token_headers)
+    assert response.status_code == 400
+
+
+def test_archived_task_remains_readable(
+    client: TestClient, db: Session, test_user: User, user_token_headers: dict
+) -> None:
+    """Test that archived tasks are still served by the task read endpoints."""
+    _create_tasks_with_agents(db, test_user, 2)
+    archived_id, live_id = [task_id for task_id, in db.query(Task.id).order_by(Task.id)]
+    step_id = db.query(TaskStep.id).filter(TaskStep.task_id == archived_id).scalar()
+    archive_batch(db, [archived_id], datetime.utcnow())
+    db.commit()
+    assert db.get(Task, archived_id) is None
+
+    response = client.get(f"/api/v1/tasks/{archived_id}")
+    assert response.status_code == 200
+    task = response.json()
+    assert task["archived_at"] is not None
+    assert [agent["name"] for agent in task["agents"]] == ["Agent 0", "Agent 1"]
+    assert len(task["tasks_steps"]) == 1
+
+    response = client.get(f"/api/v1/tasks/{archived_id}/steps", headers=user_token_headers)
+    assert [step["id"] for step in response.json()] == [step_id]
+    response = client.get(f"/api/v1/tasks/{archived_id}/status")
+    assert response.json()["archived"] is True
+
+    response = client.get("/api/v1/tasks/archived", headers=user_token_headers)
+    assert [task["id"] for task in response.json()] == [archived_id]
+    response = client.get("/api/v1/tasks", headers=user_token_headers)
+    assert [task["id"] for task in response.json()] == [live_id]
+
+
+def test_batch_task_endpoints(
+    client: TestClient, db: Session, test_user: User, user_token_headers: dict
+) -> None:
+    """Test creating, updating and deleting tasks in batches."""
+    agent = Agent(name="Agent", role="tester", goal="test", user_id=test_user.id)
+    db.add(agent)
+    db.commit()
+    tasks_in = [
+        {"title": f"Task {i}", "description": "d", "expected_output": "e", "agent_ids": [agent.id]}
+        for i in range(5)
+    ]
+    response = client.post("/api/v1/tasks/batch", json=tasks_in)
+    assert response.status_code == 200
+    ids = [task["id"] for task in response.json()]
+    assert all(task["agents"][0]["id"] == agent.id for task in response.json())
+
+    response = client.put(
+        "/api/v1/tasks/batch",
+        json=[{"id": task_id, "status": "completed", "agent_ids": []} for task_id in ids[:2]],
+        headers=user_token_headers,
+    )
+    assert response.status_code == 200
+    assert [(task["status"], task["agents"]) for task in response.json()] == [("completed", [])] * 2
+
+    other = Task(title="Other", user_id=test_user.id + 1)
+    db.add(other)
+    db.commit()
+    response = client.delete(
+        "/api/v1/tasks/batch", params={"ids": [ids[0], other.id]}, headers=user_token_headers
+    )
+    assert response.status_code == 403
+
+    db.add(TaskStep(task_id=ids[0], agent_id=agent.id, step_number=1))
+    db.commit()
+    response = client.delete("/api/v1/tasks/batch", params={"ids": ids[:3]}, headers=user_token_headers)
+    assert sorted(response.json()["deleted"]) == ids[:3]
+    assert db.query(TaskStep).count() == 0
+    assert db.query(TaskAgent).count() == 2
+
+
+def test_batch_size_limit(
+    client: TestClient, test_user: User, user_token_headers: dict, monkeypatch
+) -> None:
+    """Test that oversized batches are rejected."""
+    monkeypatch.setattr(settings, "BATCH_MAX_ITEMS", 2)
+    response = client.delete("/api/v1/tasks/batch", params={"ids": [1, 2, 3]}, headers=user_token_headers)
+    assert response.status_code == 413
+
+
+def _publish_when_watched(task_id: int, **change) -> threading.Thread:
+    """Publish a change from another thread once the task has a viewer."""
+    def publish() -> None:
+        broker = get_task_event_broker()
+        deadline = time.monotonic() + 5
+        while not broker.watcher_count(task_id) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        broker.publish(task_id, **change)
+
+    thread = threading.Thread(target=publish)
+    thread.start()
+    return thread
+
+
+def test_task_events_stream(client: TestClient, db: Session, test_user: User) -> None:
+    """Test that the SSE stream follows published transitions and then ends."""
+    task = Task(title="Streamed", status="pending", user_id=test_user.id)
+    db.add(task)
+    db.commit()
+
+    publisher = _publish_when_watched(
+        task.id, status="completed", steps=[{"id": 1, "step_number": 1, "status": "completed"}]
+    )
+    response = client.get(f"/api/v1/tasks/{task.id}/events")
+    publisher.join()
+    assert response.headers["content-type"].startswith("text/event-stream")
+    states = [
+        json.loads(line[len("data: "):])
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+    assert [state["status"] for state in states] == ["pending", "completed"]
+    assert states[-1]["steps"][0]["status"] == "completed"
+    assert get_task_event_broker().watcher_count(task.id) == 0
+
+    assert client.get("/api/v1/tasks/999999/events").status_code == 404
+
+
+def test_task_events_websocket(client: TestClient, db: Session, test_user: User) -> None:
+    """Test that the WebSocket sends the same states as the SSE stream."""
+    task = Task(title="Watched", status="in_progress", user_id=test_user.id)
+    db.add(task)
+    db.commit()
+
+    with client.websocket_connect(f"/api/v1/tasks/{task.id}/ws") as websocket:
+        assert websocket.receive_json()["status"] == "in_progress"
+        websocket.send_text("ignored")
+        get_task_event_broker().publish(task.id, status="failed")
+        assert websocket.receive_json()["status"] == "failed"
+
+    with client.websocket_connect("/api/v1/tasks/999999/ws") as websocket:
+        with pytest.raises(WebSocketDisconnect) as excinfo:
+            websocket.receive_json()
+    assert excinfo.value.code == 4404
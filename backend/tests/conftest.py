@@ -6,11 +6,14 @@ from typing import Dict, Generator
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
+from backend.api.v1 import dependencies
 from backend.core.config import settings
-from backend.db.database import Base, get_db
+from backend.db.database import Base, get_async_db, get_db
 from backend.main import app
 
 
@@ -19,6 +22,13 @@ TEST_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
 TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async endpoints read the same file; NullPool keeps connections from
+# outliving the event loop of the request that opened them
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+TestAsyncSessionLocal = async_sessionmaker(
+    async_engine, expire_on_commit=False, autoflush=False
+)
+
 
 @pytest.fixture(scope="function")
 def db() -> Generator:
@@ -50,11 +60,41 @@ def client(db) -> Generator:
         finally:
             pass
 
+    async def override_get_async_db():
+        async with TestAsyncSessionLocal() as session:
+            yield session
+
+    # Endpoints depend on the API's own get_db, so override both
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[dependencies.get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     
     # Create the test client
     with TestClient(app) as client:
         yield client
     
     # Clean up the overrides
-    app.dependency_overrides = {}
\ No newline at end of file
+    app.dependency_overrides = {}
+
+
+@pytest.fixture(scope="function")
+def query_counter() -> Generator:
+    """
+    Count the SQL statements executed on the test database.
+    
+    Yields a list that collects each statement; clear it before the code
+    under test runs.
+    """
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    engines = (engine, async_engine.sync_engine)
+    for target in engines:
+        event.listen(target, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", record)
@@ -0,0 +1,85 @@
+"""
+Tests for the AsyncSession CRUD classes.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.crud import agent_async, task_async, user_async
+from backend.db.database import Base
+from backend.schemas.agent import AgentCreate
+from backend.schemas.task import TaskCreate, TaskUpdate
+from backend.schemas.user import UserCreate
+
+
+@pytest.fixture
+def run_async(tmp_path):
+    """
+    Run a coroutine taking an AsyncSession against a fresh database.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def run(func):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with session_factory() as db:
+                return await func(db)
+        finally:
+            await engine.dispose()
+
+    return lambda func: asyncio.run(run(func))
+
+
+def test_task_lifecycle(run_async) -> None:
+    """Test creating, paging and updating tasks with embedded agents."""
+    async def scenario(db):
+        owner = await user_async.create(db, obj_in=UserCreate(
+            email="async@example.com", username="async", password="password"
+        ))
+        agent = await agent_async.create_with_owner(
+            db, obj_in=AgentCreate(name="Agent", role="Role", goal="Goal"), user_id=owner.id
+        )
+        for i in range(3):
+            await task_async.create_with_owner(db, obj_in=TaskCreate(
+                title=f"Task {i}", description="Description",
+                expected_output="Output", agent_ids=[agent.id],
+            ), user_id=owner.id)
+
+        first = await task_async.get_page_by_owner(db, user_id=owner.id, limit=2, with_total=True)
+        rest = await task_async.get_page_by_owner(
+            db, user_id=owner.id, cursor=first.next_cursor, limit=2
+        )
+        agent_names = [task.agents[0].name for task in first.items]
+        updated = await task_async.update(
+            db, db_obj=first.items[0], obj_in=TaskUpdate(status="completed", agent_ids=[])
+        )
+        return owner, first, rest, agent_names, updated
+
+    owner, first, rest, agent_names, updated = run_async(scenario)
+    assert first.total == 3
+    assert agent_names == ["Agent", "Agent"]
+    assert first.next_cursor and rest.next_cursor is None
+    assert len(rest.items) == 1
+    assert {t.id for t in first.items}.isdisjoint(t.id for t in rest.items)
+    assert updated.status == "completed"
+    assert updated.agents == []
+    assert owner.hashed_password != "password"
+
+
+def test_authenticate(run_async) -> None:
+    """Test async authentication checks the password hash."""
+    async def scenario(db):
+        await user_async.create(db, obj_in=UserCreate(
+            email="login@example.com", username="login", password="secret"
+        ))
+        return (
+            await user_async.authenticate(db, username="login", password="secret"),
+            await user_async.authenticate(db, username="login", password="wrong"),
+        )
+
+    user, wrong = run_async(scenario)
+    assert user is not None and user.email == "login@example.com"
+    assert wrong is None
@@ -0,0 +1,64 @@
+"""
+Tests for the content-addressed blob store.
+"""
+import os
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, select, text
+
+from backend.core.config import settings
+from backend.db import blob_store
+from backend.db.blob_store import BLOB_REF_KEY, BlobStore, is_blob_ref
+from backend.db.types import CompressedJSON
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch) -> BlobStore:
+    store = BlobStore(str(tmp_path / "blobs"))
+    monkeypatch.setattr(blob_store, "_store", store)
+    monkeypatch.setattr(settings, "BLOB_OFFLOAD_THRESHOLD", 1024)
+    return store
+
+
+def test_put_deduplicates(store) -> None:
+    """Test that identical content is stored once under its hash."""
+    first = store.put(b'{"output": "same"}')
+    second = store.put(b'{"output": "same"}')
+    assert first == second
+    assert store.get(first) == b'{"output": "same"}'
+    files = [name for _, _, names in os.walk(store.root) for name in names]
+    assert files == [first]
+
+
+def test_invalid_digest_rejected(store) -> None:
+    """Test that digests cannot be used to escape the store directory."""
+    with pytest.raises(ValueError):
+        store.path("../../etc/passwd")
+
+
+def test_large_values_offloaded(store, tmp_path) -> None:
+    """Test that offloading columns keep only a reference to large values."""
+    metadata = MetaData()
+    table = Table(
+        "results",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("data", CompressedJSON(offload=True)),
+    )
+    engine = create_engine(f"sqlite:///{tmp_path / 'offload.db'}")
+    metadata.create_all(engine)
+    large = {"output": "x" * 5000}
+    small = {"output": "short"}
+    with engine.begin() as conn:
+        conn.execute(table.insert(), [{"id": 1, "data": large}, {"id": 2, "data": small}])
+        loaded = dict(conn.execute(select(table.c.id, table.c.data)).all())
+        raw_size = conn.execute(text("SELECT length(data) FROM results WHERE id = 1")).scalar()
+    engine.dispose()
+
+    assert is_blob_ref(loaded[1])
+    assert loaded[1]["size"] > 5000
+    assert raw_size < 200
+    assert store.resolve(loaded[1]) == large
+    assert loaded[2] == small
+    assert store.resolve(loaded[2]) == small
+    assert os.path.exists(store.path(loaded[1][BLOB_REF_KEY]))
@@ -0,0 +1,31 @@
+"""
+Tests for database engine configuration.
+"""
+from sqlalchemy import create_engine, text
+
+from backend.core.config import settings
+from backend.db.database import configure_sqlite_engine
+
+
+def test_sqlite_pragmas_applied(tmp_path) -> None:
+    """Test that every new SQLite connection gets the configured pragmas."""
+    engine = configure_sqlite_engine(create_engine(f"sqlite:///{tmp_path / 'pragmas.db'}"))
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == settings.SQLITE_BUSY_TIMEOUT_MS
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == settings.SQLITE_CACHE_SIZE
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+    engine.dispose()
+
+
+def test_custom_pragmas(tmp_path) -> None:
+    """Test that explicit pragmas override settings and None skips a pragma."""
+    engine = configure_sqlite_engine(
+        create_engine(f"sqlite:///{tmp_path / 'custom.db'}"),
+        {"journal_mode": None, "busy_timeout": 1234},
+    )
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+    engine.dispose()
@@ -0,0 +1,121 @@
+"""
+Tests for the Alembic migrations and the indexes they create.
+"""
+from datetime import datetime
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, text, tuple_
+from sqlalchemy.orm import Session
+
+from backend.crud.pagination import decode_cursor, encode_cursor
+from backend.db.database import Base
+from backend.db.migrate import upgrade_database
+from backend.db.models import Task, TaskAgent, TaskStep
+
+
+ROWS = 1_000_000
+
+
+def _explain(db: Session, query) -> str:
+    sql = query.statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+    rows = db.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+    return "\n".join(row[-1] for row in rows)
+
+
+@pytest.fixture(scope="module")
+def large_db(tmp_path_factory):
+    """Migrated database with a million tasks, steps and task-agent links."""
+    path = tmp_path_factory.mktemp("migrations") / "large.db"
+    engine = create_engine(f"sqlite:///{path}")
+    upgrade_database(engine)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, username) "
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 1000) "
+            "SELECT i, 'user' || i FROM n"
+        ))
+        conn.execute(text(
+            "INSERT INTO agents (id, name, user_id) "
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 1000) "
+            "SELECT i, 'agent' || i, i FROM n"
+        ))
+        conn.execute(text(
+            "INSERT INTO tasks (id, title, status, user_id, created_at) "
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :rows) "
+            "SELECT i, 'task', CASE i % 50 WHEN 0 THEN 'pending' ELSE 'completed' END, "
+            "i % 1000 + 1, datetime('2025-01-01', '+' || i || ' seconds') FROM n"
+        ), {"rows": ROWS})
+        conn.execute(text(
+            "INSERT INTO task_steps (task_id, agent_id, step_number, status) "
+            "SELECT id, user_id, 1, status FROM tasks"
+        ))
+        conn.execute(text(
+            "INSERT INTO task_agents (task_id, agent_id) SELECT id, user_id FROM tasks"
+        ))
+        conn.execute(text("ANALYZE"))
+    db = Session(bind=engine)
+    yield db
+    db.close()
+    engine.dispose()
+
+
+def test_migrations_match_models(tmp_path) -> None:
+    """Test that upgrading to head produces the schema the models describe."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    upgrade_database(engine)
+    with engine.connect() as conn:
+        assert compare_metadata(MigrationContext.configure(conn), Base.metadata) == []
+    engine.dispose()
+
+
+def test_tasks_by_owner_uses_index(large_db) -> None:
+    """Test that listing a user's tasks newest first needs no scan or sort."""
+    query = (
+        large_db.query(Task)
+        .filter(Task.user_id == 42)
+        .order_by(Task.created_at.desc())
+        .limit(100)
+    )
+    plan = _explain(large_db, query)
+    assert "ix_tasks_user_id_created_at" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_task_keyset_page_uses_index(large_db) -> None:
+    """Test that a cursor page seeks into the owner index instead of sorting."""
+    key = decode_cursor(encode_cursor(datetime(2025, 1, 5), 400042))
+    query = (
+        large_db.query(Task)
+        .filter(Task.user_id == 42, tuple_(Task.created_at, Task.id) < tuple_(*key))
+        .order_by(Task.created_at.desc(), Task.id.desc())
+        .limit(101)
+    )
+    plan = _explain(large_db, query)
+    assert "ix_tasks_user_id_created_at" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_tasks_by_status_uses_index(large_db) -> None:
+    """Test that filtering tasks by status uses the status index."""
+    plan = _explain(large_db, large_db.query(Task).filter(Task.status == "pending"))
+    assert "ix_tasks_status" in plan
+
+
+def test_task_steps_use_index(large_db) -> None:
+    """Test that a task's steps are read in order from the composite index."""
+    query = (
+        large_db.query(TaskStep)
+        .filter(TaskStep.task_id == 1234)
+        .order_by(TaskStep.step_number)
+    )
+    plan = _explain(large_db, query)
+    assert "ix_task_steps_task_id_step_number" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_task_agents_by_agent_use_index(large_db) -> None:
+    """Test that finding an agent's tasks uses the agent_id index."""
+    plan = _explain(large_db, large_db.query(TaskAgent).filter(TaskAgent.agent_id == 7))
+    assert "ix_task_agents_agent_id" in plan
@@ -0,0 +1,105 @@
+"""
+Tests for batched archival of finished tasks.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+
+from backend.db.database import Base
+from backend.db.models import (
+    Agent,
+    ArchivedTask,
+    ArchivedTaskStep,
+    Task,
+    TaskAgent,
+    TaskStep,
+    User,
+)
+from backend.db.retention import archive_tasks, count_archivable
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'retention.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _seed(session_factory) -> None:
+    old = datetime.utcnow() - timedelta(days=100)
+    recent = datetime.utcnow() - timedelta(days=1)
+    with session_factory() as db:
+        user = User(email="retention@example.com", username="retention")
+        agent = Agent(name="Agent", role="Role", goal="Goal", user=user)
+        db.add_all([user, agent])
+        db.flush()
+        rows = (
+            [("completed", old)] * 4
+            + [("failed", old), ("in_progress", old), ("completed", recent)]
+        )
+        for i, (status, updated_at) in enumerate(rows):
+            task = Task(
+                title=f"Task {i}",
+                status=status,
+                result={"output": f"result {i}"},
+                user_id=user.id,
+                created_at=updated_at,
+                updated_at=updated_at,
+            )
+            db.add(task)
+            db.flush()
+            db.add(TaskAgent(task_id=task.id, agent_id=agent.id))
+            db.add_all(
+                TaskStep(
+                    task_id=task.id,
+                    agent_id=agent.id,
+                    step_number=n,
+                    output_data={"step": n},
+                    status="completed",
+                )
+                for n in range(2)
+            )
+        db.commit()
+        # onupdate would otherwise reset updated_at when the steps are added
+        db.execute(Task.__table__.update().values(updated_at=Task.created_at))
+        db.commit()
+
+
+def test_archives_old_finished_tasks_in_batches(session_factory) -> None:
+    """Test that only old completed and failed tasks move, in small batches."""
+    _seed(session_factory)
+    with session_factory() as db:
+        assert count_archivable(db, older_than_days=30) == 5
+
+    stats = archive_tasks(session_factory, older_than_days=30, batch_size=2, pause=0)
+    assert (stats.tasks, stats.steps, stats.batches) == (5, 10, 3)
+
+    with session_factory() as db:
+        assert sorted(db.scalars(select(Task.status))) == ["completed", "in_progress"]
+        assert db.scalar(select(func.count(TaskStep.id))) == 4
+        assert db.scalar(select(func.count()).select_from(TaskAgent)) == 2
+
+        archived = db.scalars(select(ArchivedTask).order_by(ArchivedTask.id)).all()
+        assert [task.title for task in archived] == [f"Task {i}" for i in range(5)]
+        assert archived[0].result == {"output": "result 0"}
+        assert archived[0].archived_at is not None
+        assert [agent.name for agent in archived[0].agents] == ["Agent"]
+        assert [step.output_data for step in archived[0].tasks_steps] == [{"step": 0}, {"step": 1}]
+        assert db.scalar(select(func.count(ArchivedTaskStep.id))) == 10
+
+
+def test_each_batch_is_its_own_transaction(session_factory) -> None:
+    """Test that the write lock is released between batches."""
+    _seed(session_factory)
+    engine = session_factory.kw["bind"]
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(1))
+
+    stats = archive_tasks(session_factory, older_than_days=30, batch_size=1, max_batches=3, pause=0)
+    assert stats.batches == 3
+    assert len(commits) == 3
+    with session_factory() as db:
+        assert count_archivable(db, older_than_days=30) == 2
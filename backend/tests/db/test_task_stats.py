@@ -0,0 +1,71 @@
+"""
+Tests for the maintained per-user task status counts.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.crud import task as task_crud
+from backend.db.database import Base
+from backend.db.models import Task, User
+from backend.db.retention import archive_batch
+from backend.db.task_stats import get_status_counts, rebuild_status_counts
+from backend.schemas.task import TaskCreate, TaskUpdate
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        User(email="one@example.com", username="one", hashed_password="x"),
+        User(email="two@example.com", username="two", hashed_password="x"),
+    ])
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _task(title: str) -> TaskCreate:
+    return TaskCreate(title=title, description="d", expected_output="e", agent_ids=[])
+
+
+def test_counts_follow_every_write(db) -> None:
+    """Test that each CRUD write keeps the counts equal to a full recount."""
+    first = task_crud.create_with_owner(db, obj_in=_task("First"), user_id=1)
+    batch = task_crud.create_many_with_owner(db, objs_in=[_task(f"T{i}") for i in range(4)], user_id=1)
+    other = task_crud.create_with_owner(db, obj_in=_task("Other"), user_id=2)
+    assert get_status_counts(db, 1) == {"pending": 5, "in_progress": 0, "completed": 0, "failed": 0}
+
+    task_crud.update(db, db_obj=first, obj_in=TaskUpdate(status="in_progress"))
+    task_crud.update(db, db_obj=first, obj_in=TaskUpdate(title="Renamed"))
+    task_crud.update_many(db, objs_in={
+        batch[0].id: TaskUpdate(status="completed"),
+        batch[1].id: TaskUpdate(status="completed"),
+        9999: TaskUpdate(status="completed"),
+    })
+    task_crud.set_status(db, task_id=batch[2].id, status="failed")
+    db.commit()
+    assert get_status_counts(db, 1) == {"pending": 1, "in_progress": 1, "completed": 2, "failed": 1}
+
+    task_crud.remove(db, id=first.id)
+    task_crud.remove_many(db, ids=[batch[2].id, batch[3].id])
+    archive_batch(db, [batch[0].id], archived_at=other.created_at)
+    db.commit()
+    assert get_status_counts(db, 1) == {"pending": 0, "in_progress": 0, "completed": 1, "failed": 0}
+    assert get_status_counts(db, 2)["pending"] == 1
+    assert rebuild_status_counts(db) == {}
+
+
+def test_rebuild_reports_and_fixes_drift(db) -> None:
+    """Test that rows written around the CRUD layer are picked up by a rebuild."""
+    task_crud.create_with_owner(db, obj_in=_task("Tracked"), user_id=1)
+    db.add(Task(title="Untracked", status="completed", user_id=1))
+    db.commit()
+
+    assert rebuild_status_counts(db) == {(1, "completed"): (0, 1)}
+    db.commit()
+    assert get_status_counts(db, 1)["completed"] == 1
+    assert rebuild_status_counts(db) == {}
@@ -0,0 +1,76 @@
+"""
+Tests for custom column types.
+"""
+import json
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, select, text
+
+from backend.db.types import ZLIB_MARKER, ZSTD_MARKER, CompressedJSON, zstandard
+
+
+metadata = MetaData()
+
+documents = Table(
+    "documents",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("data", CompressedJSON(threshold=256)),
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'types.db'}")
+    metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _store(engine, value):
+    with engine.begin() as conn:
+        conn.execute(documents.insert().values(id=1, data=value))
+        raw = conn.execute(text("SELECT data FROM documents WHERE id = 1")).scalar()
+        loaded = conn.execute(select(documents.c.data)).scalar()
+    return raw, loaded
+
+
+def test_small_values_stored_as_json_text(engine) -> None:
+    """Test that values under the threshold stay readable JSON text."""
+    value = {"output": "short", "n": 1, "items": [1, 2.5, None, True]}
+    raw, loaded = _store(engine, value)
+    assert isinstance(raw, str)
+    assert json.loads(raw) == value
+    assert loaded == value
+
+
+def test_large_values_compressed(engine) -> None:
+    """Test that large values are compressed behind a marker byte."""
+    value = {"output": "The agent concluded that the report is complete. " * 200}
+    raw, loaded = _store(engine, value)
+    assert isinstance(raw, bytes)
+    assert raw[:1] == (ZSTD_MARKER if zstandard is not None else ZLIB_MARKER)
+    assert len(raw) < len(json.dumps(value)) / 10
+    assert loaded == value
+
+
+def test_legacy_rows_readable(engine) -> None:
+    """Test that JSON text written by the old stdlib encoder still loads."""
+    value = {"error": "boom", "nested": {"a": [1, 2]}}
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO documents (id, data) VALUES (1, :data)"), {"data": json.dumps(value)})
+        assert conn.execute(select(documents.c.data)).scalar() == value
+
+
+def test_zlib_values_readable(engine) -> None:
+    """Test that zlib-compressed values load regardless of the configured codec."""
+    column = CompressedJSON(threshold=0, codec="zlib")
+    stored = column.process_bind_param({"output": "x" * 1000}, engine.dialect)
+    assert stored[:1] == ZLIB_MARKER
+    assert CompressedJSON().process_result_value(stored, engine.dialect) == {"output": "x" * 1000}
+
+
+def test_non_string_keys(engine) -> None:
+    """Test that non-string keys are stringified like the stdlib encoder does."""
+    _, loaded = _store(engine, {1: "one"})
+    assert loaded == {"1": "one"}
@@ -0,0 +1,61 @@
+"""
+Tests for grouping CRUD writes with unit_of_work.
+"""
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+
+from backend.crud import agent as agent_crud, task as task_crud, unit_of_work
+from backend.db.database import Base
+from backend.db.models import Task, User
+from backend.schemas.agent import AgentCreate
+from backend.schemas.task import TaskCreate
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'uow.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(User(email="uow@example.com", username="uow", hashed_password="x"))
+    session.commit()
+    session.commits = []
+    event.listen(engine, "commit", lambda conn: session.commits.append(1))
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _task(agent_id: int) -> TaskCreate:
+    return TaskCreate(
+        title="Task", description="Description", expected_output="Output", agent_ids=[agent_id]
+    )
+
+
+def test_composite_write_commits_once(db) -> None:
+    """Test that nested CRUD writes share one commit and stay loaded."""
+    with unit_of_work(db):
+        agent = agent_crud.create_with_owner(
+            db, obj_in=AgentCreate(name="Agent", role="Role", goal="Goal"), user_id=1
+        )
+        with unit_of_work(db):
+            task = task_crud.create_with_owner(db, obj_in=_task(agent.id), user_id=1)
+        assert db.commits == []
+
+    assert len(db.commits) == 1
+    assert task.id is not None and task.status == "pending"
+    assert [a.name for a in task.agents] == ["Agent"]
+
+
+def test_rolls_back_on_error(db) -> None:
+    """Test that an exception discards every write in the block."""
+    with pytest.raises(RuntimeError):
+        with unit_of_work(db):
+            agent = agent_crud.create_with_owner(
+                db, obj_in=AgentCreate(name="Agent", role="Role", goal="Goal"), user_id=1
+            )
+            task_crud.create_with_owner(db, obj_in=_task(agent.id), user_id=1)
+            raise RuntimeError
+
+    assert db.commits == []
+    assert db.scalar(select(func.count(Task.id))) == 0
@@ -0,0 +1,95 @@
+"""
+Tests for the group-commit write funnel.
+"""
+import threading
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from backend.db.write_funnel import WriteFunnel
+
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True, nullable=False)
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'funnel.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _add(name: str):
+    def operation(db):
+        item = Item(name=name)
+        db.add(item)
+        db.flush()
+        return item.id
+    return operation
+
+
+def test_operations_are_grouped(session_factory) -> None:
+    """Test that concurrent writes share commits and each caller gets its result."""
+    funnel = WriteFunnel(session_factory, max_batch=32, max_delay=0.05)
+    futures = [funnel.submit(_add(f"item-{i}")) for i in range(20)]
+    ids = [future.result(timeout=5) for future in futures]
+    funnel.shutdown()
+
+    assert len(set(ids)) == 20
+    metrics = funnel.metrics()
+    assert metrics["operations"] == 20
+    assert metrics["batches"] < 20
+    assert metrics["max_batch_size"] > 1
+
+    db = session_factory()
+    assert db.query(Item).count() == 20
+    db.close()
+
+
+def test_failing_operation_is_isolated(session_factory) -> None:
+    """Test that one failing write does not roll back the rest of its batch."""
+    funnel = WriteFunnel(session_factory, max_batch=32, max_delay=0.05)
+    first = funnel.submit(_add("a"))
+    duplicate = funnel.submit(_add("a"))
+    other = funnel.submit(_add("b"))
+
+    assert first.result(timeout=5)
+    assert other.result(timeout=5)
+    with pytest.raises(Exception):
+        duplicate.result(timeout=5)
+    funnel.shutdown()
+
+    assert funnel.metrics()["failed_operations"] == 1
+    db = session_factory()
+    assert sorted(item.name for item in db.query(Item)) == ["a", "b"]
+    db.close()
+
+
+def test_shutdown_drains_queue(session_factory) -> None:
+    """Test that shutdown commits queued writes and rejects new ones."""
+    funnel = WriteFunnel(session_factory, max_batch=4, max_delay=0.01)
+    threads = [
+        threading.Thread(target=funnel.run, args=(_add(f"t-{i}"),)) for i in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    funnel.shutdown()
+
+    with pytest.raises(RuntimeError):
+        funnel.submit(_add("late"))
+    db = session_factory()
+    assert db.query(Item).count() == 10
+    db.close()